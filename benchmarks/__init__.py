@@ -0,0 +1 @@
+"""Reproducible benchmarks for the QA bot and evaluation runners."""
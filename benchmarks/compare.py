@@ -0,0 +1,124 @@
+"""Compare two benchmark baselines and flag regressions.
+
+Cases are matched by name and size. Wall time, latency percentiles and
+peak memory are compared as ``new / old`` ratios, and anything slower or
+larger than ``--threshold`` (10% by default) is a regression. Timings below
+``--min-seconds`` in both baselines are treated as noise. The exit status
+is 1 when any regression is found, so the script can gate CI.
+
+Run it with::
+
+    python -m benchmarks.compare results/benchmarks/abc123.json results/benchmarks/def456.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+# Metrics where lower is better, compared for every matched case.
+METRICS = ("seconds", "p50_ms", "p99_ms", "peak_mb")
+_TIME_SCALE = {"seconds": 1.0, "p50_ms": 1e-3, "p99_ms": 1e-3}
+
+
+@dataclass
+class Comparison:
+    """Change of one metric of one case between two baselines."""
+
+    case: str
+    size: int
+    metric: str
+    old: float
+    new: float
+    regression: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.new / self.old if self.old else float("inf")
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_baselines(
+    old: Mapping[str, Any],
+    new: Mapping[str, Any],
+    threshold: float = 0.10,
+    min_seconds: float = 0.005,
+) -> list[Comparison]:
+    """Return a comparison for every metric present in both baselines."""
+
+    previous = {(row["case"], row["size"]): row for row in old["results"]}
+    comparisons = []
+    for row in new["results"]:
+        before = previous.get((row["case"], row["size"]))
+        if before is None:
+            continue
+        for metric in METRICS:
+            if before.get(metric) is None or row.get(metric) is None:
+                continue
+            old_value, new_value = float(before[metric]), float(row[metric])
+            scale = _TIME_SCALE.get(metric)
+            noise = (
+                scale is not None and max(old_value, new_value) * scale < min_seconds
+            )
+            comparisons.append(
+                Comparison(
+                    row["case"],
+                    row["size"],
+                    metric,
+                    old_value,
+                    new_value,
+                    regression=not noise and new_value > old_value * (1 + threshold),
+                )
+            )
+    return comparisons
+
+
+def format_table(comparisons: Sequence[Comparison]) -> str:
+    """Render comparisons as an aligned plain-text table."""
+
+    lines = [f"{'case':<24} {'size':>8} {'metric':<8} {'old':>12} {'new':>12} ratio"]
+    for item in comparisons:
+        flag = "  REGRESSION" if item.regression else ""
+        lines.append(
+            f"{item.case:<24} {item.size:>8} {item.metric:<8} "
+            f"{item.old:>12.4g} {item.new:>12.4g} {item.ratio:5.2f}x{flag}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for comparing two baselines."""
+
+    parser = argparse.ArgumentParser(description="Compare two benchmark baselines")
+    parser.add_argument("old", type=Path, help="Reference baseline")
+    parser.add_argument("new", type=Path, help="Baseline to check")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Print the comparison table and return 1 if anything regressed."""
+
+    args = parse_args(argv)
+    comparisons = compare_baselines(
+        load_baseline(args.old),
+        load_baseline(args.new),
+        threshold=args.threshold,
+        min_seconds=args.min_seconds,
+    )
+    print(format_table(comparisons))
+    regressions = sum(item.regression for item in comparisons)
+    print(f"\n{regressions} regression(s) over {len(comparisons)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Seeded generator for synthetic Markdown corpora and QA datasets.
+
+Documents are built from a pronounceable synthetic vocabulary with
+Zipf-distributed word frequencies, so TF-IDF statistics behave like real
+prose. Every document carries one distinctive "fact" line (an action on a
+topic and the command that performs it); questions ask for that fact and
+are labelled with the document's id, references state it, and predictions
+are noisy copies of the reference. The same seed always yields the same
+corpus and dataset.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+_ONSETS = ("b", "c", "d", "f", "g", "k", "l", "m", "n", "p", "r", "s", "t", "v", "z")
+_VOWELS = ("a", "e", "i", "o", "u")
+_CODAS = ("", "n", "r", "s", "x")
+_VERBS = ("install", "configure", "restart", "upgrade", "inspect", "export")
+# Documents per directory, so huge corpora do not put every file in one folder.
+_DIR_SIZE = 1000
+
+
+def make_vocabulary(size: int, seed: int = 0) -> list[str]:
+    """Return ``size`` distinct pseudo-words of two or three syllables."""
+
+    rng = np.random.default_rng(seed)
+    words: dict[str, None] = {}
+    while len(words) < size:
+        syllables = rng.integers(2, 4)
+        words[
+            "".join(
+                _ONSETS[rng.integers(len(_ONSETS))]
+                + _VOWELS[rng.integers(len(_VOWELS))]
+                + _CODAS[rng.integers(len(_CODAS))]
+                for _ in range(syllables)
+            )
+        ] = None
+    return list(words)
+
+
+@dataclass
+class SyntheticCorpus:
+    """Ids and facts of a generated corpus, enough to derive QA items."""
+
+    root: Path
+    doc_ids: list[str]
+    topics: list[str]
+    verbs: list[str]
+    commands: list[str]
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+
+def generate_corpus(
+    root: Path,
+    num_docs: int,
+    seed: int = 0,
+    sections: int = 4,
+    words_per_section: int = 60,
+    vocabulary_size: int = 5000,
+) -> SyntheticCorpus:
+    """Write ``num_docs`` Markdown files under ``root`` and describe them."""
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(make_vocabulary(vocabulary_size, seed))
+    topics = [
+        f"{a} {b}"
+        for a, b in vocabulary[rng.integers(0, vocabulary_size, (num_docs, 2))]
+    ]
+    verbs = [_VERBS[i] for i in rng.integers(0, len(_VERBS), num_docs)]
+    commands = [f"tool-{seed}-{doc} --{verb}" for doc, verb in enumerate(verbs)]
+    fact_sections = rng.integers(0, sections, num_docs)
+
+    doc_ids = []
+    # Body text is drawn one directory at a time to keep memory flat.
+    for start in range(0, num_docs, _DIR_SIZE):
+        count = min(_DIR_SIZE, num_docs - start)
+        # Zipf ranks clipped to the vocabulary give a realistic long tail.
+        ranks = rng.zipf(1.3, size=count * sections * words_per_section) - 1
+        words = vocabulary[np.minimum(ranks, vocabulary_size - 1)].reshape(
+            count, sections, words_per_section
+        )
+        headings = vocabulary[rng.integers(0, vocabulary_size, (count, sections))]
+        directory = root / f"part{start // _DIR_SIZE:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for offset in range(count):
+            doc = start + offset
+            doc_ids.append(f"{directory.name}/doc{doc:07d}")
+            lines = [f"# {topics[doc].title()} Guide", ""]
+            for section in range(sections):
+                lines.append(f"## {headings[offset, section].title()}")
+                lines.append(" ".join(words[offset, section]) + ".")
+                if section == fact_sections[doc]:
+                    lines.append(
+                        f"To {verbs[doc]} the {topics[doc]}, run `{commands[doc]}`."
+                    )
+                lines.append("")
+            (directory / f"doc{doc:07d}.md").write_text(
+                "\n".join(lines), encoding="utf-8"
+            )
+    return SyntheticCorpus(root, doc_ids, topics, verbs, commands)
+
+
+def iter_qa_items(
+    corpus: SyntheticCorpus, num_items: int, seed: int = 0, noise: float = 0.2
+) -> Iterator[dict[str, str]]:
+    """Yield ``num_items`` labelled QA rows about random corpus documents.
+
+    Each row has ``id``, ``question``, ``doc_id``, ``reference`` and a
+    ``prediction`` in which about ``noise`` of the reference words are
+    replaced, so lexical and semantic metrics spread over their range.
+    """
+
+    rng = np.random.default_rng(seed + 1)
+    docs = rng.integers(0, len(corpus), num_items)
+    for item, doc in enumerate(docs):
+        reference = (
+            f"To {corpus.verbs[doc]} the {corpus.topics[doc]}, "
+            f"run {corpus.commands[doc]}."
+        )
+        words = reference.split()
+        replaced = rng.random(len(words)) < noise
+        prediction = " ".join(
+            "something" if swap else word for word, swap in zip(words, replaced)
+        )
+        yield {
+            "id": f"q{item}",
+            "question": f"How do I {corpus.verbs[doc]} the {corpus.topics[doc]}?",
+            "doc_id": corpus.doc_ids[doc],
+            "reference": reference,
+            "prediction": prediction,
+        }
+
+
+def write_qa_jsonl(
+    path: Path, corpus: SyntheticCorpus, num_items: int, seed: int = 0
+) -> Path:
+    """Write a QA dataset as JSON Lines for the dataset readers."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fp:
+        for row in iter_qa_items(corpus, num_items, seed):
+            fp.write(json.dumps(row) + "\n")
+    return path
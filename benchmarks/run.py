@@ -0,0 +1,360 @@
+"""Run the benchmark suite and save a machine-readable baseline.
+
+For every corpus size the suite times ``DocumentLoader.load``, the
+``EmbeddingIndex`` build, single-query latency (p50/p99) and batch query
+throughput, and ``QABot.answer`` latency. For every dataset size it times
+each available runner's ``evaluate``. Timed cases also run once more under
+``tracemalloc`` to record peak Python memory. Results are written as JSON
+that ``python -m benchmarks.compare`` can diff across commits.
+
+Run it with::
+
+    python -m benchmarks.run --doc-sizes 100 1000 --item-sizes 100 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from evaluations.base_evaluator import BaseEvaluator, EvaluationInput
+from evaluations.deepeval_runner import DeepEvalRunner
+from evaluations.embedding_eval_runner import EmbeddingEvalRunner
+from evaluations.langchain_eval_runner import LangChainEvalRunner
+from evaluations.ragas_runner import RagasRunner
+from evaluations.retrieval_eval_runner import RetrievalEvalRunner
+from src.document_loader import DocumentLoader
+from src.embeddings import EmbeddingIndex
+from src.qa_bot import QABot
+
+from .corpus import SyntheticCorpus, generate_corpus, iter_qa_items
+
+RUNNERS = ("deepeval", "ragas", "retrieval", "embedding", "langchain")
+
+
+@dataclass
+class Measurement:
+    """One benchmark case at one size."""
+
+    case: str
+    size: int
+    seconds: float
+    items: int
+    peak_bytes: int | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "case": self.case,
+            "size": self.size,
+            "seconds": self.seconds,
+            "items_per_s": self.items / self.seconds if self.seconds > 0 else None,
+            "peak_mb": (
+                self.peak_bytes / 2**20 if self.peak_bytes is not None else None
+            ),
+            **self.extra,
+        }
+
+
+def measure(
+    case: str,
+    size: int,
+    fn: Callable[[], Any],
+    items: int,
+    repeat: int = 1,
+    memory: bool = True,
+) -> Measurement:
+    """Time ``fn`` (best of ``repeat``) and optionally its peak traced memory.
+
+    Memory is traced in a separate run so ``tracemalloc`` overhead does not
+    distort the timing.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return Measurement(case, size, min(timings), items, peak)
+
+
+def measure_latency(
+    case: str, size: int, fn: Callable[[str], Any], inputs: Sequence[str]
+) -> Measurement:
+    """Call ``fn`` once per input, recording total time and p50/p99 latency."""
+
+    latencies = np.empty(len(inputs))
+    for row, text in enumerate(inputs):
+        started = time.perf_counter()
+        fn(text)
+        latencies[row] = time.perf_counter() - started
+    p50, p99 = np.percentile(latencies * 1000, [50, 99])
+    return Measurement(
+        case,
+        size,
+        float(latencies.sum()),
+        len(inputs),
+        extra={"p50_ms": float(p50), "p99_ms": float(p99)},
+    )
+
+
+def bench_corpus(
+    corpus: SyntheticCorpus,
+    workdir: Path,
+    num_queries: int,
+    seed: int,
+    repeat: int,
+    memory: bool,
+) -> list[Measurement]:
+    """Benchmark loading, indexing, querying and answering over ``corpus``."""
+
+    size = len(corpus)
+    loader = DocumentLoader(corpus.root)
+    results = [measure("load", size, loader.load, size, repeat, memory)]
+    documents = loader.load()
+    results.append(
+        measure(
+            "index_build",
+            size,
+            lambda: EmbeddingIndex(documents),
+            size,
+            repeat,
+            memory,
+        )
+    )
+
+    index = EmbeddingIndex(documents)
+    questions = [row["question"] for row in iter_qa_items(corpus, num_queries, seed)]
+    results.append(
+        measure_latency("query", size, lambda text: index.query(text, 3), questions)
+    )
+    results.append(
+        measure(
+            "query_batch",
+            size,
+            lambda: index.query_batch(questions, 3),
+            len(questions),
+            repeat,
+            memory,
+        )
+    )
+
+    bot = QABot(
+        documents_path=corpus.root,
+        cache_path=workdir / f"index-{size}.idx",
+        answer_cache_size=0,
+    )
+    try:
+        results.append(measure_latency("answer", size, bot.answer, questions))
+    finally:
+        bot.close()
+    return results
+
+
+def _runner_factories(
+    corpus: SyntheticCorpus, output_dir: Path
+) -> dict[str, Callable[[], BaseEvaluator]]:
+    index = EmbeddingIndex(DocumentLoader(corpus.root).load())
+    return {
+        "deepeval": partial(DeepEvalRunner, output_dir=output_dir),
+        "ragas": partial(RagasRunner, output_dir=output_dir),
+        "retrieval": partial(RetrievalEvalRunner, output_dir=output_dir, index=index),
+        "embedding": partial(
+            EmbeddingEvalRunner,
+            output_dir=output_dir,
+            cache_path=output_dir / "embedding_cache.sqlite3",
+        ),
+        "langchain": partial(
+            LangChainEvalRunner,
+            output_dir=output_dir,
+            cache_path=output_dir / "judge_cache.sqlite3",
+        ),
+    }
+
+
+def bench_runners(
+    corpus: SyntheticCorpus,
+    sizes: Sequence[int],
+    runners: Sequence[str],
+    workdir: Path,
+    seed: int,
+    repeat: int,
+    memory: bool,
+) -> tuple[list[Measurement], dict[str, str]]:
+    """Benchmark each runner's ``evaluate`` over datasets of every size.
+
+    Runners that are not usable here (missing optional packages or models)
+    are skipped and returned with the reason. The embedding and LangChain
+    runners keep their caches in ``workdir``, so only their first timed run
+    is cold; with ``repeat > 1`` the best time reflects a warm cache.
+    """
+
+    factories = _runner_factories(corpus, workdir)
+    results: list[Measurement] = []
+    skipped: dict[str, str] = {}
+    for name in runners:
+        runner = factories[name]()
+        reason = runner.unavailable_reason()
+        if reason is not None:
+            skipped[name] = reason
+            continue
+        for size in sizes:
+            dataset = [
+                EvaluationInput(
+                    row["question"], row["prediction"], row["reference"], row["doc_id"]
+                )
+                for row in iter_qa_items(corpus, size, seed)
+            ]
+            results.append(
+                measure(
+                    f"evaluate:{name}",
+                    size,
+                    lambda: runner.evaluate(dataset),
+                    size,
+                    repeat,
+                    memory,
+                )
+            )
+    return results, skipped
+
+
+def environment(seed: int) -> dict[str, Any]:
+    """Describe the machine and commit the baseline was recorded on."""
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+    }
+
+
+def run_suite(
+    doc_sizes: Sequence[int],
+    item_sizes: Sequence[int],
+    runners: Sequence[str] = RUNNERS,
+    seed: int = 0,
+    num_queries: int = 200,
+    repeat: int = 1,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Generate corpora, run every case and return the baseline document.
+
+    Runner datasets are drawn from the smallest corpus so evaluation cost
+    scales with the item count alone.
+    """
+
+    measurements: list[Measurement] = []
+    skipped: dict[str, str] = {}
+    with tempfile.TemporaryDirectory(prefix="qa-bench-") as tmp:
+        workdir = Path(tmp)
+        corpora = {}
+        for size in sorted(doc_sizes):
+            corpus = generate_corpus(workdir / f"docs-{size}", size, seed)
+            corpora[size] = corpus
+            print(f"[Benchmark] corpus of {size} documents")
+            measurements += bench_corpus(
+                corpus, workdir, num_queries, seed, repeat, memory
+            )
+        if item_sizes and runners:
+            base = corpora[min(corpora)] if corpora else None
+            if base is None:
+                base = generate_corpus(workdir / "docs-runners", 100, seed)
+            print(f"[Benchmark] runners over {', '.join(map(str, item_sizes))} items")
+            results, skipped = bench_runners(
+                base, sorted(item_sizes), runners, workdir, seed, repeat, memory
+            )
+            measurements += results
+    return {
+        "environment": environment(seed),
+        "results": [item.to_dict() for item in measurements],
+        "skipped": skipped,
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark suite."""
+
+    parser = argparse.ArgumentParser(description="QA bot and evaluation benchmarks")
+    parser.add_argument("--doc-sizes", type=int, nargs="*", default=[100, 1000])
+    parser.add_argument("--item-sizes", type=int, nargs="*", default=[100, 1000, 10000])
+    parser.add_argument("--runners", nargs="*", choices=RUNNERS, default=list(RUNNERS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the extra tracemalloc run per case",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Baseline file (default: results/benchmarks/<commit>.json)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the suite from the command line and write the baseline."""
+
+    args = parse_args(argv)
+    baseline = run_suite(
+        args.doc_sizes,
+        args.item_sizes,
+        args.runners,
+        seed=args.seed,
+        num_queries=args.queries,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+    )
+    output = args.output or Path("results/benchmarks") / (
+        f"{baseline['environment']['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(baseline, indent=2), encoding="utf-8")
+    for row in baseline["results"]:
+        peak = f", peak {row['peak_mb']:.1f} MB" if row["peak_mb"] is not None else ""
+        print(f"[Benchmark] {row['case']} @ {row['size']}: {row['seconds']:.4f}s{peak}")
+    for name, reason in baseline["skipped"].items():
+        print(f"[Benchmark] skipped {name}: {reason}")
+    print(f"[Benchmark] baseline written to {output}")
+
+
+if __name__ == "__main__":
+    main()
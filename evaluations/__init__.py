@@ -1,19 +1,48 @@
-"""Evaluation runners for comparing QA performance."""
-
-from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
-from .deepeval_runner import DeepEvalRunner
-from .langchain_eval_runner import LangChainEvalRunner
-from .ragas_runner import RagasRunner
-from .openai_eval_runner import OpenAIEvalRunner
-from . import utils
-
-__all__ = [
-    "BaseEvaluator",
-    "EvaluationInput",
-    "EvaluationResult",
-    "DeepEvalRunner",
-    "LangChainEvalRunner",
-    "RagasRunner",
-    "OpenAIEvalRunner",
-    "utils",
-]
+"""Evaluation runners for comparing QA performance.
+
+Runners are imported on first attribute access, so ``import evaluations``
+stays cheap and only the runners actually used pay for their dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - import-time only for type checkers
+    from . import utils
+    from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+    from .deepeval_runner import DeepEvalRunner
+    from .langchain_eval_runner import LangChainEvalRunner
+    from .openai_eval_runner import OpenAIEvalRunner
+    from .ragas_runner import RagasRunner
+    from .retrieval_eval_runner import RetrievalEvalRunner
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "BaseEvaluator": "base_evaluator",
+    "EvaluationInput": "base_evaluator",
+    "EvaluationResult": "base_evaluator",
+    "DeepEvalRunner": "deepeval_runner",
+    "LangChainEvalRunner": "langchain_eval_runner",
+    "RagasRunner": "ragas_runner",
+    "OpenAIEvalRunner": "openai_eval_runner",
+    "RetrievalEvalRunner": "retrieval_eval_runner",
+}
+
+__all__ = [*_EXPORTS, "utils"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "utils":
+        return importlib.import_module(".utils", __name__)
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -2,20 +2,34 @@
 
 from __future__ import annotations
 
+import functools
 import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
+
+import numpy as np
+
+from src import tracing
+
+from .item_log import ItemLog, aggregate_items, chain_digest, row_key
+from .online_stats import OnlineStats
 
 
 @dataclass
 class EvaluationInput:
-    """Single question and answer pair used as evaluation input."""
+    """Single question and answer pair used as evaluation input.
+
+    ``doc_id`` optionally names the document that should be retrieved for the
+    question, for retrieval-quality metrics.
+    """
 
     question: str
     prediction: str
     reference: str
+    doc_id: str | None = None
 
 
 @dataclass
@@ -27,10 +41,79 @@ class EvaluationResult:
     details: dict[str, object]
 
 
+class StreamingNotSupportedError(NotImplementedError):
+    """Raised when a runner cannot evaluate a dataset incrementally."""
+
+
+def iter_chunks(
+    dataset: Iterable[EvaluationInput], chunk_size: int
+) -> Iterator[list[EvaluationInput]]:
+    """Yield consecutive lists of at most ``chunk_size`` rows from ``dataset``."""
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    iterator = iter(dataset)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+E = TypeVar("E", bound=Callable[..., EvaluationResult])
+
+
+def _with_timings(method: E) -> E:
+    """Run ``method`` in a tracing span and attach the spans it produced.
+
+    With tracing enabled, the span histogram of the call (the runner's own
+    ``evaluate.<name>`` span plus any index or bot spans it triggered on the
+    same thread) is stored under ``details["timings"]``, and the result is
+    saved again if the runner already wrote it during the call.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: BaseEvaluator, *args: Any, **kwargs: Any) -> EvaluationResult:
+        if not tracing.enabled():
+            return method(self, *args, **kwargs)
+        with tracing.collect() as collector:
+            with tracing.span(f"evaluate.{self.name}", method=method.__name__):
+                result = method(self, *args, **kwargs)
+        result.details["timings"] = collector.summary()
+        if collector.saved:
+            self.save_result(result)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
 class BaseEvaluator(ABC):
-    """Shared contract for invoking external evaluation frameworks."""
+    """Shared contract for invoking external evaluation frameworks.
+
+    Runners that spend their time computing locally rather than waiting on a
+    remote service set ``cpu_bound`` so orchestration runs them in a separate
+    process instead of a thread.
+
+    Runners that set ``supports_streaming`` implement :meth:`score_chunk` and
+    can then be driven by :meth:`evaluate_stream`, which consumes the dataset
+    ``chunk_size`` rows at a time and keeps only running statistics, so memory
+    stays bounded regardless of the dataset size.
+
+    Every ``evaluate`` (and the streaming variants) runs in a tracing span;
+    while tracing is enabled the aggregated span timings are attached to the
+    result as ``details["timings"]``.
+    """
 
     name: str
+    cpu_bound: bool = False
+    supports_streaming: bool = False
+    # Per-item metric whose running mean becomes the streamed score.
+    primary_metric: str = "score"
+    # Histogram range for streamed metrics.
+    metric_range: tuple[float, float] = (0.0, 1.0)
+    chunk_size: int = 10_000
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "evaluate" in cls.__dict__:
+            cls.evaluate = _with_timings(cls.__dict__["evaluate"])
 
     def __init__(self, name: str, output_dir: Path | None = None) -> None:
         self.name = name
@@ -41,10 +124,165 @@ class BaseEvaluator(ABC):
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
         """Run evaluation for a dataset returning an aggregated score."""
 
+    def unavailable_reason(self) -> str | None:
+        """Return why this runner cannot score anything, or ``None``."""
+
+        return None
+
+    def score_chunk(self, records: list[EvaluationInput]) -> Mapping[str, np.ndarray]:
+        """Return per-item metric arrays for one chunk of a streamed dataset.
+
+        Unscorable items are ``NaN``. Only runners with ``supports_streaming``
+        implement this.
+        """
+
+        raise StreamingNotSupportedError(
+            f"{self.name} does not support streaming evaluation; use evaluate()"
+        )
+
+    def score_chunk_items(
+        self, records: list[EvaluationInput]
+    ) -> tuple[Mapping[str, np.ndarray], list[dict[str, object] | None] | None]:
+        """Return :meth:`score_chunk` metrics plus optional per-item details.
+
+        Details are only written to item files; runners override this when
+        they have per-item output worth keeping, such as judge verdicts.
+        """
+
+        return self.score_chunk(records), None
+
+    @_with_timings
+    def evaluate_stream(
+        self,
+        dataset: Iterable[EvaluationInput],
+        chunk_size: int | None = None,
+        on_chunk: Callable[[EvaluationResult], None] | None = None,
+    ) -> EvaluationResult:
+        """Evaluate ``dataset`` chunk by chunk in bounded memory.
+
+        After every chunk the running aggregate is written with
+        :meth:`save_result` and passed to ``on_chunk``. Raises
+        :class:`StreamingNotSupportedError` for runners that would otherwise
+        have to buffer the whole dataset.
+        """
+
+        self._check_streaming()
+        error = self.unavailable_reason()
+        if error is not None:
+            return EvaluationResult(self.name, None, {"error": error})
+
+        chunk_size = chunk_size or self.chunk_size
+        stats: dict[str, OnlineStats] = {}
+        result = EvaluationResult(self.name, None, {"error": "empty dataset"})
+        num_chunks = num_samples = 0
+        for chunk in iter_chunks(dataset, chunk_size):
+            for metric, values in self.score_chunk(chunk).items():
+                if metric not in stats:
+                    stats[metric] = OnlineStats(value_range=self.metric_range)
+                stats[metric].update(values)
+            num_chunks += 1
+            num_samples += len(chunk)
+
+            result = self._stream_result(
+                stats,
+                num_samples=num_samples,
+                num_chunks=num_chunks,
+                chunk_size=chunk_size,
+            )
+            self.save_result(result)
+            if on_chunk is not None:
+                on_chunk(result)
+        return result
+
+    @_with_timings
+    def evaluate_to_file(
+        self,
+        dataset: Iterable[EvaluationInput],
+        items_path: Path | None = None,
+        resume: bool = False,
+        chunk_size: int | None = None,
+        checkpoint_every: int = 1,
+    ) -> EvaluationResult:
+        """Stream per-item results to JSONL and aggregate them from the file.
+
+        Items are appended to ``items_path`` (default
+        ``<output_dir>/<name>_items.jsonl``) chunk by chunk and made durable
+        with an fsync'd checkpoint every ``checkpoint_every`` chunks. With
+        ``resume`` the rows covered by the last checkpoint are skipped, so an
+        interrupted run continues where it stopped; the dataset must yield
+        rows in the same order. The final score is computed from the item file.
+        """
+
+        self._check_streaming()
+        error = self.unavailable_reason()
+        if error is not None:
+            return EvaluationResult(self.name, None, {"error": error})
+
+        chunk_size = chunk_size or self.chunk_size
+        items_path = items_path or self.output_dir / f"{self.name}_items.jsonl"
+        log = ItemLog(items_path, resume=resume)
+        try:
+            rows = iter(dataset)
+            if log.resumed_rows:
+                digest, skipped = "", 0
+                for item in islice(rows, log.resumed_rows):
+                    digest = chain_digest(digest, row_key(item))
+                    skipped += 1
+                if skipped != log.resumed_rows or digest != log.checkpoint.digest:
+                    raise ValueError(
+                        f"{items_path} does not match this dataset; "
+                        "rerun without resume"
+                    )
+                print(f"[{self.name}] Resuming after {log.resumed_rows} scored rows")
+
+            for number, chunk in enumerate(iter_chunks(rows, chunk_size), start=1):
+                metrics, details = self.score_chunk_items(chunk)
+                log.append(chunk, metrics, details)
+                if number % checkpoint_every == 0:
+                    log.commit()
+            log.commit(complete=True)
+        finally:
+            log.close()
+
+        stats, num_samples = aggregate_items(items_path, self.metric_range, chunk_size)
+        if not num_samples:
+            return EvaluationResult(self.name, None, {"error": "empty dataset"})
+        result = self._stream_result(
+            stats,
+            num_samples=num_samples,
+            resumed_rows=log.resumed_rows,
+            items_path=str(items_path),
+        )
+        self.save_result(result)
+        return result
+
+    def _check_streaming(self) -> None:
+        if not self.supports_streaming:
+            raise StreamingNotSupportedError(
+                f"{self.name} does not support streaming evaluation; use evaluate()"
+            )
+
+    def _stream_result(
+        self, stats: Mapping[str, OnlineStats], **details: object
+    ) -> EvaluationResult:
+        primary = stats.get(self.primary_metric)
+        return EvaluationResult(
+            framework=self.name,
+            score=primary.mean if primary is not None and primary.count else None,
+            details={
+                "streaming": True,
+                **details,
+                "metrics": {name: item.to_dict() for name, item in stats.items()},
+            },
+        )
+
     def save_result(self, result: EvaluationResult) -> Path:
         """Persist the evaluation result to disk as JSON and return the path."""
 
         path = self.output_dir / f"{self.name}_result.json"
+        collector = tracing.current_collector()
+        if collector is not None:
+            collector.saved = True
 
         with path.open("w", encoding="utf-8") as fp:
             json.dump(
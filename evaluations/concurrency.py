@@ -0,0 +1,181 @@
+"""Concurrency helpers for evaluation runners that call remote services."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``
+    (default: one second's worth, at least one token); :meth:`acquire` blocks
+    until enough tokens are available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` can be taken from the bucket."""
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+@dataclass
+class TaskOutcome(Generic[R]):
+    """Result of one item processed by :func:`run_concurrently`."""
+
+    value: R | None = None
+    error: BaseException | None = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Client exception classes (openai, httpx, requests) that signal a transient
+# failure, matched by name so none of those packages has to be imported.
+_TRANSIENT_ERROR_NAMES = frozenset(
+    {
+        "APIConnectionError",
+        "APITimeoutError",
+        "ConnectError",
+        "ConnectTimeout",
+        "InternalServerError",
+        "RateLimitError",
+        "ReadTimeout",
+        "RemoteProtocolError",
+        "ServiceUnavailableError",
+        "Timeout",
+        "TimeoutException",
+    }
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return whether ``error`` is worth retrying.
+
+    Timeouts, connection errors and HTTP 429/5xx responses are transient;
+    anything else (bad requests, authentication, programming errors) is not.
+    """
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def call_with_retries(
+    fn: Callable[[], R],
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    sleep: Callable[[float], None] = time.sleep,
+    retry_on: Callable[[BaseException], bool] = is_transient,
+) -> R:
+    """Call ``fn`` and retry failures with exponential backoff and full jitter.
+
+    Only exceptions accepted by ``retry_on`` are retried; others are raised
+    at once. The last exception is re-raised once ``max_retries`` retries are
+    used up.
+    """
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt > max_retries or not retry_on(exc):
+                raise
+            sleep(random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1))))
+
+
+def run_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_concurrency: int = 4,
+    rate_limiter: TokenBucket | None = None,
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    retry_on: Callable[[BaseException], bool] = is_transient,
+) -> list[TaskOutcome[R]]:
+    """Apply ``fn`` to ``items`` on a bounded thread pool, preserving order.
+
+    Each call waits for ``rate_limiter`` (if any) before every attempt and is
+    retried on failures accepted by ``retry_on``; an item that still fails is
+    reported through its :class:`TaskOutcome` instead of aborting the other
+    items.
+    """
+
+    def attempt(item: T) -> R:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return fn(item)
+
+    def run_one(item: T) -> TaskOutcome[R]:
+        attempts = 0
+
+        def counted() -> R:
+            nonlocal attempts
+            attempts += 1
+            return attempt(item)
+
+        try:
+            value = call_with_retries(
+                counted, max_retries, base_delay, retry_on=retry_on
+            )
+        except Exception as exc:  # keep going; the caller decides what failed means
+            return TaskOutcome(error=exc, attempts=attempts)
+        return TaskOutcome(value=value, attempts=attempts)
+
+    items = list(items)
+    if max_concurrency <= 1 or len(items) <= 1:
+        return [run_one(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        return list(pool.map(run_one, items))
+
+
+def describe_error(error: BaseException | Any) -> str:
+    """Return a compact ``Type: message`` description of an exception."""
+
+    return f"{type(error).__name__}: {error}"
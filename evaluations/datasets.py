@@ -0,0 +1,340 @@
+"""Streaming readers for evaluation datasets.
+
+Supported inputs:
+
+- JSON Lines files, read one line at a time;
+- JSON files holding a top-level array of questions or an object mapping ids
+  to reference answers, parsed incrementally without loading the whole file;
+- YAML test-case files (``questions`` with ``reference_answer``), which need
+  the optional PyYAML package.
+
+References are joined to questions by id through a :class:`ReferenceIndex`
+that keeps only byte offsets in memory. A sidecar line-offset index
+(``<file>.offsets``) lets sharded workers seek straight to their slice of a
+large JSONL file.
+"""
+
+from __future__ import annotations
+
+import codecs
+import importlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Mapping
+
+import numpy as np
+
+from .base_evaluator import EvaluationInput
+
+_READ_SIZE = 1 << 16
+_DECODER = json.JSONDecoder()
+_NON_WHITESPACE = re.compile(r"[^ \t\r\n]")
+# Field names accepted for a row's reference answer, in order of preference.
+REFERENCE_FIELDS = ("reference", "reference_answer", "ground_truth", "answer")
+
+
+def _load_optional_module(module_name: str) -> Any | None:
+    """Return the imported module or ``None`` when unavailable."""
+
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+
+
+def _row_reference(row: Mapping[str, Any]) -> str | None:
+    for field in REFERENCE_FIELDS:
+        if field in row:
+            return row[field]
+    return None
+
+
+class _JsonStream:
+    """Incremental JSON tokenizer over a binary file.
+
+    Text is decoded chunk by chunk with an incremental UTF-8 decoder, and the
+    absolute byte offset of the read position is tracked so values can later
+    be read back with a single seek.
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self._fp = fp
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(_READ_SIZE)
+        self._eof = not chunk
+        self._text = self._text[self._pos :] + self._decoder.decode(
+            chunk, final=self._eof
+        )
+        self._pos = 0
+        return bool(chunk)
+
+    def _advance(self, end: int) -> None:
+        self._offset += len(self._text[self._pos : end].encode("utf-8"))
+        self._pos = end
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character (``""`` at end of file)."""
+
+        while True:
+            match = _NON_WHITESPACE.search(self._text, self._pos)
+            if match is not None:
+                self._advance(match.start())
+                return match.group()
+            self._advance(len(self._text))
+            if not self._fill():
+                return ""
+
+    def expect(self, token: str) -> None:
+        if self.peek() != token:
+            raise ValueError(f"expected {token!r} at byte {self._offset}")
+        self._advance(self._pos + 1)
+
+    def value(self) -> tuple[Any, int, int]:
+        """Decode the next JSON value; return it with its byte offset and length."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number may continue in the next chunk; make sure it ended.
+            if end == len(self._text) and self._fill():
+                continue
+            start = self._offset
+            self._advance(end)
+            return value, start, self._offset - start
+
+
+def iter_json_array(path: Path) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time."""
+
+    with path.open("rb") as fp:
+        buffer = _JsonStream(fp)
+        buffer.expect("[")
+        if buffer.peek() == "]":
+            return
+        while True:
+            yield buffer.value()[0]
+            if buffer.peek() == "]":
+                return
+            buffer.expect(",")
+
+
+def iter_json_object(path: Path) -> Iterator[tuple[str, Any, int, int]]:
+    """Yield ``(key, value, offset, length)`` for a top-level JSON object.
+
+    ``offset`` and ``length`` locate the value's bytes in the file.
+    """
+
+    with path.open("rb") as fp:
+        buffer = _JsonStream(fp)
+        buffer.expect("{")
+        if buffer.peek() == "}":
+            return
+        while True:
+            key = buffer.value()[0]
+            buffer.expect(":")
+            value, offset, length = buffer.value()
+            yield key, value, offset, length
+            if buffer.peek() == "}":
+                return
+            buffer.expect(",")
+
+
+def iter_jsonl(
+    path: Path, start: int = 0, stop: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield the JSON objects of lines ``start`` to ``stop`` of a JSONL file.
+
+    Blank lines are skipped but still count towards line numbers. Seeking to
+    ``start`` uses the sidecar offset index when one is up to date.
+    """
+
+    with path.open("rb") as fp:
+        line_number = 0
+        if start:
+            offsets = load_offset_index(path)
+            if offsets is not None and start < len(offsets):
+                fp.seek(int(offsets[start]))
+                line_number = start
+            elif offsets is not None:
+                return
+        for line in fp:
+            if stop is not None and line_number >= stop:
+                return
+            if line_number >= start and line.strip():
+                yield json.loads(line)
+            line_number += 1
+
+
+def offset_index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".offsets")
+
+
+def build_offset_index(path: Path) -> np.ndarray:
+    """Write the byte offset of every line of ``path`` to a sidecar file.
+
+    The sidecar stores the source size and modification time followed by
+    the offsets as little-endian int64, so stale indexes are detected.
+    """
+
+    offsets = []
+    position = 0
+    with path.open("rb") as fp:
+        for line in fp:
+            offsets.append(position)
+            position += len(line)
+    stat = path.stat()
+    header = np.array([stat.st_size, stat.st_mtime_ns], dtype="<i8")
+    array = np.asarray(offsets, dtype="<i8")
+    index = offset_index_path(path)
+    tmp = index.with_name(index.name + ".tmp")
+    with tmp.open("wb") as fp:
+        fp.write(header.tobytes())
+        fp.write(array.tobytes())
+    os.replace(tmp, index)
+    return array
+
+
+def load_offset_index(path: Path) -> np.ndarray | None:
+    """Return the memory-mapped line offsets of ``path``, or ``None`` if stale."""
+
+    index = offset_index_path(path)
+    if not index.exists() or index.stat().st_size < 16:
+        return None
+    stat = path.stat()
+    header = np.fromfile(index, dtype="<i8", count=2)
+    if header[0] != stat.st_size or header[1] != stat.st_mtime_ns:
+        return None
+    if index.stat().st_size == 16:
+        return np.zeros(0, dtype="<i8")
+    return np.memmap(index, dtype="<i8", mode="r", offset=16)
+
+
+def shard_bounds(path: Path, shard: int, num_shards: int) -> tuple[int, int]:
+    """Return the ``[start, stop)`` line range of ``shard`` out of ``num_shards``.
+
+    Builds the sidecar offset index if it is missing or stale.
+    """
+
+    if not 0 <= shard < num_shards:
+        raise ValueError("shard must be in [0, num_shards)")
+    offsets = load_offset_index(path)
+    if offsets is None:
+        offsets = build_offset_index(path)
+    bounds = np.linspace(0, len(offsets), num_shards + 1).astype(int)
+    return int(bounds[shard]), int(bounds[shard + 1])
+
+
+class ReferenceIndex:
+    """Id → reference lookup that keeps only byte offsets in memory.
+
+    ``path`` is either a JSON object mapping ids to answers or a JSONL file
+    whose rows carry an ``id`` and one of :data:`REFERENCE_FIELDS`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._jsonl = path.suffix == ".jsonl"
+        self._offsets: dict[str, tuple[int, int]] = {}
+        if self._jsonl:
+            with path.open("rb") as fp:
+                offset = 0
+                for line in fp:
+                    if line.strip():
+                        row = json.loads(line)
+                        self._offsets[str(row["id"])] = (offset, len(line))
+                    offset += len(line)
+        else:
+            for key, _, offset, length in iter_json_object(path):
+                self._offsets[key] = (offset, length)
+        self._fp = path.open("rb")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._offsets
+
+    def get(self, key: str, default: str = "") -> str:
+        """Read the reference for ``key`` straight from its byte range."""
+
+        location = self._offsets.get(key)
+        if location is None:
+            return default
+        self._fp.seek(location[0])
+        value = json.loads(self._fp.read(location[1]))
+        if self._jsonl:
+            value = _row_reference(value)
+        return default if value is None else value
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def iter_yaml_test_cases(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the question rows of a YAML test-case file."""
+
+    yaml = _load_optional_module("yaml")
+    if yaml is None:
+        raise ImportError(
+            "Reading YAML test cases requires PyYAML. Install with: pip install pyyaml"
+        )
+    with path.open("r", encoding="utf-8") as fp:
+        document = yaml.safe_load(fp) or {}
+    yield from document.get("questions", [])
+
+
+def iter_question_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream question rows from a JSON, JSONL or YAML file by suffix."""
+
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        return iter_jsonl(path)
+    if suffix in (".yaml", ".yml"):
+        return iter_yaml_test_cases(path)
+    if suffix == ".json":
+        return iter_json_array(path)
+    raise ValueError(f"Unsupported dataset format: {path}")
+
+
+def iter_evaluation_inputs(
+    questions_path: Path,
+    ground_truth_path: Path | None = None,
+    predictions: Mapping[str, str] | None = None,
+) -> Iterator[EvaluationInput]:
+    """Yield ``EvaluationInput`` rows joined from questions and references.
+
+    A reference found on the question row itself wins; otherwise it is looked
+    up by id in ``ground_truth_path``.
+    """
+
+    references = ReferenceIndex(ground_truth_path) if ground_truth_path else None
+    try:
+        for row in iter_question_rows(questions_path):
+            question_id = str(row.get("id", ""))
+            reference = _row_reference(row)
+            if reference is None:
+                reference = references.get(question_id) if references else ""
+            yield EvaluationInput(
+                question=row["question"],
+                prediction=(predictions or {}).get(question_id, ""),
+                reference=reference,
+                doc_id=row.get("doc_id"),
+            )
+    finally:
+        if references is not None:
+            references.close()
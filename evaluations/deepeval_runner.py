@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import importlib
-import os
 from typing import Any, Iterable
 
-from dotenv import load_dotenv
+import numpy as np
 
-from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from src.config import settings
 
-load_dotenv()
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from .lexical_metrics import score_inputs
 
 
 def _load_optional_class(module_name: str, class_name: str) -> Any | None:
@@ -26,13 +26,17 @@ def _load_optional_class(module_name: str, class_name: str) -> Any | None:
 class DeepEvalRunner(BaseEvaluator):
     """Wraps DeepEval's evaluation pipeline or uses simple offline evaluation."""
 
+    cpu_bound = True
+    supports_streaming = True
+    primary_metric = "jaccard"
+
     def __init__(self, output_dir=None) -> None:
         super().__init__("deepeval", output_dir=output_dir)
         # Use simple offline evaluation instead of DeepEval's LLM-dependent metrics
         self._available = True
 
         # Log configuration
-        model = os.getenv("OLLAMA_MODEL", "unknown")
+        model = settings.ollama_model or "unknown"
         print(f"[DeepEval] Using offline word-overlap metric (model config: {model})")
 
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
@@ -49,23 +53,20 @@ class DeepEvalRunner(BaseEvaluator):
                 details={"error": "deepeval not installed"},
             )
 
-        # Simple offline evaluation: measure answer length and word overlap as a basic proxy
-        total_overlap = 0.0
-        for item in records:
-            pred_words = set(item.prediction.lower().split())
-            ref_words = set(item.reference.lower().split())
-            if pred_words or ref_words:
-                overlap = len(pred_words & ref_words) / max(
-                    len(pred_words | ref_words), 1
-                )
-                total_overlap += overlap
-
-        score = total_overlap / len(records) if records else 0.0
+        # Simple offline evaluation: word overlap (Jaccard) as a basic proxy
+        scores = score_inputs(records)
+        score = float(scores.jaccard.mean())
         details = {
             "metric": "word_overlap",
             "num_samples": len(records),
             "method": "offline_comparison",
+            "metrics": scores.mean(),
         }
         result = EvaluationResult(framework=self.name, score=score, details=details)
         self.save_result(result)
         return result
+
+    def score_chunk(self, records: list[EvaluationInput]) -> dict[str, np.ndarray]:
+        """Return every lexical metric per item for one streamed chunk."""
+
+        return score_inputs(records).columns()
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import importlib
+import importlib.util
+from pathlib import Path
 from typing import Any, Iterable
 
-from dotenv import load_dotenv
+import numpy as np
 
-from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from src.config import settings
 
-load_dotenv()
+from . import model_registry
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from .embedding_store import EmbeddingStore, embedding_key
 
 
 def _load_optional_class(module_name: str, class_name: str) -> Any | None:
@@ -22,6 +26,16 @@ def _load_optional_class(module_name: str, class_name: str) -> Any | None:
         return None
 
 
+def _module_available(module_name: str) -> bool:
+    """Return whether ``module_name`` can be imported, without importing it."""
+
+    return importlib.util.find_spec(module_name) is not None
+
+
+# Default for ``cache_path``: use the configured store. ``None`` disables it.
+_FROM_SETTINGS: Any = object()
+
+
 class EmbeddingEvalRunner(BaseEvaluator):
     """Uses embedding-based similarity to evaluate answers.
 
@@ -29,39 +43,79 @@ class EmbeddingEvalRunner(BaseEvaluator):
     It converts both prediction and reference answers into dense vector embeddings
     and calculates cosine similarity. This captures semantic meaning better than
     word overlap but is faster and cheaper than LLM-based evaluation.
-    """
 
-    def __init__(self, output_dir=None) -> None:
-        super().__init__("embedding", output_dir=output_dir)
+    Every distinct text in a dataset is encoded once, in batches of
+    ``batch_size``, and embeddings are kept in a content-addressed on-disk
+    store (``cache_path``) so unchanged answers are never re-encoded across
+    runs. The encoder is loaded on first use and shared by every runner in
+    the process; pass ``model`` to supply an already loaded one instead.
+    Stored vectors are keyed by ``model_name``, so an injected ``model`` only
+    uses the store when ``model_name`` names it; ``cache_path=None`` turns
+    the store off.
+    """
 
-        # Try to load sentence-transformers for embedding generation
-        SentenceTransformer = _load_optional_class(
-            "sentence_transformers",
-            "SentenceTransformer",
-        )
+    model_name = "all-MiniLM-L6-v2"
+    supports_streaming = True
+    primary_metric = "cosine_similarity"
+    metric_range = (-1.0, 1.0)
 
-        if SentenceTransformer is None:
-            self._available = False
-            self._model = None
+    def __init__(
+        self,
+        output_dir=None,
+        model: Any | None = None,
+        cache_path: Path | None = _FROM_SETTINGS,
+        batch_size: int = 256,
+        model_name: str | None = None,
+    ) -> None:
+        super().__init__("embedding", output_dir=output_dir)
+        self.batch_size = batch_size
+        if cache_path is _FROM_SETTINGS:
+            cache_path = settings.embedding_eval_cache_path
+        if model is not None and model_name is None and cache_path:
+            # Without a name the injected encoder's vectors could be mixed
+            # with another model's, so they are not persisted.
+            print("[Embedding] Injected model has no model_name; cache disabled")
+            cache_path = None
+        if model_name is not None:
+            self.model_name = model_name
+        self._store = EmbeddingStore(cache_path) if cache_path else None
+        self._error: str | None = None
+        # The model is loaded on first use through the shared registry, so
+        # constructing a runner is cheap and instances share one model.
+        self._model_instance: Any | None = model
+        if model is None and not _module_available("sentence_transformers"):
             self._error = (
                 "sentence-transformers not installed. "
                 "Install with: pip install sentence-transformers"
             )
             print(f"[Embedding] ⚠ {self._error}")
-            return
 
-        self._available = True
-        try:
-            # Use a lightweight, fast embedding model
-            self._model = SentenceTransformer("all-MiniLM-L6-v2")
-            print(
-                "[Embedding] Using sentence-transformers (all-MiniLM-L6-v2) for semantic similarity"
-            )
-        except (OSError, IOError, RuntimeError) as exc:
-            self._available = False
-            self._model = None
-            self._error = f"Failed to load embedding model: {exc}"
-            print(f"[Embedding] ⚠ {self._error}")
+    @property
+    def _model(self) -> Any | None:
+        if self._model_instance is None and self._error is None:
+            try:
+                self._model_instance = model_registry.get_or_create(
+                    ("sentence-transformers", self.model_name), self._load_model
+                )
+            except (ImportError, OSError, RuntimeError) as exc:
+                self._error = f"Failed to load embedding model: {exc}"
+                print(f"[Embedding] ⚠ {self._error}")
+        return self._model_instance
+
+    def _load_model(self) -> Any:
+        SentenceTransformer = _load_optional_class(
+            "sentence_transformers",
+            "SentenceTransformer",
+        )
+        if SentenceTransformer is None:
+            raise ImportError("sentence_transformers.SentenceTransformer not found")
+        # Use a lightweight, fast embedding model
+        model = SentenceTransformer(self.model_name)
+        print(
+            f"[Embedding] Using sentence-transformers ({self.model_name}) "
+            "for semantic similarity"
+        )
+        return model
 
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
         records = list(dataset)
@@ -70,41 +124,17 @@ class EmbeddingEvalRunner(BaseEvaluator):
                 framework=self.name, score=None, details={"error": "empty dataset"}
             )
 
-        if not self._available:
-            return EvaluationResult(
-                framework=self.name,
-                score=None,
-                details={"error": self._error or "embedding evaluator not available"},
-            )
-
-        if self._model is None:
+        error = self.unavailable_reason()
+        if error is not None:
             return EvaluationResult(
-                framework=self.name,
-                score=None,
-                details={"error": "embedding model failed to load"},
+                framework=self.name, score=None, details={"error": error}
             )
 
-        # Calculate cosine similarity between prediction and reference embeddings
-        total_similarity = 0.0
-        for item in records:
-            try:
-                # Generate embeddings for prediction and reference
-                pred_embedding = self._model.encode(
-                    item.prediction, convert_to_tensor=False
-                )
-                ref_embedding = self._model.encode(
-                    item.reference, convert_to_tensor=False
-                )
-
-                # Calculate cosine similarity
-                similarity = self._cosine_similarity(pred_embedding, ref_embedding)
-                total_similarity += similarity
-            except (OSError, ValueError, RuntimeError) as exc:
-                # If embedding fails for any item, skip it
-                print(f"[Embedding] Warning: failed to embed item: {exc}")
-                continue
+        similarities, unique_texts, cache_stats = self._similarities(records)
 
-        avg_score = total_similarity / len(records) if records else 0.0
+        # Items whose text failed to embed score NaN and count as zero.
+        failed = np.isnan(similarities)
+        avg_score = float(np.where(failed, 0.0, similarities).sum()) / len(records)
 
         # Clamp to [0, 1] range in case of numerical issues
         avg_score = max(0.0, min(1.0, avg_score))
@@ -112,30 +142,121 @@ class EmbeddingEvalRunner(BaseEvaluator):
         details = {
             "metric": "cosine_similarity",
             "num_samples": len(records),
+            "num_failed": int(failed.sum()),
             "method": "semantic_embedding",
-            "embedding_model": "all-MiniLM-L6-v2",
+            "embedding_model": self.model_name,
+            "unique_texts": unique_texts,
+            "cache": cache_stats,
+            "per_item": [
+                None if missing else float(score)
+                for score, missing in zip(similarities, failed)
+            ],
         }
         result = EvaluationResult(framework=self.name, score=avg_score, details=details)
         self.save_result(result)
         return result
 
-    @staticmethod
-    def _cosine_similarity(vec1: Any, vec2: Any) -> float:
-        """Calculate cosine similarity between two vectors."""
-        import numpy as np
+    def unavailable_reason(self) -> str | None:
+        if self._model is None:
+            return self._error or "embedding model failed to load"
+        return None
 
-        # Convert to numpy arrays if needed
-        if not isinstance(vec1, np.ndarray):
-            vec1 = np.array(vec1)
-        if not isinstance(vec2, np.ndarray):
-            vec2 = np.array(vec2)
+    def score_chunk(self, records: list[EvaluationInput]) -> dict[str, np.ndarray]:
+        """Return per-item cosine similarities; failed items are NaN."""
+
+        return {"cosine_similarity": self._similarities(records)[0]}
+
+    def _similarities(
+        self, records: list[EvaluationInput]
+    ) -> tuple[np.ndarray, int, dict[str, int]]:
+        """Return per-item similarities, the unique text count and cache stats."""
+
+        # Encode each distinct text once, then score all pairs in one step.
+        texts = list(
+            dict.fromkeys(
+                text for item in records for text in (item.prediction, item.reference)
+            )
+        )
+        row_of = {text: row for row, text in enumerate(texts)}
+        embeddings, cache_stats = self._embed(texts)
+
+        pred_rows = np.fromiter(
+            (row_of[item.prediction] for item in records), dtype=np.int64
+        )
+        ref_rows = np.fromiter(
+            (row_of[item.reference] for item in records), dtype=np.int64
+        )
+        similarities = self._rowwise_cosine(embeddings[pred_rows], embeddings[ref_rows])
+        return similarities, len(texts), cache_stats
 
-        # Calculate cosine similarity
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+    def _embed(self, texts: list[str]) -> tuple[np.ndarray, dict[str, int]]:
+        """Return one embedding row per text, consulting the on-disk store."""
 
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        stored = self._store.get_many(keys) if self._store is not None else {}
+        missing = [row for row, key in enumerate(keys) if key not in stored]
+
+        encoded: dict[int, np.ndarray] = {}
+        for start in range(0, len(missing), self.batch_size):
+            rows = missing[start : start + self.batch_size]
+            encoded.update(zip(rows, self._encode([texts[row] for row in rows])))
+        if self._store is not None:
+            self._store.put_many(
+                {
+                    keys[row]: vector
+                    for row, vector in encoded.items()
+                    if not np.isnan(vector).any()
+                }
+            )
+
+        vectors = [stored.get(key) for key in keys]
+        for row, vector in encoded.items():
+            vectors[row] = vector
+        dim = max((len(v) for v in vectors if v is not None and len(v)), default=0)
+        matrix = np.full((len(texts), dim), np.nan, dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            if vector is not None and len(vector) == dim:
+                matrix[row] = vector
+        return matrix, {
+            "hits": len(stored),
+            "misses": len(missing),
+            "encoded": len(encoded),
+        }
+
+    def _encode(self, texts: list[str]) -> list[np.ndarray]:
+        """Encode a batch, falling back to one text at a time on failure."""
+
+        try:
+            batch = self._model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            return list(np.asarray(batch, dtype=np.float32))
+        except (OSError, ValueError, RuntimeError) as exc:
+            print(f"[Embedding] Warning: batch encoding failed, retrying items: {exc}")
+
+        vectors = []
+        for text in texts:
+            try:
+                vectors.append(
+                    np.asarray(
+                        self._model.encode(text, convert_to_numpy=True),
+                        dtype=np.float32,
+                    )
+                )
+            except (OSError, ValueError, RuntimeError) as exc:
+                # If embedding fails for any item, skip it
+                print(f"[Embedding] Warning: failed to embed item: {exc}")
+                vectors.append(np.full(0, np.nan, dtype=np.float32))
+        return vectors
+
+    @staticmethod
+    def _rowwise_cosine(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Return the cosine similarity of each row pair, 0 for zero vectors."""
 
-        return float(dot_product / (norm1 * norm2))
+        dots = np.einsum("ij,ij->i", left, right, dtype=np.float64)
+        norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(norms == 0, 0.0, dots / norms)
@@ -0,0 +1,72 @@
+"""Content-addressed on-disk store for text embeddings."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import numpy as np
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Return the store key of ``text`` embedded by ``model_name``."""
+
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite-backed mapping from content hashes to float32 vectors.
+
+    Keys come from :func:`embedding_key`, so a text is embedded once per model
+    no matter how many runs or datasets reference it.
+    """
+
+    _BATCH = 500
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """Return the stored vectors for whichever ``keys`` are present."""
+
+        keys = list(keys)
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._BATCH):
+                chunk = keys[start : start + self._BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, vectors: Mapping[str, np.ndarray]) -> None:
+        """Store ``vectors`` keyed by their content hash."""
+
+        rows = [
+            (key, int(vector.shape[-1]), np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in vectors.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
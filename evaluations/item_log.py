@@ -0,0 +1,200 @@
+"""Append-only per-item result files with fsync'd checkpoints.
+
+Each scored row becomes one JSON line::
+
+    {"row": 0, "key": "…", "metrics": {"jaccard": 0.5}, "details": {…}}
+
+A checkpoint file next to the item file records how many rows and bytes are
+durable. Items are fsync'd before the checkpoint is atomically replaced, so
+after a crash everything up to the last checkpoint can be trusted and
+anything after it is truncated on resume.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from .online_stats import OnlineStats
+
+if TYPE_CHECKING:
+    from .base_evaluator import EvaluationInput
+
+
+def row_key(item: EvaluationInput) -> str:
+    """Return a short content hash identifying one dataset row."""
+
+    digest = hashlib.blake2b(digest_size=8)
+    for field in (item.question, item.prediction, item.reference):
+        encoded = field.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def chain_digest(previous: str, key: str) -> str:
+    """Extend the running digest of all row keys so far with ``key``."""
+
+    return hashlib.blake2b(
+        f"{previous}:{key}".encode("ascii"), digest_size=16
+    ).hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    """Durable progress of an item file.
+
+    ``digest`` chains the keys of every row written so far, so a resume can
+    verify that the skipped rows are the ones that were actually scored.
+    """
+
+    rows: int = 0
+    bytes: int = 0
+    digest: str = ""
+    complete: bool = False
+
+    @classmethod
+    def read(cls, path: Path) -> "Checkpoint | None":
+        try:
+            return cls(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+
+    def write(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fp:
+            json.dump(self.__dict__, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, path)
+
+
+def checkpoint_path(items_path: Path) -> Path:
+    return items_path.with_name(items_path.name + ".checkpoint")
+
+
+class ItemLog:
+    """Writer for an item file and its checkpoint.
+
+    With ``resume`` the file is truncated to the last checkpoint and
+    :attr:`checkpoint` tells the caller how many rows to skip; a checkpoint
+    claiming more bytes than the file holds raises :class:`ValueError`.
+    Otherwise any previous file and checkpoint are replaced.
+    """
+
+    def __init__(self, path: Path, resume: bool = False) -> None:
+        self.path = path
+        self.checkpoint_path = checkpoint_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume:
+            previous = Checkpoint.read(self.checkpoint_path)
+            if previous is not None and not path.exists():
+                previous = None
+            if previous is not None and previous.bytes > path.stat().st_size:
+                raise ValueError(
+                    f"{self.checkpoint_path} covers {previous.bytes} bytes but "
+                    f"{path} holds {path.stat().st_size}; rerun without resume"
+                )
+        else:
+            # A fresh run must not leave an old checkpoint that a later
+            # resume would trust before this run's first commit.
+            self.checkpoint_path.unlink(missing_ok=True)
+            previous = None
+        self.checkpoint = previous or Checkpoint()
+        self.resumed_rows = self.checkpoint.rows
+        self._fp: IO[bytes] = path.open("r+b" if previous else "wb")
+        # Drop items written after the last durable checkpoint.
+        self._fp.truncate(self.checkpoint.bytes)
+        self._fp.seek(self.checkpoint.bytes)
+        self.checkpoint.complete = False
+
+    def append(
+        self,
+        records: Sequence[EvaluationInput],
+        metrics: Mapping[str, np.ndarray],
+        details: Sequence[Mapping[str, object] | None] | None = None,
+    ) -> None:
+        """Append one line per record with its metrics and optional details."""
+
+        columns = {
+            name: np.asarray(values).tolist() for name, values in metrics.items()
+        }
+        for offset, item in enumerate(records):
+            key = row_key(item)
+            line: dict[str, object] = {
+                "row": self.checkpoint.rows + offset,
+                "key": key,
+                "metrics": {
+                    name: None if _is_nan(values[offset]) else values[offset]
+                    for name, values in columns.items()
+                },
+            }
+            if details is not None and details[offset] is not None:
+                line["details"] = details[offset]
+            self._fp.write(json.dumps(line, default=str).encode("utf-8") + b"\n")
+            self.checkpoint.digest = chain_digest(self.checkpoint.digest, key)
+        self.checkpoint.rows += len(records)
+
+    def commit(self, complete: bool = False) -> None:
+        """Make every appended item durable and record the checkpoint."""
+
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self.checkpoint.bytes = self._fp.tell()
+        self.checkpoint.complete = complete
+        self.checkpoint.write(self.checkpoint_path)
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def iter_items(path: Path) -> Iterator[dict[str, object]]:
+    """Yield the JSON items stored in ``path`` one at a time."""
+
+    with path.open("r", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+
+
+def aggregate_items(
+    path: Path,
+    metric_range: tuple[float, float] = (0.0, 1.0),
+    chunk_size: int = 10_000,
+) -> tuple[dict[str, OnlineStats], int]:
+    """Fold the metrics of every item in ``path`` into running statistics.
+
+    Returns the statistics per metric and the number of items read.
+    """
+
+    stats: dict[str, OnlineStats] = {}
+    pending: dict[str, list[float]] = {}
+    count = 0
+
+    def flush() -> None:
+        for name, values in pending.items():
+            if name not in stats:
+                stats[name] = OnlineStats(value_range=metric_range)
+            stats[name].update(np.array(values, dtype=np.float64))
+            values.clear()
+
+    for item in iter_items(path):
+        count += 1
+        for name, value in item["metrics"].items():  # type: ignore[union-attr]
+            pending.setdefault(name, []).append(math.nan if value is None else value)
+        if count % chunk_size == 0:
+            flush()
+    flush()
+    return stats, count
+
+
+def _is_nan(value: object) -> bool:
+    return isinstance(value, float) and math.isnan(value)
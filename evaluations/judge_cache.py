@@ -0,0 +1,94 @@
+"""Persistent cache of LLM-as-judge verdicts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+
+def judge_cache_key(
+    provider: str,
+    model_name: str,
+    template_version: str,
+    question: str,
+    prediction: str,
+    reference: str,
+) -> str:
+    """Return the cache key of one judge call.
+
+    Every field is length-prefixed before hashing so no two different inputs
+    can collide by shifting text between fields.
+    """
+
+    digest = hashlib.sha256()
+    for field in (
+        provider,
+        model_name,
+        template_version,
+        question,
+        prediction,
+        reference,
+    ):
+        encoded = field.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class JudgeCache:
+    """SQLite-backed mapping from :func:`judge_cache_key` keys to verdicts.
+
+    Verdicts are the JSON-serializable dicts returned by the judge; anything
+    that does not serialize natively is stored as its string form.
+    """
+
+    _BATCH = 500
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, verdict TEXT NOT NULL)"
+            )
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the stored verdicts for whichever ``keys`` are present."""
+
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._BATCH):
+                chunk = keys[start : start + self._BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, verdict FROM verdicts WHERE key IN ({placeholders})",
+                    chunk,
+                )
+                for key, verdict in rows:
+                    found[key] = json.loads(verdict)
+        return found
+
+    def put_many(self, verdicts: Mapping[str, Mapping[str, Any]]) -> None:
+        """Store ``verdicts`` under their keys."""
+
+        rows = [
+            (key, json.dumps(dict(verdict), default=str))
+            for key, verdict in verdicts.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts (key, verdict) VALUES (?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
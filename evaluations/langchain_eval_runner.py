@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 import importlib
+import importlib.util
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Callable, Iterable, Optional, cast
 
-from dotenv import load_dotenv
+import numpy as np
 
 from src.config import settings
 
+from . import model_registry
 from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
-
-load_dotenv()
+from .concurrency import TokenBucket, describe_error, run_concurrently
+from .judge_cache import JudgeCache, judge_cache_key
 
 
 def _load_optional_class(module_name: str, class_name: str) -> Any | None:
@@ -23,28 +29,168 @@ def _load_optional_class(module_name: str, class_name: str) -> Any | None:
         return None
 
 
-class LangChainEvalRunner(BaseEvaluator):
-    """Uses LangChain's built-in evaluators when installed."""
+def _module_available(module_name: str) -> bool:
+    """Return whether ``module_name`` can be imported, without importing it."""
+
+    return importlib.util.find_spec(module_name) is not None
+
+
+# Default for ``cache_path``: use the configured cache. ``None`` disables it.
+_FROM_SETTINGS: Any = object()
+
+
+_PACKED_PROMPT = """You are a teacher grading a quiz.
+You are given {count} numbered items. Each has a question, a student's answer \
+and the true answer. Grade each student answer against its true answer based \
+only on factual accuracy; ignore differences in punctuation and phrasing, and \
+answers that contain more information than the true answer are fine as long \
+as they do not contradict it.
+
+Reply with exactly one line per item in the form "<number>: CORRECT" or \
+"<number>: INCORRECT", in item order, and nothing else.
+
+{items}
+"""
+
+_VERDICT_LINE = re.compile(
+    r"^\W*(?:item\s*)?(\d+)\s*[:.)\-]\s*\W*(CORRECT|INCORRECT)\b", re.IGNORECASE
+)
+
+
+def build_packed_prompt(items: list[EvaluationInput]) -> str:
+    """Return one grading prompt covering every item in ``items``."""
+
+    blocks = [
+        f"Item {number}\nQUESTION: {item.question}\n"
+        f"STUDENT ANSWER: {item.prediction}\nTRUE ANSWER: {item.reference}"
+        for number, item in enumerate(items, start=1)
+    ]
+    return _PACKED_PROMPT.format(count=len(items), items="\n\n".join(blocks))
+
+
+def parse_packed_verdicts(text: str, count: int) -> list[dict[str, Any] | None]:
+    """Parse ``count`` numbered verdicts from a packed grading reply.
+
+    Verdicts use the same ``value``/``score`` shape as ``QAEvalChain``. Items
+    without a verdict, or with contradicting verdicts, come back as ``None``.
+    """
+
+    found: dict[int, str | None] = {}
+    for line in str(text).splitlines():
+        match = _VERDICT_LINE.match(line)
+        if match is None:
+            continue
+        number, value = int(match.group(1)), match.group(2).upper()
+        if not 1 <= number <= count:
+            continue
+        found[number] = value if found.get(number, value) == value else None
+
+    verdicts: list[dict[str, Any] | None] = []
+    for number in range(1, count + 1):
+        value = found.get(number)
+        verdicts.append(
+            None
+            if value is None
+            else {"reasoning": None, "value": value, "score": int(value == "CORRECT")}
+        )
+    return verdicts
+
+
+@dataclass
+class _JudgeBatch:
+    """Verdicts for one batch of items, keyed by :func:`judge_cache_key`."""
+
+    keys: list[str]
+    verdicts: dict[str, Any]
+    errors: dict[str, str]
+    hits: int
+    judge_calls: int
+    packed: int
 
-    def __init__(self, output_dir=None) -> None:
+
+class LangChainEvalRunner(BaseEvaluator):
+    """Uses LangChain's built-in evaluators when installed.
+
+    Items are graded concurrently by up to ``max_concurrency`` judge calls,
+    throttled to ``requests_per_second`` (``0`` disables the limit) and
+    retried ``max_retries`` times with jittered exponential backoff. Results
+    keep the input order, and items that still fail are reported in
+    ``details`` without sinking the run. ``llm_builder`` and
+    ``qa_eval_chain_cls`` replace the configured chat model and evaluator,
+    e.g. with a local stub; ``model_name`` then names the model for caching.
+
+    Verdicts are cached on disk (``cache_path``) keyed by provider, model,
+    prompt template version and the graded strings, so unchanged items are
+    never sent to the judge twice; ``cache_path=None`` disables the cache
+    for this runner. Bump ``prompt_template_version`` whenever
+    the grading prompt changes.
+
+    With ``pack_size`` above 1, pending items are packed ``pack_size`` at a
+    time into one numbered grading prompt and the per-item verdicts are
+    parsed back out, cutting chat requests by roughly that factor. Items
+    whose verdict cannot be parsed are graded one at a time as usual.
+    """
+
+    supports_streaming = True
+    prompt_template_version = "qa-eval/1"
+    packed_template_version = "qa-eval-packed/1"
+    retry_base_delay = 0.5
+
+    def __init__(
+        self,
+        output_dir=None,
+        max_concurrency: int | None = None,
+        requests_per_second: float | None = None,
+        max_retries: int | None = None,
+        llm_builder: Callable[[], Any] | None = None,
+        qa_eval_chain_cls: Any | None = None,
+        model_name: str | None = None,
+        cache_path: Path | None = _FROM_SETTINGS,
+        pack_size: int | None = None,
+    ) -> None:
         super().__init__("langchain", output_dir=output_dir)
+        if cache_path is _FROM_SETTINGS:
+            cache_path = settings.langchain_judge_cache_path
+        self._cache = JudgeCache(cache_path) if cache_path else None
+        self.max_concurrency = max_concurrency or settings.langchain_max_concurrency
+        self.requests_per_second = (
+            settings.langchain_requests_per_second
+            if requests_per_second is None
+            else requests_per_second
+        )
+        self.pack_size = max(1, pack_size or settings.langchain_pack_size)
+        self.max_retries = (
+            settings.langchain_max_retries if max_retries is None else max_retries
+        )
         self._llm_builder: Optional[Callable[[], Any]] = None
         self._llm_provider: Optional[str] = None
+        self._model_name: Optional[str] = model_name
         self._llm_error: Optional[str] = None
-        self._qa_eval_chain_cls: Any | None = _load_optional_class(
-            "langchain.evaluation.qa",
-            "QAEvalChain",
+        self._llm_instance: Any | None = None
+        # Shared by every batch so streamed chunks respect one global rate.
+        self._rate_limiter = (
+            TokenBucket(self.requests_per_second)
+            if self.requests_per_second > 0
+            else None
         )
-
-        if self._qa_eval_chain_cls is None:
-            self._available = False
-            if self._llm_error is None:
-                self._llm_error = (
-                    "LangChain QA evaluator is unavailable; install langchain."
-                )
+        self._qa_chain_instance: Any | None = None
+        # LangChain itself is imported on first use; until then only check
+        # that it is installed.
+        self._qa_eval_chain_cls: Any | None = qa_eval_chain_cls
+        self._available = qa_eval_chain_cls is not None or _module_available(
+            "langchain"
+        )
+        if not self._available:
+            self._llm_error = (
+                "LangChain QA evaluator is unavailable; install langchain."
+            )
             return
 
-        self._available = True
+        if llm_builder is not None:
+            self._llm_builder = llm_builder
+            self._llm_provider = "custom"
+            self._model_name = model_name or "custom"
+            return
 
         if settings.langchain_use_ollama:
             self._configure_ollama_backend()
@@ -66,12 +212,7 @@ class LangChainEvalRunner(BaseEvaluator):
             print("[LangChain] Backend not configured")
 
     def _configure_ollama_backend(self) -> None:
-        chat_ollama_cls = _load_optional_class(
-            "langchain_community.chat_models",
-            "ChatOllama",
-        )
-
-        if chat_ollama_cls is None:
+        if not _module_available("langchain_community"):
             self._llm_error = (
                 "LANGCHAIN_USE_OLLAMA=true but ChatOllama is unavailable. "
                 "Install langchain-community or disable the flag."
@@ -79,6 +220,14 @@ class LangChainEvalRunner(BaseEvaluator):
             return
 
         def build_ollama() -> Any:
+            chat_ollama_cls = _load_optional_class(
+                "langchain_community.chat_models",
+                "ChatOllama",
+            )
+            if chat_ollama_cls is None:
+                raise ImportError(
+                    "langchain_community.chat_models.ChatOllama not found"
+                )
             kwargs: dict[str, Any] = {"model": settings.ollama_model}
             if settings.ollama_base_url:
                 kwargs["base_url"] = settings.ollama_base_url
@@ -86,20 +235,12 @@ class LangChainEvalRunner(BaseEvaluator):
 
         self._llm_builder = build_ollama
         self._llm_provider = "ollama"
+        self._model_name = settings.ollama_model
 
     def _configure_openai_backend(self) -> None:
-        chat_openai_cls = _load_optional_class(
-            "langchain.chat_models",
-            "ChatOpenAI",
-        )
-
-        if chat_openai_cls is None:
-            chat_openai_cls = _load_optional_class(
-                "langchain_openai",
-                "ChatOpenAI",
-            )
-
-        if chat_openai_cls is None:
+        if not (
+            _module_available("langchain") or _module_available("langchain_openai")
+        ):
             if self._llm_error is None:
                 self._llm_error = (
                     "Could not import ChatOpenAI; install langchain or set "
@@ -107,9 +248,9 @@ class LangChainEvalRunner(BaseEvaluator):
                 )
             return
 
-        self._configure_openai(chat_openai_cls)
+        self._configure_openai()
 
-    def _configure_openai(self, chat_openai_cls: Any) -> None:
+    def _configure_openai(self) -> None:
         if not settings.openai_api_key:
             self._llm_error = (
                 "ChatOpenAI requires OPENAI_API_KEY; set LANGCHAIN_USE_OLLAMA=true "
@@ -118,6 +259,13 @@ class LangChainEvalRunner(BaseEvaluator):
             return
 
         def build_openai() -> Any:
+            chat_openai_cls = _load_optional_class(
+                "langchain.chat_models", "ChatOpenAI"
+            ) or _load_optional_class("langchain_openai", "ChatOpenAI")
+            if chat_openai_cls is None:
+                raise ImportError(
+                    "ChatOpenAI not found in langchain or langchain_openai"
+                )
             kwargs: dict[str, Any] = {
                 "temperature": 0,
                 "openai_api_key": settings.openai_api_key,
@@ -134,6 +282,7 @@ class LangChainEvalRunner(BaseEvaluator):
 
         self._llm_builder = build_openai
         self._llm_provider = "openai"
+        self._model_name = settings.langchain_openai_model
 
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
         records = list(dataset)
@@ -144,48 +293,278 @@ class LangChainEvalRunner(BaseEvaluator):
                 details={"error": "empty dataset"},
             )
 
-        if not self._available:
-            return EvaluationResult(
-                self.name,
-                None,
-                {"error": "langchain not installed"},
-            )
-
-        if self._qa_eval_chain_cls is None:
+        error = self.unavailable_reason()
+        if error is not None:
             return EvaluationResult(
                 framework=self.name,
                 score=None,
-                details={"error": self._llm_error or "Evaluator unavailable"},
+                details={"error": error, "provider": self._llm_provider},
             )
 
-        if not self._llm_builder:
+        started = time.perf_counter()
+        try:
+            batch = self._judge(records)
+        except (ImportError, ValueError) as exc:
+            # Building the chat model or the evaluator can still fail here.
+            print(f"[LangChain] ⚠ Judge setup failed: {exc}")
             return EvaluationResult(
                 framework=self.name,
                 score=None,
-                details={
-                    "error": self._llm_error
-                    or "No LangChain chat model available for evaluation",
-                    "provider": self._llm_provider,
-                },
+                details={"error": str(exc), "provider": self._llm_provider},
             )
+        elapsed = time.perf_counter() - started
+        keys, verdicts, errors, hits = (
+            batch.keys,
+            batch.verdicts,
+            batch.errors,
+            batch.hits,
+        )
 
-        llm = self._llm_builder()
-        qa_chain = self._qa_eval_chain_cls.from_llm(llm)
-        eval_results = [
-            qa_chain.evaluate_strings(
-                prediction=item.prediction,
-                reference=item.reference,
-                input=item.question,
-            )
-            for item in records
-        ]
-        score = sum(1 for res in eval_results if res.get("score", 0) >= 0.5) / len(
-            records
+        graded = [verdicts[key] for key in keys if key in verdicts]
+        failed = len(records) - len(graded)
+        # Failed items are excluded from the score rather than counted wrong.
+        score = (
+            sum(1 for res in graded if res.get("score", 0) >= 0.5) / len(graded)
+            if graded
+            else None
         )
         details = {
-            "raw": cast(object, eval_results),
+            "raw": cast(
+                object,
+                [verdicts.get(key, {"error": errors.get(key)}) for key in keys],
+            ),
             "provider": self._llm_provider,
+            "model": self._model_name,
+            "num_failed": failed,
+            "judge_calls": batch.judge_calls,
+            "pack_size": self.pack_size,
+            "packed_verdicts": batch.packed,
+            "cache": {
+                "enabled": self._cache is not None,
+                "hits": hits,
+                "misses": len(records) - hits,
+                "hit_rate": hits / len(records),
+            },
+            "max_concurrency": self.max_concurrency,
+            "requests_per_second": self.requests_per_second,
+            "elapsed_s": elapsed,
         }
         result = EvaluationResult(framework=self.name, score=score, details=details)
         self.save_result(result)
         return result
+
+    def unavailable_reason(self) -> str | None:
+        if not self._available:
+            return "langchain not installed"
+        if self._qa_eval_chain() is None:
+            return "LangChain QA evaluator is unavailable; install langchain."
+        if not self._llm_builder:
+            return self._llm_error or "No LangChain chat model available for evaluation"
+        return None
+
+    def score_chunk(self, records: list[EvaluationInput]) -> dict[str, np.ndarray]:
+        """Return 1/0 verdicts per item; items that failed to grade are NaN."""
+
+        return self.score_chunk_items(records)[0]
+
+    def score_chunk_items(
+        self, records: list[EvaluationInput]
+    ) -> tuple[dict[str, np.ndarray], list[dict[str, object] | None]]:
+        """Return per-item verdict scores along with the judge's raw output."""
+
+        batch = self._judge(records)
+        scores = np.array(
+            [
+                (
+                    float(batch.verdicts[key].get("score", 0) >= 0.5)
+                    if key in batch.verdicts
+                    else np.nan
+                )
+                for key in batch.keys
+            ]
+        )
+        raw: list[dict[str, object] | None] = [
+            batch.verdicts.get(key, {"error": batch.errors.get(key)})
+            for key in batch.keys
+        ]
+        return {"score": scores}, raw
+
+    def _judge(self, records: list[EvaluationInput]) -> _JudgeBatch:
+        """Grade ``records`` through the cache, packed prompts and QAEvalChain."""
+
+        # Identical items share one key, so each distinct item is judged at
+        # most once per run and, with the cache enabled, once across runs.
+        keys = [self._judge_key(item) for item in records]
+        verdicts: dict[str, Any] = (
+            self._cache.get_many(keys) if self._cache is not None else {}
+        )
+        if self._cache is not None and self.pack_size > 1:
+            # Items earlier graded one at a time are stored under the
+            # single-item template; reuse those verdicts as well.
+            single_keys = {
+                self._judge_key(item, self.prompt_template_version): key
+                for key, item in zip(keys, records)
+                if key not in verdicts
+            }
+            for single_key, verdict in self._cache.get_many(single_keys).items():
+                verdicts[single_keys[single_key]] = verdict
+        hits = sum(1 for key in keys if key in verdicts)
+        pending = {key: item for key, item in zip(keys, records) if key not in verdicts}
+
+        errors: dict[str, str] = {}
+        judge_calls = 0
+        packed = 0
+        if pending:
+            llm = self._llm()
+            rate_limiter = self._rate_limiter
+            fresh: dict[str, Any] = {}
+            # Cache entries, keyed by the template that produced each verdict.
+            to_cache: dict[str, Any] = {}
+            single = dict(pending)
+            if self.pack_size > 1:
+                fresh.update(self._grade_packed(llm, pending, rate_limiter))
+                to_cache.update(fresh)
+                judge_calls += -(-len(pending) // self.pack_size)
+                packed = len(fresh)
+                # Items whose verdict could not be parsed are graded alone.
+                single = {k: v for k, v in pending.items() if k not in fresh}
+            if single:
+                qa_chain = self._qa_chain()
+                outcomes = run_concurrently(
+                    lambda item: qa_chain.evaluate_strings(
+                        prediction=item.prediction,
+                        reference=item.reference,
+                        input=item.question,
+                    ),
+                    single.values(),
+                    max_concurrency=self.max_concurrency,
+                    rate_limiter=rate_limiter,
+                    max_retries=self.max_retries,
+                    base_delay=self.retry_base_delay,
+                )
+                judge_calls += len(single)
+                for key, outcome in zip(single, outcomes):
+                    if outcome.ok:
+                        fresh[key] = outcome.value
+                        single_key = (
+                            self._judge_key(single[key], self.prompt_template_version)
+                            if self.pack_size > 1
+                            else key
+                        )
+                        to_cache[single_key] = outcome.value
+                    else:
+                        errors[key] = describe_error(outcome.error)
+                        print(
+                            f"[LangChain] ⚠ Grading failed after {outcome.attempts} "
+                            f"attempts: {errors[key]}"
+                        )
+            if self._cache is not None and to_cache:
+                self._cache.put_many(to_cache)
+            verdicts.update(fresh)
+
+        return _JudgeBatch(keys, verdicts, errors, hits, judge_calls, packed)
+
+    def _llm(self) -> Any:
+        # Built on first use and reused by every chunk of a streamed run.
+        # Configured backends are shared process-wide through the registry;
+        # an injected builder always gets its own instance.
+        if self._llm_instance is None:
+            if self._llm_provider == "custom":
+                self._llm_instance = self._llm_builder()
+            else:
+                self._llm_instance = model_registry.get_or_create(
+                    (
+                        "langchain",
+                        self._llm_provider,
+                        self._model_name,
+                        settings.ollama_base_url,
+                    ),
+                    self._llm_builder,
+                )
+        return self._llm_instance
+
+    def _qa_eval_chain(self) -> Any | None:
+        """Return the QAEvalChain class, importing it on first use."""
+
+        if self._qa_eval_chain_cls is None:
+            self._qa_eval_chain_cls = _load_optional_class(
+                "langchain.evaluation.qa",
+                "QAEvalChain",
+            )
+        return self._qa_eval_chain_cls
+
+    def _qa_chain(self) -> Any:
+        if self._qa_chain_instance is None:
+            qa_eval_chain_cls = self._qa_eval_chain()
+            if qa_eval_chain_cls is None:
+                raise ImportError(
+                    "LangChain QA evaluator is unavailable; install langchain."
+                )
+            self._qa_chain_instance = qa_eval_chain_cls.from_llm(self._llm())
+        return self._qa_chain_instance
+
+    def _grade_packed(
+        self,
+        llm: Any,
+        pending: dict[str, EvaluationInput],
+        rate_limiter: TokenBucket | None,
+    ) -> dict[str, dict[str, Any]]:
+        """Grade ``pending`` in packs of ``pack_size`` items per chat request.
+
+        Returns the verdicts that could be parsed; packs whose request fails
+        after retries contribute none.
+        """
+
+        items = list(pending.items())
+        packs = [
+            items[start : start + self.pack_size]
+            for start in range(0, len(items), self.pack_size)
+        ]
+
+        def grade(pack: list[tuple[str, EvaluationInput]]) -> list[dict | None]:
+            reply = llm.invoke(build_packed_prompt([item for _, item in pack]))
+            return parse_packed_verdicts(getattr(reply, "content", reply), len(pack))
+
+        verdicts: dict[str, dict[str, Any]] = {}
+        outcomes = run_concurrently(
+            grade,
+            packs,
+            max_concurrency=self.max_concurrency,
+            rate_limiter=rate_limiter,
+            max_retries=self.max_retries,
+            base_delay=self.retry_base_delay,
+        )
+        for pack, outcome in zip(packs, outcomes):
+            if not outcome.ok:
+                print(
+                    f"[LangChain] ⚠ Packed grading failed, grading {len(pack)} "
+                    f"items individually: {describe_error(outcome.error)}"
+                )
+                continue
+            for (key, _), verdict in zip(pack, outcome.value or []):
+                if verdict is not None:
+                    verdicts[key] = verdict
+        return verdicts
+
+    def _judge_key(
+        self, item: EvaluationInput, template_version: str | None = None
+    ) -> str:
+        """Return the cache key of ``item`` graded with ``template_version``.
+
+        Defaults to the template of the current mode (packed or single).
+        """
+
+        if template_version is None:
+            template_version = (
+                self.packed_template_version
+                if self.pack_size > 1
+                else self.prompt_template_version
+            )
+        return judge_cache_key(
+            self._llm_provider or "",
+            self._model_name or "",
+            template_version,
+            item.question,
+            item.prediction,
+            item.reference,
+        )
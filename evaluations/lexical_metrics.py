@@ -0,0 +1,234 @@
+"""Vectorized lexical overlap metrics shared by the offline runners.
+
+Every prediction and reference is tokenized once (lowercased, split on
+whitespace) into a shared vocabulary. Set-based metrics are computed for all
+rows at once from sparse binary row-by-term matrices, and ROUGE-L runs one
+longest-common-subsequence dynamic program over blocks of rows, advancing
+whole blocks one prediction token at a time.
+"""
+
+from __future__ import annotations
+
+import gc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from .base_evaluator import EvaluationInput
+
+METRICS = ("jaccard", "precision", "recall", "f1", "rouge_l")
+
+
+@dataclass
+class LexicalScores:
+    """Per-item lexical metrics for aligned predictions and references.
+
+    ``precision``, ``recall`` and ``f1`` compare the sets of prediction and
+    reference tokens; ``rouge_l`` is the LCS-based F-measure over the token
+    sequences. Rows where a ratio is undefined (an empty side) score ``0``.
+    """
+
+    jaccard: np.ndarray
+    precision: np.ndarray
+    recall: np.ndarray
+    f1: np.ndarray
+    rouge_l: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.jaccard)
+
+    def mean(self) -> dict[str, float | None]:
+        """Return the mean of every metric (``None`` for an empty dataset)."""
+
+        return {
+            name: float(getattr(self, name).mean()) if len(self) else None
+            for name in METRICS
+        }
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Return the per-item array of every metric keyed by name."""
+
+        return {name: getattr(self, name) for name in METRICS}
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into the lowercase whitespace tokens every metric uses."""
+
+    return text.lower().split()
+
+
+def compute_lexical_scores(
+    predictions: Iterable[str],
+    references: Iterable[str],
+    block_size: int = 1024,
+) -> LexicalScores:
+    """Score every prediction against the reference in the same position.
+
+    ``block_size`` bounds how many rows share one ROUGE-L dynamic program.
+    """
+
+    predictions = list(predictions)
+    references = list(references)
+    if len(predictions) != len(references):
+        raise ValueError("predictions and references must have the same length")
+
+    with _gc_paused():
+        pred_tokens = _tokenize_all(predictions)
+        ref_tokens = _tokenize_all(references)
+        # Vocabulary building and id lookup both run in C via dict/map.
+        vocabulary = {
+            token: term
+            for term, token in enumerate(
+                dict.fromkeys(chain.from_iterable(pred_tokens + ref_tokens))
+            )
+        }
+        pred_ids, pred_ptr = _encode(pred_tokens, vocabulary)
+        ref_ids, ref_ptr = _encode(ref_tokens, vocabulary)
+        del pred_tokens, ref_tokens
+    num_rows, num_terms = len(predictions), max(len(vocabulary), 1)
+
+    pred_sets = _binary_rows(pred_ids, pred_ptr, num_terms)
+    ref_sets = _binary_rows(ref_ids, ref_ptr, num_terms)
+    overlap = np.asarray(pred_sets.multiply(ref_sets).sum(axis=1)).ravel()
+    pred_size = np.diff(pred_sets.indptr)
+    ref_size = np.diff(ref_sets.indptr)
+
+    jaccard = _ratio(overlap, pred_size + ref_size - overlap)
+    precision = _ratio(overlap, pred_size)
+    recall = _ratio(overlap, ref_size)
+    f1 = _ratio(2 * precision * recall, precision + recall)
+
+    lcs = _lcs_lengths(
+        pred_ids, pred_ptr, ref_ids, ref_ptr, num_rows, num_terms, block_size
+    )
+    lcs_precision = _ratio(lcs, np.diff(pred_ptr))
+    lcs_recall = _ratio(lcs, np.diff(ref_ptr))
+    rouge_l = _ratio(2 * lcs_precision * lcs_recall, lcs_precision + lcs_recall)
+
+    return LexicalScores(jaccard, precision, recall, f1, rouge_l)
+
+
+def score_inputs(records: Iterable[EvaluationInput]) -> LexicalScores:
+    """Score each record's prediction against its reference."""
+
+    records = list(records)
+    return compute_lexical_scores(
+        (item.prediction for item in records),
+        (item.reference for item in records),
+    )
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic GC while allocating millions of acyclic token lists."""
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _tokenize_all(texts: Sequence[str]) -> list[list[str]]:
+    """Tokenize ``texts`` like :func:`tokenize`, without per-text call overhead."""
+
+    return list(map(str.split, map(str.lower, texts)))
+
+
+def _encode(
+    tokenized: Sequence[list[str]], vocabulary: dict[str, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the concatenated token ids of ``tokenized`` and their row offsets."""
+
+    indptr = np.zeros(len(tokenized) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, tokenized), dtype=np.int64), out=indptr[1:])
+    ids = np.fromiter(
+        map(vocabulary.__getitem__, chain.from_iterable(tokenized)),
+        dtype=np.int64,
+        count=int(indptr[-1]),
+    )
+    return ids, indptr
+
+
+def _binary_rows(ids: np.ndarray, indptr: np.ndarray, num_terms: int) -> csr_matrix:
+    matrix = csr_matrix(
+        (np.ones(len(ids), dtype=np.int32), ids, indptr),
+        shape=(len(indptr) - 1, num_terms),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    numerator = np.asarray(numerator, dtype=np.float64)
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _lcs_lengths(
+    pred_ids: np.ndarray,
+    pred_ptr: np.ndarray,
+    ref_ids: np.ndarray,
+    ref_ptr: np.ndarray,
+    num_rows: int,
+    num_terms: int,
+    block_size: int,
+) -> np.ndarray:
+    """Return the LCS length of every prediction/reference token sequence."""
+
+    pred_rows = np.repeat(np.arange(num_rows), np.diff(pred_ptr))
+    ref_rows = np.repeat(np.arange(num_rows), np.diff(ref_ptr))
+    # Tokens missing from the other side can never be part of the LCS, so
+    # dropping them first shrinks the dynamic program without changing it.
+    pred_keys = pred_rows * num_terms + pred_ids
+    ref_keys = ref_rows * num_terms + ref_ids
+    keep_pred = np.isin(pred_keys, ref_keys)
+    keep_ref = np.isin(ref_keys, pred_keys)
+    pred_ids, pred_len = pred_ids[keep_pred], np.bincount(
+        pred_rows[keep_pred], minlength=num_rows
+    )
+    ref_ids, ref_len = ref_ids[keep_ref], np.bincount(
+        ref_rows[keep_ref], minlength=num_rows
+    )
+    pred_start = np.cumsum(pred_len) - pred_len
+    ref_start = np.cumsum(ref_len) - ref_len
+
+    lcs = np.zeros(num_rows, dtype=np.int64)
+    active = np.flatnonzero(pred_len > 0)
+    # Grouping rows of similar length keeps padding in each block small.
+    active = active[np.argsort(np.maximum(pred_len, ref_len)[active], kind="stable")]
+    for start in range(0, len(active), block_size):
+        rows = active[start : start + block_size]
+        preds = _pad(pred_ids, pred_start[rows], pred_len[rows], fill=-1)
+        refs = _pad(ref_ids, ref_start[rows], ref_len[rows], fill=-2)
+        # best[:, j] is the LCS of the prediction prefix seen so far and the
+        # first j reference tokens. A new prediction token can extend the
+        # diagonal on a match; the running maximum along the row then
+        # carries each value forward, which replaces the inner loop over j.
+        best = np.zeros((len(rows), refs.shape[1] + 1), dtype=np.int32)
+        for column in preds.T:
+            extended = np.maximum(best[:, 1:], best[:, :-1] + (column[:, None] == refs))
+            np.maximum.accumulate(extended, axis=1, out=best[:, 1:])
+        lcs[rows] = best[:, -1]
+    return lcs
+
+
+def _pad(
+    ids: np.ndarray, starts: np.ndarray, lengths: np.ndarray, fill: int
+) -> np.ndarray:
+    """Gather variable-length rows of ``ids`` into a ``fill``-padded matrix."""
+
+    padded = np.full((len(lengths), int(lengths.max())), fill, dtype=np.int64)
+    row = np.repeat(np.arange(len(lengths)), lengths)
+    column = np.arange(len(row)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    padded[row, column] = ids[np.repeat(starts, lengths) + column]
+    return padded
@@ -0,0 +1,44 @@
+"""Process-wide registry of loaded models shared across runner instances.
+
+Loading an embedding model or building a chat client is slow, so runners
+ask the registry instead of constructing their own. The first caller for a
+key builds the model; concurrent callers for the same key wait for that
+build rather than starting another, and every later caller gets the same
+object.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable
+
+_models: dict[Hashable, Any] = {}
+_building: dict[Hashable, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def get_or_create(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the model registered under ``key``, building it on first use.
+
+    Exceptions from ``factory`` propagate and nothing is registered, so a
+    later call retries the build.
+    """
+
+    try:
+        return _models[key]
+    except KeyError:
+        pass
+    with _lock:
+        build_lock = _building.setdefault(key, threading.Lock())
+    with build_lock:
+        if key not in _models:
+            _models[key] = factory()
+        return _models[key]
+
+
+def clear() -> None:
+    """Forget every registered model, e.g. between tests."""
+
+    with _lock:
+        _models.clear()
+        _building.clear()
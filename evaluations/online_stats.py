@@ -0,0 +1,74 @@
+"""Constant-memory running statistics for streamed evaluation scores."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+class OnlineStats:
+    """Running count, mean, variance, range and histogram of a metric.
+
+    Chunks are merged with Chan et al.'s parallel variance update, so memory
+    stays constant however many values are seen. NaN values mark items that
+    could not be scored: they are counted as ``missing`` and otherwise
+    ignored. The histogram has ``bins`` equal-width bins over ``value_range``;
+    values outside the range land in the first or last bin.
+    """
+
+    def __init__(
+        self, bins: int = 10, value_range: tuple[float, float] = (0.0, 1.0)
+    ) -> None:
+        self.edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold a chunk of per-item values into the running statistics."""
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        present = values[~np.isnan(values)]
+        self.missing += len(values) - len(present)
+        if not len(present):
+            return
+
+        count = len(present)
+        mean = float(present.mean())
+        m2 = float(((present - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, float(present.min()))
+        self.max = max(self.max, float(present.max()))
+
+        clipped = np.clip(present, self.edges[0], self.edges[-1])
+        self.histogram += np.histogram(clipped, bins=self.edges)[0]
+
+    @property
+    def variance(self) -> float | None:
+        return self._m2 / self.count if self.count else None
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the statistics as JSON-serializable data."""
+
+        variance = self.variance
+        return {
+            "count": self.count,
+            "missing": self.missing,
+            "mean": self.mean if self.count else None,
+            "std": math.sqrt(variance) if variance is not None else None,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "histogram": {
+                "edges": self.edges.tolist(),
+                "counts": self.histogram.tolist(),
+            },
+        }
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import importlib
+import json
+from dataclasses import asdict
+from itertools import chain, islice
 from typing import Any, Iterable
 
 from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
@@ -18,7 +21,15 @@ def _load_optional_module(module_name: str) -> Any | None:
 
 
 class OpenAIEvalRunner(BaseEvaluator):
-    """Hooks into OpenAI Evals when the package is available."""
+    """Hooks into OpenAI Evals when the package is available.
+
+    The dataset is written row by row to ``openai_evals_dataset.jsonl`` for
+    the ``oaieval`` CLI, and only the first ``preview_size`` rows are kept in
+    the result. Scoring happens outside this process, so the runner does not
+    support :meth:`~BaseEvaluator.evaluate_stream`.
+    """
+
+    preview_size = 5
 
     def __init__(self, output_dir=None) -> None:
         super().__init__("openai_evals", output_dir=output_dir)
@@ -26,12 +37,6 @@ class OpenAIEvalRunner(BaseEvaluator):
         self._available = self._evals is not None
 
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
-        records = list(dataset)
-        if not records:
-            return EvaluationResult(
-                framework=self.name, score=None, details={"error": "empty dataset"}
-            )
-
         if not self._available:
             return EvaluationResult(
                 framework=self.name,
@@ -40,10 +45,24 @@ class OpenAIEvalRunner(BaseEvaluator):
             )
 
         # Placeholder integration: record dataset for manual CLI usage
-        eval_dataset = [record.__dict__ for record in records]
+        path = self.output_dir / f"{self.name}_dataset.jsonl"
+        rows = (asdict(record) for record in dataset)
+        preview = list(islice(rows, self.preview_size))
+        if not preview:
+            return EvaluationResult(
+                framework=self.name, score=None, details={"error": "empty dataset"}
+            )
+
+        count = 0
+        with path.open("w", encoding="utf-8") as fp:
+            for row in chain(preview, rows):
+                fp.write(json.dumps(row) + "\n")
+                count += 1
         details = {
             "message": "Dataset prepared; run `oaieval` CLI for full evaluation",
-            "dataset_preview": eval_dataset,
+            "dataset_path": str(path),
+            "num_samples": count,
+            "dataset_preview": preview,
         }
         result = EvaluationResult(framework=self.name, score=None, details=details)
         self.save_result(result)
@@ -0,0 +1,258 @@
+"""Run several evaluation runners concurrently over one shared dataset.
+
+The dataset is materialized once into a columnar :class:`EvaluationDataset`.
+Runners marked ``cpu_bound`` are built and run in a process pool, each worker
+receiving the dataset once through the pool initializer, while the remaining
+(I/O-bound, LLM-judged) runners run on threads in the parent at the same time.
+A full comparison therefore takes about as long as the slowest runner rather
+than the sum of all of them.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Iterable, Iterator, Sequence
+
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from .concurrency import describe_error
+from .deepeval_runner import DeepEvalRunner
+from .embedding_eval_runner import EmbeddingEvalRunner
+from .langchain_eval_runner import LangChainEvalRunner
+from .openai_eval_runner import OpenAIEvalRunner
+from .ragas_runner import RagasRunner
+from .retrieval_eval_runner import RetrievalEvalRunner
+
+RunnerFactory = Callable[[], BaseEvaluator]
+
+DEFAULT_RUNNERS: tuple[RunnerFactory, ...] = (
+    LangChainEvalRunner,
+    DeepEvalRunner,
+    RagasRunner,
+    EmbeddingEvalRunner,
+    OpenAIEvalRunner,
+    RetrievalEvalRunner,
+)
+
+
+class EvaluationDataset:
+    """Columnar, read-only evaluation dataset.
+
+    Questions, predictions, references and the optional ``doc_id`` labels
+    are kept as tuples, which pickle compactly for worker processes. Iterating yields
+    :class:`EvaluationInput` rows, so the dataset can be passed to any
+    runner's ``evaluate`` as is.
+    """
+
+    __slots__ = ("questions", "predictions", "references", "doc_ids")
+
+    def __init__(
+        self,
+        questions: Sequence[str],
+        predictions: Sequence[str],
+        references: Sequence[str],
+        doc_ids: Sequence[str | None] | None = None,
+    ) -> None:
+        if doc_ids is None:
+            doc_ids = (None,) * len(questions)
+        if not len(questions) == len(predictions) == len(references) == len(doc_ids):
+            raise ValueError("dataset columns must have the same length")
+        self.questions = tuple(questions)
+        self.predictions = tuple(predictions)
+        self.references = tuple(references)
+        self.doc_ids = tuple(doc_ids)
+
+    @classmethod
+    def from_inputs(cls, dataset: Iterable[EvaluationInput]) -> "EvaluationDataset":
+        """Materialize ``dataset`` once into columns."""
+
+        if isinstance(dataset, cls):
+            return dataset
+        questions: list[str] = []
+        predictions: list[str] = []
+        references: list[str] = []
+        doc_ids: list[str | None] = []
+        for item in dataset:
+            questions.append(item.question)
+            predictions.append(item.prediction)
+            references.append(item.reference)
+            doc_ids.append(item.doc_id)
+        return cls(questions, predictions, references, doc_ids)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __iter__(self) -> Iterator[EvaluationInput]:
+        for question, prediction, reference, doc_id in zip(
+            self.questions, self.predictions, self.references, self.doc_ids
+        ):
+            yield EvaluationInput(question, prediction, reference, doc_id)
+
+    def __getitem__(self, index: int) -> EvaluationInput:
+        return EvaluationInput(
+            self.questions[index],
+            self.predictions[index],
+            self.references[index],
+            self.doc_ids[index],
+        )
+
+    def __getstate__(self) -> tuple[tuple[str | None, ...], ...]:
+        return self.questions, self.predictions, self.references, self.doc_ids
+
+    def __setstate__(self, state: tuple[tuple[str | None, ...], ...]) -> None:
+        self.questions, self.predictions, self.references, self.doc_ids = state
+
+
+@dataclass
+class OrchestratorReport:
+    """Results of one orchestrated run, keyed by runner name."""
+
+    results: dict[str, EvaluationResult]
+    wall_times: dict[str, float]
+    modes: dict[str, str]
+    total_s: float
+    num_samples: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, object]:
+        """Return scores, per-runner wall times and the total as plain data."""
+
+        return {
+            "num_samples": self.num_samples,
+            "total_s": self.total_s,
+            "runners": {
+                name: {
+                    "score": result.score,
+                    "mode": self.modes[name],
+                    "wall_time_s": self.wall_times[name],
+                    **({"error": self.errors[name]} if name in self.errors else {}),
+                }
+                for name, result in self.results.items()
+            },
+        }
+
+
+# Dataset handed to each worker process once by the pool initializer.
+_DATASET: EvaluationDataset | None = None
+
+
+def _init_worker(dataset: EvaluationDataset) -> None:
+    global _DATASET
+    _DATASET = dataset
+
+
+def _run_in_worker(
+    factory: RunnerFactory,
+) -> tuple[EvaluationResult, float, str | None]:
+    assert _DATASET is not None, "worker was started without a dataset"
+    return _timed_run(factory, _DATASET)
+
+
+def _timed_run(
+    factory: RunnerFactory, dataset: EvaluationDataset
+) -> tuple[EvaluationResult, float, str | None]:
+    """Build and run one runner, turning failures into an error result."""
+
+    started = time.perf_counter()
+    name = _runner_name(factory)
+    error: str | None = None
+    try:
+        runner = factory()
+        name = runner.name
+        result = runner.evaluate(dataset)
+    except Exception as exc:  # one broken runner must not sink the comparison
+        error = describe_error(exc)
+        result = EvaluationResult(framework=name, score=None, details={"error": error})
+    return result, time.perf_counter() - started, error
+
+
+def is_cpu_bound(factory: RunnerFactory) -> bool:
+    """Return whether ``factory`` builds a runner marked ``cpu_bound``."""
+
+    while isinstance(factory, partial):
+        factory = factory.func
+    return bool(getattr(factory, "cpu_bound", False))
+
+
+def _runner_name(factory: RunnerFactory) -> str:
+    while isinstance(factory, partial):
+        factory = factory.func
+    return getattr(factory, "__name__", repr(factory))
+
+
+def run_evaluators(
+    dataset: Iterable[EvaluationInput],
+    runners: Sequence[RunnerFactory] = DEFAULT_RUNNERS,
+    max_processes: int | None = None,
+    max_threads: int | None = None,
+) -> OrchestratorReport:
+    """Run every runner factory over ``dataset`` and gather their results.
+
+    Factories are zero-argument callables returning a runner, typically the
+    runner class or a :func:`functools.partial` of it; factories for
+    ``cpu_bound`` runners must be picklable since they are called inside a
+    worker process. Pass ``max_processes=0`` to keep every runner on threads.
+    Results are keyed by runner name, so two runners with the same name raise
+    :class:`ValueError`.
+    """
+
+    shared = EvaluationDataset.from_inputs(dataset)
+    modes = [
+        "process" if max_processes != 0 and is_cpu_bound(factory) else "thread"
+        for factory in runners
+    ]
+    num_cpu = modes.count("process")
+    num_io = len(modes) - num_cpu
+
+    started = time.perf_counter()
+    process_pool = (
+        ProcessPoolExecutor(
+            max_workers=min(num_cpu, max_processes or os.cpu_count() or 1),
+            initializer=_init_worker,
+            initargs=(shared,),
+        )
+        if num_cpu
+        else None
+    )
+    thread_pool: ThreadPoolExecutor | None = None
+    futures: list[Future | None] = [None] * len(runners)
+    try:
+        # Submitting starts the worker processes, so do it before any runner
+        # thread exists: forking while threads hold locks (SQLite caches, the
+        # model registry) could leave a child deadlocked.
+        for position, (factory, mode) in enumerate(zip(runners, modes)):
+            if process_pool is not None and mode == "process":
+                futures[position] = process_pool.submit(_run_in_worker, factory)
+        if num_io:
+            thread_pool = ThreadPoolExecutor(max_workers=max_threads or num_io)
+            for position, (factory, mode) in enumerate(zip(runners, modes)):
+                if futures[position] is None:
+                    futures[position] = thread_pool.submit(_timed_run, factory, shared)
+
+        report = OrchestratorReport({}, {}, {}, 0.0, num_samples=len(shared))
+        for mode, future in zip(modes, futures):
+            result, elapsed, error = future.result()
+            name = result.framework
+            if name in report.results:
+                raise ValueError(
+                    f"More than one runner is named {name!r}; "
+                    "results are keyed by name, so give each runner its own"
+                )
+            report.results[name] = result
+            report.wall_times[name] = elapsed
+            report.modes[name] = mode
+            if error is not None:
+                report.errors[name] = error
+            print(
+                f"[Orchestrator] {name}: score={result.score} ({elapsed:.2f}s, {mode})"
+            )
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+        if thread_pool is not None:
+            thread_pool.shutdown()
+    report.total_s = time.perf_counter() - started
+    return report
@@ -0,0 +1,418 @@
+"""End-to-end predict-then-evaluate pipeline.
+
+Questions are streamed from the dataset files in batches, answered by
+``QABot.answer_batch`` (in this process or in a pool of worker processes, each
+with its own bot), and every answered batch is handed straight to the
+evaluation runners. Each runner consumes its own bounded queue on a thread,
+so scoring overlaps with generation and a slow runner only applies
+backpressure once its queue is full. Streaming runners are driven through
+``evaluate_stream``; the others receive the same rows through ``evaluate``.
+
+Run it with::
+
+    python -m evaluations.pipeline --runners ragas deepeval
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Mapping, Sequence
+
+from src import tracing
+
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from .concurrency import describe_error
+from .orchestrator import DEFAULT_RUNNERS, RunnerFactory
+from .utils import load_dataset_from_files
+
+# Sentinel closing a runner's feed.
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput of one pipeline stage.
+
+    ``busy_s`` excludes time spent waiting on a neighbouring stage, so
+    ``items_per_s`` is the rate the stage could sustain on its own.
+    """
+
+    items: int = 0
+    wall_s: float = 0.0
+    busy_s: float = 0.0
+
+    @property
+    def items_per_s(self) -> float | None:
+        return self.items / self.busy_s if self.busy_s > 0 else None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "items": self.items,
+            "wall_s": self.wall_s,
+            "busy_s": self.busy_s,
+            "items_per_s": self.items_per_s,
+        }
+
+
+@dataclass
+class PipelineReport:
+    """Runner results and per-stage throughput of one pipeline run."""
+
+    results: dict[str, EvaluationResult]
+    stages: dict[str, StageStats]
+    total_s: float
+    num_samples: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, object]:
+        """Return scores, stage throughput and the total as plain data."""
+
+        return {
+            "num_samples": self.num_samples,
+            "total_s": self.total_s,
+            "items_per_s": self.num_samples / self.total_s if self.total_s else None,
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "runners": {
+                name: {
+                    "score": result.score,
+                    **({"error": self.errors[name]} if name in self.errors else {}),
+                }
+                for name, result in self.results.items()
+            },
+        }
+
+
+class _Feed:
+    """Bounded queue of answered batches feeding one runner.
+
+    Iterating yields the rows of each batch until the feed is closed. Once
+    the runner stops consuming (finished early or failed) the feed is marked
+    ``abandoned`` and further batches are dropped instead of blocking.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize)
+        self.abandoned = False
+        self.wait_s = 0.0
+
+    def put(self, batch: Any) -> None:
+        """Queue ``batch``, blocking while the feed is full and still consumed."""
+
+        while not self.abandoned:
+            try:
+                self._queue.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        self.put(_DONE)
+
+    def __iter__(self) -> Iterator[EvaluationInput]:
+        while True:
+            started = time.perf_counter()
+            batch = self._queue.get()
+            self.wait_s += time.perf_counter() - started
+            if batch is _DONE:
+                return
+            yield from batch
+
+
+# Bot owned by each generation worker process.
+_BOT: Any = None
+
+
+def _init_bot(bot_options: Mapping[str, Any]) -> None:
+    global _BOT
+    from src.qa_bot import QABot
+
+    _BOT = QABot(**bot_options)
+
+
+def _answer_in_worker(questions: list[str]) -> list[str]:
+    assert _BOT is not None, "worker was started without a bot"
+    return [answer.response for answer in _BOT.answer_batch(questions)]
+
+
+def _batches(
+    dataset: Iterable[EvaluationInput], batch_size: int, stage: StageStats
+) -> Iterator[list[EvaluationInput]]:
+    """Yield batches of ``dataset`` while timing how long reading takes."""
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    rows = iter(dataset)
+    while True:
+        started = time.perf_counter()
+        batch = list(islice(rows, batch_size))
+        stage.busy_s += time.perf_counter() - started
+        if not batch:
+            return
+        stage.items += len(batch)
+        yield batch
+
+
+def _answered(
+    batch: list[EvaluationInput], responses: Sequence[str]
+) -> list[EvaluationInput]:
+    return [
+        EvaluationInput(item.question, response, item.reference, item.doc_id)
+        for item, response in zip(batch, responses)
+    ]
+
+
+def _generate(
+    batches: Iterator[list[EvaluationInput]],
+    answer_batch: Callable[[list[str]], Sequence[str]] | None,
+    pool: ProcessPoolExecutor | None,
+    in_flight: int,
+) -> Iterator[tuple[list[EvaluationInput], float]]:
+    """Yield answered batches in order with the seconds spent answering each.
+
+    With a process pool, up to ``in_flight`` batches are answered at once; the
+    reported time is then how long the pipeline waited for each result.
+    """
+
+    if pool is None:
+        assert answer_batch is not None
+        for batch in batches:
+            started = time.perf_counter()
+            responses = answer_batch([item.question for item in batch])
+            yield _answered(batch, responses), time.perf_counter() - started
+        return
+
+    pending: deque[tuple[list[EvaluationInput], Future]] = deque()
+    for batch in batches:
+        pending.append(
+            (batch, pool.submit(_answer_in_worker, [item.question for item in batch]))
+        )
+        while len(pending) >= in_flight:
+            yield _wait_for(*pending.popleft())
+    while pending:
+        yield _wait_for(*pending.popleft())
+
+
+def _wait_for(
+    batch: list[EvaluationInput], future: Future
+) -> tuple[list[EvaluationInput], float]:
+    started = time.perf_counter()
+    responses = future.result()
+    return _answered(batch, responses), time.perf_counter() - started
+
+
+def _run_runner(
+    factory: RunnerFactory, feed: _Feed, chunk_size: int | None
+) -> tuple[EvaluationResult, float, str | None]:
+    """Build one runner and score its feed, turning failures into an error result."""
+
+    started = time.perf_counter()
+    name = getattr(factory, "__name__", repr(factory))
+    error: str | None = None
+    try:
+        runner: BaseEvaluator = factory()
+        name = runner.name
+        if runner.supports_streaming:
+            result = runner.evaluate_stream(feed, chunk_size=chunk_size)
+        else:
+            result = runner.evaluate(feed)
+    except Exception as exc:  # one broken runner must not stall the pipeline
+        error = describe_error(exc)
+        result = EvaluationResult(framework=name, score=None, details={"error": error})
+    finally:
+        feed.abandoned = True
+    return result, time.perf_counter() - started, error
+
+
+def run_pipeline(
+    dataset: Iterable[EvaluationInput],
+    runners: Sequence[RunnerFactory] = DEFAULT_RUNNERS,
+    bot: Any | None = None,
+    bot_options: Mapping[str, Any] | None = None,
+    batch_size: int = 32,
+    workers: int = 1,
+    queue_size: int = 4,
+    chunk_size: int | None = None,
+    predictions_path: Path | None = None,
+) -> PipelineReport:
+    """Answer every question in ``dataset`` and score the answers as they arrive.
+
+    Any prediction already on the rows is replaced by the bot's answer. With
+    ``workers > 1`` each worker process builds its own ``QABot(**bot_options)``
+    and batches are answered in parallel; otherwise ``bot`` (or a bot built
+    from ``bot_options``) answers them in this process. ``queue_size`` bounds
+    how many answered batches may wait for each runner, and ``chunk_size``
+    overrides the runners' streaming chunk size. When ``predictions_path`` is
+    given, every answered row is also appended to it as JSON Lines.
+    """
+
+    bot_options = dict(bot_options or {})
+    pool: ProcessPoolExecutor | None = None
+    owned_bot: Any | None = None
+    answer_batch: Callable[[list[str]], Sequence[str]] | None = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_bot, initargs=(bot_options,)
+        )
+    else:
+        if bot is None:
+            from src.qa_bot import QABot
+
+            bot = owned_bot = QABot(**bot_options)
+        qa_bot = bot
+
+        def answer_batch(questions: list[str]) -> list[str]:
+            return [answer.response for answer in qa_bot.answer_batch(questions)]
+
+    load = StageStats()
+    generate = StageStats()
+    feeds = [_Feed(queue_size) for _ in runners]
+    runner_pool = ThreadPoolExecutor(
+        max_workers=max(len(runners), 1), thread_name_prefix="pipeline"
+    )
+    out: IO[str] | None = None
+    started = time.perf_counter()
+    try:
+        futures = [
+            runner_pool.submit(_run_runner, factory, feed, chunk_size)
+            for factory, feed in zip(runners, feeds)
+        ]
+        if predictions_path is not None:
+            predictions_path.parent.mkdir(parents=True, exist_ok=True)
+            out = predictions_path.open("w", encoding="utf-8")
+
+        try:
+            for answered, answer_s in _generate(
+                _batches(dataset, batch_size, load),
+                answer_batch,
+                pool,
+                in_flight=2 * workers,
+            ):
+                generate.items += len(answered)
+                generate.busy_s += answer_s
+                if out is not None:
+                    for item in answered:
+                        out.write(
+                            json.dumps(
+                                {
+                                    "question": item.question,
+                                    "prediction": item.prediction,
+                                    "reference": item.reference,
+                                    "doc_id": item.doc_id,
+                                }
+                            )
+                            + "\n"
+                        )
+                for feed in feeds:
+                    feed.put(answered)
+        finally:
+            # Close every feed even if generation failed so runner threads end.
+            for feed in feeds:
+                feed.close()
+        generate.wall_s = load.wall_s = time.perf_counter() - started
+
+        report = PipelineReport(
+            {}, {"load": load, "generate": generate}, 0.0, num_samples=generate.items
+        )
+        for feed, future in zip(feeds, futures):
+            result, elapsed, error = future.result()
+            name = result.framework
+            report.results[name] = result
+            report.stages[f"score:{name}"] = StageStats(
+                items=generate.items, wall_s=elapsed, busy_s=elapsed - feed.wait_s
+            )
+            if error is not None:
+                report.errors[name] = error
+            print(f"[Pipeline] {name}: score={result.score} ({elapsed:.2f}s)")
+    finally:
+        runner_pool.shutdown()
+        if pool is not None:
+            pool.shutdown()
+        if owned_bot is not None:
+            owned_bot.close()
+        if out is not None:
+            out.close()
+    report.total_s = time.perf_counter() - started
+    return report
+
+
+def _runner_choices() -> dict[str, RunnerFactory]:
+    return dict(
+        zip(
+            ("langchain", "deepeval", "ragas", "embedding", "openai", "retrieval"),
+            DEFAULT_RUNNERS,
+        )
+    )
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the predict-then-evaluate pipeline."""
+
+    choices = _runner_choices()
+    parser = argparse.ArgumentParser(
+        description="Answer test questions with the QA bot and score the answers"
+    )
+    parser.add_argument(
+        "--questions", type=Path, default=Path("data/test_questions.json")
+    )
+    parser.add_argument(
+        "--ground-truth", type=Path, default=Path("data/ground_truth.json")
+    )
+    parser.add_argument(
+        "--runners",
+        nargs="+",
+        choices=sorted(choices),
+        default=sorted(choices),
+        help="Evaluation runners to feed",
+    )
+    parser.add_argument("--documents", type=Path, default=None)
+    parser.add_argument("--top-k", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Generation processes, each with its own QA bot",
+    )
+    parser.add_argument("--queue-size", type=int, default=4)
+    parser.add_argument(
+        "--predictions",
+        type=Path,
+        default=None,
+        help="Also write the answered rows to this JSONL file",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the pipeline from the command line and print its summary as JSON."""
+
+    args = parse_args(argv)
+    histogram = tracing.configure_from_settings()
+    choices = _runner_choices()
+    ground_truth = args.ground_truth if args.ground_truth.exists() else None
+    report = run_pipeline(
+        load_dataset_from_files(args.questions, ground_truth),
+        runners=[choices[name] for name in args.runners],
+        bot_options={"documents_path": args.documents, "top_k": args.top_k},
+        batch_size=args.batch_size,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        predictions_path=args.predictions,
+    )
+    summary = report.summary()
+    if histogram is not None:
+        summary["timings"] = histogram.summary()
+    tracing.reset()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
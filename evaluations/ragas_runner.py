@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import importlib
-import os
 from typing import Any, Iterable
 
-from dotenv import load_dotenv
+import numpy as np
 
-from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from src.config import settings
 
-load_dotenv()
+from . import model_registry
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from .lexical_metrics import score_inputs
 
 
 def _load_optional_attr(module_name: str, attr_name: str) -> Any | None:
@@ -26,32 +27,36 @@ def _load_optional_attr(module_name: str, attr_name: str) -> Any | None:
 def _get_llm_for_ragas() -> Any | None:
     """Get LLM instance for RAGAS based on environment configuration."""
 
-    if os.getenv("LANGCHAIN_USE_OLLAMA", "").lower() == "true":
-        try:
-            from langchain_ollama import OllamaLLM
-
-            model_name = os.getenv("OLLAMA_MODEL", "llama2")
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            return OllamaLLM(model=model_name, base_url=base_url)
-        except ImportError:
-            pass
-
-    return None
+    if not settings.langchain_use_ollama:
+        return None
+    ollama_llm_cls = _load_optional_attr("langchain_ollama", "OllamaLLM")
+    if ollama_llm_cls is None:
+        return None
+    base_url = settings.ollama_base_url or "http://localhost:11434"
+    return model_registry.get_or_create(
+        ("langchain_ollama", settings.ollama_model, base_url),
+        lambda: ollama_llm_cls(model=settings.ollama_model, base_url=base_url),
+    )
 
 
 class RagasRunner(BaseEvaluator):
     """Integrates the RAGAS evaluation pipeline when installed."""
 
+    cpu_bound = True
+    supports_streaming = True
+    primary_metric = "jaccard"
+
     def __init__(self, output_dir=None) -> None:
         super().__init__("ragas", output_dir=output_dir)
         # RAGAS is installed but we use a simple offline method instead of its LLM-dependent metrics
         self._available = True
-        self._llm = _get_llm_for_ragas()
+        # Built on first access only; the offline metric never needs it.
+        self._llm_instance: Any | None = None
 
         # Log configuration
-        if os.getenv("LANGCHAIN_USE_OLLAMA", "").lower() == "true":
-            model = os.getenv("OLLAMA_MODEL", "unknown")
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        if settings.langchain_use_ollama:
+            model = settings.ollama_model or "unknown"
+            base_url = settings.ollama_base_url or "http://localhost:11434"
             print(
                 f"[RAGAS] Using offline token-overlap metric (Ollama config: model={model}, base_url={base_url})"
             )
@@ -60,6 +65,12 @@ class RagasRunner(BaseEvaluator):
                 "[RAGAS] Using offline token-overlap metric (no LLM backend configured)"
             )
 
+    @property
+    def _llm(self) -> Any | None:
+        if self._llm_instance is None:
+            self._llm_instance = _get_llm_for_ragas()
+        return self._llm_instance
+
     def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
         records = list(dataset)
         if not records:
@@ -76,22 +87,20 @@ class RagasRunner(BaseEvaluator):
 
         # Simple offline evaluation: measure token overlap between prediction and reference
         # This is a fallback when LLM-based metrics are unavailable or misconfigured
-        total_score = 0.0
-        for item in records:
-            pred_tokens = set(item.prediction.lower().split())
-            ref_tokens = set(item.reference.lower().split())
-            if pred_tokens or ref_tokens:
-                # Jaccard similarity
-                score = len(pred_tokens & ref_tokens) / max(
-                    len(pred_tokens | ref_tokens), 1
-                )
-                total_score += score
-
-        avg_score = total_score / len(records) if records else 0.0
+        scores = score_inputs(records)
         result = EvaluationResult(
             framework=self.name,
-            score=avg_score,
-            details={"method": "offline_token_overlap", "num_samples": len(records)},
+            score=float(scores.jaccard.mean()),
+            details={
+                "method": "offline_token_overlap",
+                "num_samples": len(records),
+                "metrics": scores.mean(),
+            },
         )
         self.save_result(result)
         return result
+
+    def score_chunk(self, records: list[EvaluationInput]) -> dict[str, np.ndarray]:
+        """Return every lexical metric per item for one streamed chunk."""
+
+        return score_inputs(records).columns()
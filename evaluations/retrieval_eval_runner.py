@@ -0,0 +1,194 @@
+"""Retrieval-quality evaluation against labelled source documents."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+
+
+class RetrievalEvalRunner(BaseEvaluator):
+    """Scores the retrieval index itself instead of the generated answers.
+
+    Every question labelled with a ``doc_id`` is run through the index's
+    ``query_batch`` in one call, and the rank of the first hit on the labelled
+    document gives recall@k, reciprocal rank and nDCG@k for every ``k`` in
+    ``ks`` at once. When the index holds passages, a passage counts as a hit
+    for its ``parent_id``, so ranks are in the same units as ``TOP_K``.
+    Unlabelled questions are skipped. Per-query latency percentiles are
+    measured on up to ``latency_samples`` questions queried one at a time.
+    No LLM is involved.
+    """
+
+    cpu_bound = True
+    supports_streaming = True
+    primary_metric = "reciprocal_rank"
+
+    def __init__(
+        self,
+        output_dir=None,
+        index: Any | None = None,
+        ks: Sequence[int] = (1, 3, 5, 10),
+        bot_options: Mapping[str, Any] | None = None,
+        latency_samples: int = 200,
+    ) -> None:
+        super().__init__("retrieval", output_dir=output_dir)
+        if not ks or min(ks) < 1:
+            raise ValueError("ks must be positive ranks")
+        self.ks = np.array(sorted(set(ks)), dtype=np.int64)
+        self.latency_samples = latency_samples
+        self._error: str | None = None
+        self._index = index
+        if index is not None:
+            return
+
+        # Build the index exactly as the bot would, including passage
+        # chunking, sharding and the on-disk cache.
+        from src.qa_bot import QABot
+
+        try:
+            self._index = QABot(**dict(bot_options or {})).index
+        except (FileNotFoundError, ValueError) as exc:
+            self._error = f"Failed to build retrieval index: {exc}"
+            print(f"[Retrieval] ⚠ {self._error}")
+
+    def evaluate(self, dataset: Iterable[EvaluationInput]) -> EvaluationResult:
+        records = list(dataset)
+        if not records:
+            return EvaluationResult(
+                framework=self.name, score=None, details={"error": "empty dataset"}
+            )
+
+        error = self.unavailable_reason()
+        if error is not None:
+            return EvaluationResult(
+                framework=self.name, score=None, details={"error": error}
+            )
+
+        labelled = [item for item in records if item.doc_id]
+        if not labelled:
+            return EvaluationResult(
+                framework=self.name,
+                score=None,
+                details={"error": "no questions are labelled with a doc_id"},
+            )
+
+        started = time.perf_counter()
+        ranks = self._ranks(labelled)
+        batch_s = time.perf_counter() - started
+        metrics = self._metrics(ranks)
+
+        details = {
+            "num_samples": len(records),
+            "num_labelled": len(labelled),
+            "ks": self.ks.tolist(),
+            "mrr": float(metrics["reciprocal_rank"].mean()),
+            **{
+                name: float(values.mean())
+                for name, values in metrics.items()
+                if name != "reciprocal_rank"
+            },
+            "latency": {
+                "batch_s": batch_s,
+                "amortized_ms": batch_s * 1000 / len(labelled),
+                **self._latency_percentiles(labelled),
+            },
+        }
+        result = EvaluationResult(
+            framework=self.name, score=details["mrr"], details=details
+        )
+        self.save_result(result)
+        return result
+
+    def unavailable_reason(self) -> str | None:
+        if self._index is None:
+            return self._error or "retrieval index not available"
+        return None
+
+    def score_chunk(self, records: list[EvaluationInput]) -> dict[str, np.ndarray]:
+        """Return per-item retrieval metrics; unlabelled items are NaN."""
+
+        labelled = np.array([bool(item.doc_id) for item in records])
+        metrics = {name: np.full(len(records), np.nan) for name in self._metric_names()}
+        if labelled.any():
+            ranks = self._ranks([item for item in records if item.doc_id])
+            for name, values in self._metrics(ranks).items():
+                metrics[name][labelled] = values
+        return metrics
+
+    def _metric_names(self) -> list[str]:
+        return [
+            "reciprocal_rank",
+            *(f"recall@{k}" for k in self.ks),
+            *(f"ndcg@{k}" for k in self.ks),
+        ]
+
+    def _ranks(self, records: list[EvaluationInput]) -> np.ndarray:
+        """Return the 0-based rank of each labelled document, ``inf`` if missed."""
+
+        depth = int(self.ks[-1])
+        retrieved = self._index.query_batch([item.question for item in records], depth)
+
+        # Encode document ids as integers so all hits are found in one compare.
+        codes: dict[str, int] = {}
+        labels = np.fromiter(
+            (codes.setdefault(item.doc_id, len(codes)) for item in records),
+            dtype=np.int64,
+            count=len(records),
+        )
+        ids = np.full((len(records), depth), -1, dtype=np.int64)
+        for row, contexts in enumerate(retrieved):
+            for col, context in enumerate(contexts[:depth]):
+                ids[row, col] = codes.get(_source_id(context.document), -1)
+
+        hits = ids == labels[:, None]
+        return np.where(hits.any(axis=1), hits.argmax(axis=1), np.inf)
+
+    def _metrics(self, ranks: np.ndarray) -> dict[str, np.ndarray]:
+        """Turn ranks into reciprocal rank plus recall@k and nDCG@k columns.
+
+        Each question has a single relevant document, so the ideal DCG is 1
+        and nDCG@k is the hit's discount when it ranks within ``k``.
+        """
+
+        within = ranks[:, None] < self.ks[None, :]
+        with np.errstate(divide="ignore"):
+            reciprocal = 1.0 / (ranks + 1.0)
+            gain = np.where(within, 1.0 / np.log2(ranks[:, None] + 2.0), 0.0)
+        metrics = {"reciprocal_rank": reciprocal}
+        for col, k in enumerate(self.ks):
+            metrics[f"recall@{k}"] = within[:, col].astype(np.float64)
+        for col, k in enumerate(self.ks):
+            metrics[f"ndcg@{k}"] = gain[:, col]
+        return metrics
+
+    def _latency_percentiles(
+        self, records: list[EvaluationInput]
+    ) -> dict[str, float | int]:
+        """Time single queries on a sample of questions, in milliseconds."""
+
+        sample = records[: self.latency_samples]
+        depth = int(self.ks[-1])
+        latencies = np.empty(len(sample))
+        for row, item in enumerate(sample):
+            started = time.perf_counter()
+            self._index.query(item.question, depth)
+            latencies[row] = (time.perf_counter() - started) * 1000
+        if not len(latencies):
+            return {"samples": 0}
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "samples": len(latencies),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+
+
+def _source_id(document: Any) -> str:
+    """Return the id of the source document, looking through passages."""
+
+    return getattr(document, "parent_id", "") or document.doc_id
@@ -2,27 +2,24 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Iterable, Mapping
 
 from .base_evaluator import EvaluationInput
+from .datasets import iter_evaluation_inputs
 
 
 def load_dataset_from_files(
     questions_path: Path,
-    ground_truth_path: Path,
+    ground_truth_path: Path | None = None,
     predictions: Mapping[str, str] | None = None,
 ) -> Iterable[EvaluationInput]:
-    """Yield ``EvaluationInput`` rows built from question, truth, and prediction files."""
+    """Yield ``EvaluationInput`` rows built from question, truth, and prediction files.
 
-    questions = json.loads(questions_path.read_text(encoding="utf-8"))
-    ground_truth = json.loads(ground_truth_path.read_text(encoding="utf-8"))
+    The questions file may be a JSON array, JSON Lines or a YAML test-case
+    file (chosen by suffix); rows are streamed and references are joined by
+    id from ``ground_truth_path`` without loading it into memory. Rows that
+    carry their own reference (e.g. ``reference_answer``) need no truth file.
+    """
 
-    for entry in questions:
-        question_id = entry["id"]
-        yield EvaluationInput(
-            question=entry["question"],
-            prediction=(predictions or {}).get(question_id, ""),
-            reference=ground_truth.get(question_id, ""),
-        )
+    return iter_evaluation_inputs(questions_path, ground_truth_path, predictions)
@@ -16,6 +16,7 @@ setup(
         "python-dotenv>=1.0.0",
         "scikit-learn>=1.3.0",
         "numpy>=1.24.0",
+        "scipy>=1.10.0",
     ],
     extras_require={
         "eval": [
@@ -1 +1,42 @@
-"""Core modules for the evaluation framework sandbox."""
+"""Core modules for the evaluation framework sandbox.
+
+The main classes are importable from the package, e.g. ``from src import
+QABot``, but are only loaded on first access so that importing a light
+submodule (``src.config``, ``src.tracing``) does not pull in scikit-learn.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - import-time only for type checkers
+    from .config import settings
+    from .document_loader import Document, DocumentLoader
+    from .embeddings import EmbeddingIndex
+    from .qa_bot import Answer, QABot
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "Answer": "qa_bot",
+    "QABot": "qa_bot",
+    "Document": "document_loader",
+    "DocumentLoader": "document_loader",
+    "EmbeddingIndex": "embeddings",
+    "settings": "config",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,116 @@
+"""Heading-aware splitting of Markdown documents into retrievable passages."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .document_loader import Document
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass(slots=True)
+class Passage(Document):
+    """Section of a parent document, indexed in place of the whole file.
+
+    ``start`` and ``end`` are byte offsets into the UTF-8 encoded content of
+    the parent document and ``heading_path`` lists the enclosing headings from
+    the outermost inwards.
+    """
+
+    parent_id: str = ""
+    start: int = 0
+    end: int = 0
+    heading_path: tuple[str, ...] = ()
+
+
+def chunk_document(
+    document: Document, max_bytes: int = 1500, overlap_bytes: int = 200
+) -> list[Passage]:
+    """Split ``document`` at Markdown headings into passages.
+
+    Sections larger than ``max_bytes`` are cut at line boundaries into windows
+    that repeat up to ``overlap_bytes`` of the previous window. Headings inside
+    fenced code blocks are ignored, and a single line longer than
+    ``max_bytes`` becomes a passage of its own.
+    """
+
+    if max_bytes <= 0:
+        raise ValueError("max_bytes must be positive")
+    if not 0 <= overlap_bytes < max_bytes:
+        raise ValueError("overlap_bytes must be in [0, max_bytes)")
+
+    lines = document.content.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line.encode("utf-8")))
+
+    # Each section is (first line, end line, heading path).
+    sections: list[tuple[int, int, tuple[str, ...]]] = []
+    headings: list[str] = []
+    section_start = 0
+    section_path: tuple[str, ...] = ()
+    in_fence = False
+    for number, line in enumerate(lines):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING.match(line.rstrip("\r\n"))
+        if match is None:
+            continue
+        sections.append((section_start, number, section_path))
+        level = len(match.group(1))
+        headings = headings[: level - 1] + [match.group(2)]
+        section_start, section_path = number, tuple(headings)
+    sections.append((section_start, len(lines), section_path))
+
+    passages: list[Passage] = []
+    for first, last, path in sections:
+        for lo, hi in _windows(offsets, first, last, max_bytes, overlap_bytes):
+            content = "".join(lines[lo:hi])
+            if not content.strip():
+                continue
+            passages.append(
+                Passage(
+                    doc_id=f"{document.doc_id}#{len(passages)}",
+                    title=document.title,
+                    content=content,
+                    parent_id=document.doc_id,
+                    start=offsets[lo],
+                    end=offsets[hi],
+                    heading_path=path,
+                )
+            )
+    return passages
+
+
+def chunk_documents(
+    documents: Iterable[Document], max_bytes: int = 1500, overlap_bytes: int = 200
+) -> Iterator[Passage]:
+    """Yield the passages of every document in order."""
+
+    for document in documents:
+        yield from chunk_document(document, max_bytes, overlap_bytes)
+
+
+def _windows(
+    offsets: list[int], first: int, last: int, max_bytes: int, overlap_bytes: int
+) -> Iterator[tuple[int, int]]:
+    """Yield ``[lo, hi)`` line ranges covering ``first..last`` within the cap."""
+
+    lo = first
+    while lo < last:
+        hi = lo + 1
+        while hi < last and offsets[hi + 1] - offsets[lo] <= max_bytes:
+            hi += 1
+        yield lo, hi
+        if hi >= last:
+            return
+        # Step back over whole lines that fit in the overlap, but always advance.
+        next_lo = hi
+        while next_lo - 1 > lo and offsets[hi] - offsets[next_lo - 1] <= overlap_bytes:
+            next_lo -= 1
+        lo = next_lo
@@ -12,6 +12,20 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _optional_path(name: str, default: str) -> Path | None:
+    """Read a path from the environment, treating an empty value as unset."""
+
+    value = os.getenv(name, default)
+    return Path(value) if value else None
+
+
+def _optional_float(name: str) -> float | None:
+    """Read a number from the environment, treating an empty value as unset."""
+
+    value = os.getenv(name, "")
+    return float(value) if value else None
+
+
 @dataclass
 class Settings:
     """Runtime configuration for the sandbox."""
@@ -19,11 +33,27 @@ class Settings:
     documents_path: Path = Path(
         os.getenv("DOCUMENTS_PATH", "data/documents/sample_docs")
     )
-    embeddings_cache_path: Path = Path(
-        os.getenv("EMBEDDINGS_CACHE_PATH", "results/embeddings.pkl")
+    # Set EMBEDDINGS_CACHE_PATH to an empty string to disable the index cache.
+    embeddings_cache_path: Path | None = _optional_path(
+        "EMBEDDINGS_CACHE_PATH", "results/embeddings.idx"
     )
     top_k: int = int(os.getenv("TOP_K", "3"))
+    # "exhaustive" scores every document; "maxscore" prunes via posting lists.
+    retrieval_backend: str = os.getenv("RETRIEVAL_BACKEND", "exhaustive")
+    # Index heading-delimited passages instead of whole files.
+    chunk_passages: bool = os.getenv("CHUNK_PASSAGES", "false").lower() == "true"
+    chunk_max_bytes: int = int(os.getenv("CHUNK_MAX_BYTES", "1500"))
+    chunk_overlap_bytes: int = int(os.getenv("CHUNK_OVERLAP_BYTES", "200"))
+    # Values above 1 spread the index over that many worker processes.
+    index_shards: int = int(os.getenv("INDEX_SHARDS", "1"))
+    # In-process answer cache; size 0 disables it, an empty TTL never expires.
+    answer_cache_size: int = int(os.getenv("ANSWER_CACHE_SIZE", "1024"))
+    answer_cache_ttl: float | None = _optional_float("ANSWER_CACHE_TTL")
     use_gpu: bool = os.getenv("USE_GPU", "false").lower() == "true"
+    # Content-addressed store of evaluation embeddings; empty disables it.
+    embedding_eval_cache_path: Path | None = _optional_path(
+        "EMBEDDING_EVAL_CACHE_PATH", "results/embedding_cache.sqlite3"
+    )
 
     openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
     azure_openai_endpoint: str | None = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -34,8 +64,27 @@ class Settings:
     langchain_use_ollama: bool = (
         os.getenv("LANGCHAIN_USE_OLLAMA", "false").lower() == "true"
     )
+    # Concurrent judge calls, their rate limit (0 = unlimited) and retries.
+    langchain_max_concurrency: int = int(os.getenv("LANGCHAIN_MAX_CONCURRENCY", "4"))
+    langchain_requests_per_second: float = float(
+        os.getenv("LANGCHAIN_REQUESTS_PER_SECOND", "0")
+    )
+    langchain_max_retries: int = int(os.getenv("LANGCHAIN_MAX_RETRIES", "3"))
+    # Items graded per judge request; 1 grades every item on its own.
+    langchain_pack_size: int = int(os.getenv("LANGCHAIN_PACK_SIZE", "1"))
+    # On-disk cache of judge verdicts; empty disables it.
+    langchain_judge_cache_path: Path | None = _optional_path(
+        "LANGCHAIN_JUDGE_CACHE_PATH", "results/judge_cache.sqlite3"
+    )
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3")
     ollama_base_url: str | None = os.getenv("OLLAMA_BASE_URL")
+    # Tracing is off unless one of these is set: TRACE=true keeps in-memory
+    # span histograms, TRACE_JSONL_PATH appends every span to a file and
+    # TRACE_PROFILE_SPAN profiles the first occurrence of that span.
+    trace: bool = os.getenv("TRACE", "false").lower() == "true"
+    trace_jsonl_path: Path | None = _optional_path("TRACE_JSONL_PATH", "")
+    trace_profile_span: str | None = os.getenv("TRACE_PROFILE_SPAN") or None
+    trace_profile_dir: Path = Path(os.getenv("TRACE_PROFILE_DIR", "results/profiles"))
 
 
 settings = Settings()
@@ -5,14 +5,31 @@ embedding index used for local document retrieval.
 
 from __future__ import annotations
 
+import itertools
+from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable
+from pathlib import Path
+from typing import Callable, Iterable
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import CountVectorizer
 
 from .document_loader import Document
+from .inverted_index import InvertedIndex
+from .top_k import select_top_k
+from .index_cache import (
+    IndexCacheError,
+    fingerprint_documents,
+    read_index,
+    write_index,
+)
+from .tracing import traced
+
+RETRIEVAL_BACKENDS = ("exhaustive", "maxscore")
+
+# Every build or mutation gets a fresh stamp so callers can tell index states apart.
+_VERSIONS = itertools.count(1)
 
 
 @dataclass
@@ -24,35 +41,467 @@ class RetrievedContext:
 
 
 class EmbeddingIndex:
-    """Simple TF-IDF (Term Frequency-Inverse Document Frequency) based retrieval index."""
+    """Simple TF-IDF (Term Frequency-Inverse Document Frequency) based retrieval index.
+
+    Alongside the weighted ``matrix`` the index keeps raw term counts and
+    per-term document frequencies, so documents can be added, updated or
+    removed without refitting the corpus. Removed rows stay in place (with no
+    weight) until they make up ``compact_ratio`` of the matrix, at which point
+    the next refresh compacts them away.
 
-    def __init__(self, documents: Iterable[Document]) -> None:
-        self.documents = list(documents)
-        if not self.documents:
+    ``backend`` selects how queries are scored: ``"exhaustive"`` multiplies
+    queries against the whole matrix, while ``"maxscore"`` walks per-term
+    posting lists and skips documents that cannot reach the top-k. Both
+    return the same rankings.
+    """
+
+    compact_ratio = 0.25
+    query_block_size = 512
+
+    @traced("index.build")
+    def __init__(
+        self, documents: Iterable[Document], backend: str = "exhaustive"
+    ) -> None:
+        documents = list(documents)
+        if not documents:
             raise ValueError("No documents supplied for indexing")
+        self.backend = check_backend(backend)
+
+        vectorizer = make_vectorizer()
+        counts = vectorizer.fit_transform(doc.content for doc in documents)
+        self._init_state(documents, vectorizer.vocabulary_, counts.tocsr())
+
+    def _init_state(
+        self,
+        documents: list[Document],
+        vocabulary: dict[str, int],
+        counts: csr_matrix,
+        *,
+        df: np.ndarray | None = None,
+        idf: np.ndarray | None = None,
+        matrix: csr_matrix | None = None,
+        fingerprint: str | None = None,
+    ) -> None:
+        self.documents = documents
+        self.vocabulary = dict(vocabulary)
+        self._analyzer: Callable[[str], list[str]] = make_vectorizer().build_analyzer()
+        self._counts = counts
+        self._rows = {doc.doc_id: row for row, doc in enumerate(documents)}
+        self._live = np.ones(len(documents), dtype=bool)
+        self._df = (
+            np.array(df, dtype=np.int64)
+            if df is not None
+            else np.bincount(counts.indices, minlength=len(self.vocabulary))
+        )
+        self._idf = (
+            np.asarray(idf, dtype=np.float64)
+            if idf is not None
+            else smoothed_idf(self._df, len(documents))
+        )
+        self.matrix = matrix if matrix is not None else weight_rows(counts, self._idf)
+        self._fingerprint = fingerprint
+        self._stale = False
+        self._inverted: tuple[csr_matrix, InvertedIndex] | None = None
+        self.version = next_version()
+
+    def __len__(self) -> int:
+        """Return the number of live (not removed) documents."""
+
+        return int(self._live.sum())
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the live documents, computed on demand."""
+
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint_documents(self.live_documents())
+        return self._fingerprint
+
+    @classmethod
+    def load_or_build(
+        cls,
+        documents: Iterable[Document],
+        cache_path: Path | None,
+        backend: str = "exhaustive",
+    ) -> "EmbeddingIndex":
+        """Load the index from ``cache_path`` or build it and refresh the cache.
+
+        The cache is reused only when its fingerprint matches the content hash
+        of ``documents``; otherwise the index is rebuilt and written back.
+        """
+
+        documents = list(documents)
+        if cache_path is None:
+            return cls(documents, backend=backend)
+
+        try:
+            return cls.load(cache_path, documents, backend=backend)
+        except (FileNotFoundError, IndexCacheError):
+            pass
+
+        index = cls(documents, backend=backend)
+        try:
+            index.save(cache_path)
+        except OSError:
+            # A read-only results directory should not prevent answering.
+            pass
+        return index
+
+    @classmethod
+    @traced("index.load")
+    def load(
+        cls, path: Path, documents: Iterable[Document], backend: str = "exhaustive"
+    ) -> "EmbeddingIndex":
+        """Load a cached index for ``documents``, memory-mapping its matrices.
+
+        Raises ``FileNotFoundError`` when no cache exists and
+        ``IndexCacheError`` when the cache is unreadable or stale.
+        """
+
+        documents = list(documents)
+        if not documents:
+            raise ValueError("No documents supplied for indexing")
+        if not path.exists():
+            raise FileNotFoundError(f"Index cache not found: {path}")
+
+        cached = read_index(path)
+        fingerprint = fingerprint_documents(documents)
+        if cached.fingerprint != fingerprint or cached.doc_ids != [
+            doc.doc_id for doc in documents
+        ]:
+            raise IndexCacheError(f"Index cache is stale for these documents: {path}")
+
+        arrays = cached.arrays
+        missing = {"counts", "data", "df", "idf", "indices", "indptr"} - set(arrays)
+        if missing:
+            raise IndexCacheError(
+                f"Index cache lacks sections {sorted(missing)}: {path}"
+            )
+        shape = (len(documents), len(cached.terms))
+        # Counts and weights share one sparsity pattern, stored only once.
+        structure = (arrays["indices"], arrays["indptr"])
+        index = cls.__new__(cls)
+        index.backend = check_backend(backend)
+        index._init_state(
+            documents,
+            {term: col for col, term in enumerate(cached.terms)},
+            csr_matrix((arrays["counts"], *structure), shape=shape, copy=False),
+            df=arrays["df"],
+            idf=arrays["idf"],
+            matrix=csr_matrix((arrays["data"], *structure), shape=shape, copy=False),
+            fingerprint=fingerprint,
+        )
+        return index
+
+    def save(self, path: Path) -> Path:
+        """Write the vocabulary, term statistics and matrices to ``path``."""
+
+        if not self._live.all():
+            self.compact()
+        self._refresh()
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        return write_index(
+            path,
+            fingerprint=self.fingerprint,
+            doc_ids=[doc.doc_id for doc in self.documents],
+            terms=terms,
+            arrays={
+                "idf": self._idf,
+                "df": self._df,
+                "counts": self._counts.data.astype(np.int32, copy=False),
+                "data": self.matrix.data,
+                "indices": self.matrix.indices,
+                "indptr": self.matrix.indptr,
+            },
+        )
+
+    def add_documents(self, documents: Iterable[Document]) -> None:
+        """Index new documents, counting terms for the new rows only."""
+
+        documents = list(documents)
+        if not documents:
+            return
+
+        seen: set[str] = set()
+        for doc in documents:
+            if doc.doc_id in self._rows or doc.doc_id in seen:
+                raise ValueError(f"Document already indexed: {doc.doc_id}")
+            seen.add(doc.doc_id)
+
+        new_counts = self._count_rows(doc.content for doc in documents)
+        n_terms = len(self.vocabulary)
+        old_counts = self._counts
+        # Widen the existing rows to the grown vocabulary without copying them.
+        widened = csr_matrix(
+            (old_counts.data, old_counts.indices, old_counts.indptr),
+            shape=(old_counts.shape[0], n_terms),
+            copy=False,
+        )
+        self._counts = vstack([widened, new_counts], format="csr")
+
+        df = np.zeros(n_terms, dtype=np.int64)
+        df[: len(self._df)] = self._df
+        df += np.bincount(new_counts.indices, minlength=n_terms)
+        self._df = df
+
+        first_row = len(self.documents)
+        self.documents.extend(documents)
+        self._rows.update(
+            (doc.doc_id, first_row + offset) for offset, doc in enumerate(documents)
+        )
+        self._live = np.concatenate([self._live, np.ones(len(documents), dtype=bool)])
+        self._mark_changed()
+
+    def update_document(self, document: Document) -> None:
+        """Replace the indexed content of an existing document."""
+
+        self.remove_document(document.doc_id)
+        self.add_documents([document])
+
+    def remove_document(self, doc_id: str) -> None:
+        """Drop a document from the index; its row is compacted away lazily."""
+
+        try:
+            row = self._rows.pop(doc_id)
+        except KeyError:
+            raise KeyError(f"Document not indexed: {doc_id}") from None
+
+        start, end = self._counts.indptr[row], self._counts.indptr[row + 1]
+        self._df[self._counts.indices[start:end]] -= 1
+        self._live[row] = False
+        self._mark_changed()
+
+    def compact(self) -> None:
+        """Physically drop removed rows and terms no live document uses."""
+
+        keep_rows = np.flatnonzero(self._live)
+        keep_terms = np.flatnonzero(self._df > 0)
+        counts = self._counts[keep_rows]
+        if len(keep_terms) < len(self._df):
+            counts = counts[:, keep_terms]
+            terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+            self.vocabulary = {terms[col]: new for new, col in enumerate(keep_terms)}
+            self._df = self._df[keep_terms]
+
+        self._counts = counts.tocsr()
+        self.documents = [self.documents[row] for row in keep_rows]
+        self._rows = {doc.doc_id: row for row, doc in enumerate(self.documents)}
+        self._live = np.ones(len(self.documents), dtype=bool)
+        self._stale = True
+        self._refresh()
 
-        # stop_words="english" -> Ignores common English words (the, a, is, etc.)
-        self.vectorizer = TfidfVectorizer(stop_words="english")
-        self.matrix = self.vectorizer.fit_transform(
-            doc.content for doc in self.documents
+    def _mark_changed(self) -> None:
+        self._stale = True
+        self._fingerprint = None
+        self.version = next_version()
+
+    def _refresh(self) -> None:
+        """Recompute IDF weights and the weighted matrix after mutations."""
+
+        if not self._stale:
+            return
+        dead = len(self._live) - int(self._live.sum())
+        if dead and dead >= self.compact_ratio * len(self._live):
+            self.compact()
+            return
+        self._idf = smoothed_idf(self._df, int(self._live.sum()))
+        self.matrix = weight_rows(self._counts, self._idf, self._live)
+        self._stale = False
+
+    def live_documents(self) -> list[Document]:
+        """Return the indexed documents that have not been removed."""
+
+        return [doc for doc, live in zip(self.documents, self._live) if live]
+
+    def _count_rows(self, texts: Iterable[str]) -> csr_matrix:
+        """Count terms per text, adding unseen terms to the vocabulary."""
+
+        indptr = [0]
+        indices: list[int] = []
+        data: list[int] = []
+        for text in texts:
+            counter = Counter(self._analyzer(text))
+            columns = sorted(
+                (self.vocabulary.setdefault(term, len(self.vocabulary)), count)
+                for term, count in counter.items()
+            )
+            indices.extend(col for col, _ in columns)
+            data.extend(count for _, count in columns)
+            indptr.append(len(indices))
+        return csr_matrix(
+            (
+                np.asarray(data, dtype=np.int64),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64),
+            ),
+            shape=(len(indptr) - 1, len(self.vocabulary)),
+        )
+
+    def _vectorize(self, texts: Iterable[str]) -> csr_matrix:
+        """Return L2-normalized TF-IDF query vectors for ``texts``."""
+
+        # Terms no live document contains would not survive a refit, so they
+        # must not contribute to the query norm either.
+        return vectorize_queries(
+            texts,
+            self._analyzer,
+            self.vocabulary,
+            np.where(self._df > 0, self._idf, 0.0),
         )
 
+    @traced("index.query")
     def query(self, text: str, top_k: int = 3) -> list[RetrievedContext]:
         """Return the top ``top_k`` contexts matching the provided text."""
 
-        if not text.strip():
-            return []
-        query_vec = self.vectorizer.transform([text])
+        return self.query_batch([text], top_k)[0]
+
+    @traced("index.query_batch")
+    def query_batch(
+        self, texts: Iterable[str], top_k: int = 3
+    ) -> list[list[RetrievedContext]]:
+        """Return the top ``top_k`` contexts for each text, in input order.
+
+        All queries are vectorized together and scored with one sparse
+        product per block of ``query_block_size`` queries.
+        """
 
-        # cosine_similarity is a math function that measures how similar two things are
-        # by comparing them as vectors. It returns a score from 0 to 1:
-        # 1.0 = Identical (perfect match), 0.5 = Somewhat similar, 0.0 = Completely different
-        similarity_scores = cosine_similarity(query_vec, self.matrix)[0]
-        rankings = np.argsort(similarity_scores)[::-1][:top_k]
+        texts = list(texts)
+        results: list[list[RetrievedContext]] = [[] for _ in texts]
+        pending = [pos for pos, text in enumerate(texts) if text.strip()]
+        if not pending or top_k <= 0:
+            return results
+        self._refresh()
+
+        for start in range(0, len(pending), self.query_block_size):
+            block = pending[start : start + self.query_block_size]
+            query_vecs = self._vectorize(texts[pos] for pos in block)
+            inverted = self._inverted_index() if self.backend == "maxscore" else None
+            ranked = rank_rows(query_vecs, self.matrix, top_k, inverted)
+            for pos, (rows, scores) in zip(block, ranked):
+                results[pos] = self._contexts(rows, scores)
+        return results
+
+    def _contexts(self, rows: np.ndarray, scores: np.ndarray) -> list[RetrievedContext]:
         return [
-            RetrievedContext(
-                document=self.documents[idx], score=float(similarity_scores[idx])
-            )
-            for idx in rankings
-            if similarity_scores[idx] > 0
+            RetrievedContext(document=self.documents[idx], score=float(score))
+            for idx, score in zip(rows, scores)
         ]
+
+    def _inverted_index(self) -> InvertedIndex:
+        """Return posting lists for the current matrix, rebuilding if stale."""
+
+        if self._inverted is None or self._inverted[0] is not self.matrix:
+            self._inverted = (self.matrix, InvertedIndex(self.matrix))
+        return self._inverted[1]
+
+
+def vectorize_queries(
+    texts: Iterable[str],
+    analyzer: Callable[[str], list[str]],
+    vocabulary: dict[str, int],
+    weights: np.ndarray,
+) -> csr_matrix:
+    """Count known terms in ``texts`` and return weighted, normalized rows."""
+
+    indptr = [0]
+    indices: list[int] = []
+    data: list[int] = []
+    for text in texts:
+        counter = Counter(
+            col for col in map(vocabulary.get, analyzer(text)) if col is not None
+        )
+        columns = sorted(counter.items())
+        indices.extend(col for col, _ in columns)
+        data.extend(count for _, count in columns)
+        indptr.append(len(indices))
+    counts = csr_matrix(
+        (
+            np.asarray(data, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(indptr) - 1, len(vocabulary)),
+    )
+    return weight_rows(counts, weights)
+
+
+def rank_rows(
+    query_vecs: csr_matrix,
+    matrix: csr_matrix,
+    top_k: int,
+    inverted: InvertedIndex | None = None,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return the best ``(rows, scores)`` of ``matrix`` for each query vector.
+
+    With an ``inverted`` index, queries are answered from posting lists with
+    MaxScore pruning; otherwise all queries are scored in one sparse product.
+    """
+
+    if inverted is not None:
+        return [
+            inverted.top_k(query_vecs.indices[lo:hi], query_vecs.data[lo:hi], top_k)
+            for lo, hi in zip(query_vecs.indptr[:-1], query_vecs.indptr[1:])
+        ]
+
+    # Rows of both matrices are L2-normalized, so their dot product is the
+    # cosine similarity: a score from 0 to 1 where 1.0 = identical,
+    # 0.5 = somewhat similar and 0.0 = completely different.
+    similarity = (query_vecs @ matrix.T).tocsr()
+    return [
+        select_top_k(similarity.indices[lo:hi], similarity.data[lo:hi], top_k)
+        for lo, hi in zip(similarity.indptr[:-1], similarity.indptr[1:])
+    ]
+
+
+def next_version() -> int:
+    """Return a fresh version stamp for a newly built or mutated index."""
+
+    return next(_VERSIONS)
+
+
+def check_backend(backend: str) -> str:
+    """Return ``backend`` if it names a retrieval backend, else raise."""
+
+    if backend not in RETRIEVAL_BACKENDS:
+        raise ValueError(
+            f"Unknown retrieval backend {backend!r}; "
+            f"expected one of {', '.join(RETRIEVAL_BACKENDS)}"
+        )
+    return backend
+
+
+def make_vectorizer() -> CountVectorizer:
+    """Create the term counter shared by fitted, cached and updated indexes."""
+
+    # stop_words="english" -> Ignores common English words (the, a, is, etc.)
+    return CountVectorizer(stop_words="english")
+
+
+def smoothed_idf(df: np.ndarray, n_documents: int) -> np.ndarray:
+    """Return scikit-learn's smoothed IDF weights for document frequencies."""
+
+    # Matches TfidfVectorizer(smooth_idf=True): as if one extra document
+    # contained every term exactly once, preventing zero divisions.
+    return np.log((n_documents + 1) / (df + 1)) + 1
+
+
+def weight_rows(
+    counts: csr_matrix, idf: np.ndarray, live: np.ndarray | None = None
+) -> csr_matrix:
+    """Apply IDF weights to term counts and L2-normalize each row.
+
+    The result shares the sparsity structure of ``counts``; rows whose
+    ``live`` flag is false keep their entries but carry zero weight.
+    """
+
+    n_rows = counts.shape[0]
+    row_ids = np.repeat(np.arange(n_rows), np.diff(counts.indptr))
+    data = counts.data * idf[counts.indices]
+    if live is not None:
+        data = data * live[row_ids]
+    norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_rows))
+    norms[norms == 0] = 1.0
+    data = data / norms[row_ids]
+    return csr_matrix(
+        (data, counts.indices, counts.indptr), shape=counts.shape, copy=False
+    )
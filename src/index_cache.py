@@ -0,0 +1,222 @@
+"""Versioned binary storage for fitted TF-IDF indexes.
+
+The cache file is laid out as a fixed preamble, a JSON header, and a series of
+64-byte aligned array sections::
+
+    magic (8 bytes) | format version (uint32) | header length (uint32)
+    header (UTF-8 JSON) | padding | section | padding | section | ...
+
+The header records the dtype, shape, and byte offset of every section so that
+numeric arrays can be mapped back with :class:`numpy.memmap` instead of being
+copied into memory. No pickled Python objects are ever written or read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .document_loader import Document
+
+MAGIC = b"EFSIDX\x00\x00"
+FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+
+class IndexCacheError(ValueError):
+    """Raised when a cache file is missing, corrupt, or from another version."""
+
+
+@dataclass
+class CachedIndex:
+    """Raw contents of a cache file as returned by :func:`read_index`."""
+
+    fingerprint: str
+    doc_ids: list[str]
+    terms: list[str]
+    arrays: dict[str, np.ndarray]
+    meta: dict[str, object] = field(default_factory=dict)
+
+
+def fingerprint_documents(documents: Iterable[Document]) -> str:
+    """Return a content hash covering the id, title, and text of ``documents``."""
+
+    digest = hashlib.sha256()
+    for doc in documents:
+        for part in (doc.doc_id, doc.title, doc.content):
+            encoded = part.encode("utf-8")
+            # Length-prefix each field so adjacent values cannot collide.
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _current_umask() -> int:
+    # The umask can only be read by setting it, so restore it immediately.
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def write_index(
+    path: Path,
+    *,
+    fingerprint: str,
+    doc_ids: list[str],
+    terms: list[str],
+    arrays: dict[str, np.ndarray],
+    meta: dict[str, object] | None = None,
+) -> Path:
+    """Atomically write an index cache file to ``path`` and return it."""
+
+    vocab_blob = "\n".join(terms).encode("utf-8")
+    sections: dict[str, np.ndarray] = {
+        "vocabulary": np.frombuffer(vocab_blob, dtype=np.uint8),
+        **{name: np.ascontiguousarray(array) for name, array in arrays.items()},
+    }
+
+    # Header offsets depend on the header size, so size the header with
+    # placeholder offsets first and lay the sections out after it.
+    def build_header(offsets: dict[str, int]) -> bytes:
+        return json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "doc_ids": doc_ids,
+                "num_terms": len(terms),
+                "meta": meta or {},
+                "sections": {
+                    name: {
+                        "dtype": array.dtype.str,
+                        "shape": list(array.shape),
+                        "offset": offsets.get(name, 0),
+                    }
+                    for name, array in sections.items()
+                },
+            }
+        ).encode("utf-8")
+
+    placeholder = {name: 2**62 for name in sections}
+    cursor = _align(_PREAMBLE.size + len(build_header(placeholder)))
+    offsets: dict[str, int] = {}
+    for name, array in sections.items():
+        offsets[name] = cursor
+        cursor = _align(cursor + array.nbytes)
+    header = build_header(offsets)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            fp.write(header)
+            for name, array in sections.items():
+                fp.seek(offsets[name])
+                fp.write(array.tobytes())
+            fp.truncate(max(cursor, fp.tell()))
+        # mkstemp creates the file as 0600; give it the permissions a plain
+        # open() would, so other users can read the cache as before.
+        os.chmod(tmp_name, 0o666 & ~_current_umask())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _validate_header(
+    header: object,
+) -> dict[str, tuple[np.dtype, tuple[int, ...], int]]:
+    """Check the header's fields and return each section's layout.
+
+    Raises ``KeyError``, ``TypeError`` or ``ValueError`` for missing or
+    mistyped fields; :func:`read_index` reports them as a corrupt cache.
+    """
+
+    if not isinstance(header, dict):
+        raise TypeError("header is not an object")
+    if not isinstance(header["fingerprint"], str):
+        raise TypeError("fingerprint must be a string")
+    if not all(isinstance(doc_id, str) for doc_id in header["doc_ids"]):
+        raise TypeError("doc_ids must be strings")
+    num_terms = header["num_terms"]
+    if not isinstance(num_terms, int) or num_terms < 0:
+        raise ValueError("num_terms must be a non-negative integer")
+    if not isinstance(header.get("meta", {}), dict):
+        raise TypeError("meta must be an object")
+    sections = {}
+    for name, spec in header["sections"].items():
+        shape = tuple(int(size) for size in spec["shape"])
+        offset = spec["offset"]
+        if not isinstance(offset, int) or offset < 0 or min(shape, default=0) < 0:
+            raise ValueError(f"bad layout for section {name!r}")
+        sections[name] = (np.dtype(spec["dtype"]), shape, offset)
+    if "vocabulary" not in sections:
+        raise KeyError("vocabulary")
+    return sections
+
+
+def read_index(path: Path) -> CachedIndex:
+    """Read an index cache file, memory-mapping every numeric section."""
+
+    try:
+        with path.open("rb") as fp:
+            preamble = fp.read(_PREAMBLE.size)
+            if len(preamble) != _PREAMBLE.size:
+                raise IndexCacheError(f"Truncated index cache: {path}")
+            magic, version, header_len = _PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise IndexCacheError(f"Not an index cache file: {path}")
+            if version != FORMAT_VERSION:
+                raise IndexCacheError(
+                    f"Index cache version {version} is not supported "
+                    f"(expected {FORMAT_VERSION}): {path}"
+                )
+            header = json.loads(fp.read(header_len).decode("utf-8"))
+    except OSError as exc:
+        raise IndexCacheError(f"Could not read index cache {path}: {exc}") from exc
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise IndexCacheError(f"Corrupt index cache header: {path}") from exc
+    try:
+        sections = _validate_header(header)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise IndexCacheError(f"Malformed index cache header: {path}") from exc
+
+    file_size = path.stat().st_size
+    arrays: dict[str, np.ndarray] = {}
+    for name, (dtype, shape, offset) in sections.items():
+        count = int(np.prod(shape, dtype=np.int64))
+        if offset + count * dtype.itemsize > file_size:
+            raise IndexCacheError(f"Truncated index cache section {name!r}: {path}")
+        if count == 0:
+            # ``np.memmap`` refuses zero-length mappings.
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.memmap(
+            path, dtype=dtype, mode="r", offset=offset, shape=shape
+        )
+
+    vocab_blob = bytes(arrays.pop("vocabulary"))
+    terms = vocab_blob.decode("utf-8").split("\n") if header["num_terms"] else []
+    if len(terms) != header["num_terms"]:
+        raise IndexCacheError(f"Corrupt vocabulary section: {path}")
+
+    return CachedIndex(
+        fingerprint=header["fingerprint"],
+        doc_ids=list(header["doc_ids"]),
+        terms=terms,
+        arrays=arrays,
+        meta=dict(header.get("meta", {})),
+    )
@@ -0,0 +1,126 @@
+"""Posting-list retrieval with MaxScore early termination.
+
+The exhaustive retrieval path multiplies every query against every document
+row. For large corpora most of those rows share no term with the question or
+cannot possibly reach the top-k. :class:`InvertedIndex` keeps one posting list
+per term together with the largest weight in that list, and evaluates queries
+term-at-a-time in the spirit of Turtle and Flood's MaxScore:
+
+1. Query terms are ordered by their score upper bound
+   (``query weight * max posting weight``).
+2. Posting lists are merged into a candidate set while an unseen document
+   could still outscore the current k-th best candidate.
+3. Once the remaining upper bounds cannot lift an unseen document past that
+   threshold, the rest of the terms are only probed (by binary search) for the
+   surviving candidates, which are themselves pruned as the threshold rises.
+
+Because every pruning decision relies on upper bounds, the returned ranking is
+identical to exhaustively scoring the weighted matrix.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .top_k import select_top_k
+
+# Slack for floating-point error when comparing accumulated upper bounds.
+_BOUND_SLACK = 1e-9
+
+
+class InvertedIndex:
+    """Per-term posting lists over a row-normalized document-term matrix."""
+
+    def __init__(self, matrix: csr_matrix) -> None:
+        postings = matrix.tocsc(copy=True)
+        postings.eliminate_zeros()
+        postings.sort_indices()
+        self.num_documents = postings.shape[0]
+        self._indptr = postings.indptr
+        self._rows = postings.indices
+        self._weights = postings.data
+
+        self.max_weights = np.zeros(postings.shape[1], dtype=np.float64)
+        starts = self._indptr[:-1]
+        non_empty = np.diff(self._indptr) > 0
+        if non_empty.any():
+            self.max_weights[non_empty] = np.maximum.reduceat(
+                self._weights, starts[non_empty]
+            )
+
+    def postings(self, term: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the sorted row ids and weights of ``term``'s posting list."""
+
+        lo, hi = self._indptr[term], self._indptr[term + 1]
+        return self._rows[lo:hi], self._weights[lo:hi]
+
+    def top_k(
+        self, terms: np.ndarray, weights: np.ndarray, top_k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the best ``top_k`` rows and scores for a weighted query.
+
+        Rows are ordered by descending score with ties broken by row id,
+        matching :func:`src.top_k.select_top_k`.
+        """
+
+        bounds = weights * self.max_weights[terms]
+        order = np.argsort(-bounds, kind="stable")
+        order = order[bounds[order] > 0]
+        terms, weights, bounds = terms[order], weights[order], bounds[order]
+        # remaining[i] bounds what terms i.. can still add to any document.
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1], 0.0)
+
+        rows = np.empty(0, dtype=np.int64)
+        scores = np.empty(0, dtype=np.float64)
+        for pos, (term, weight) in enumerate(zip(terms, weights)):
+            threshold = _kth_best(scores, top_k)
+            if remaining[pos] + _BOUND_SLACK < threshold:
+                rows, scores = self._score_candidates(
+                    rows, scores, terms[pos:], weights[pos:], remaining[pos:], top_k
+                )
+                break
+            term_rows, term_weights = self.postings(term)
+            rows, inverse = np.unique(
+                np.concatenate([rows, term_rows]), return_inverse=True
+            )
+            scores = np.bincount(
+                inverse,
+                weights=np.concatenate([scores, weight * term_weights]),
+                minlength=len(rows),
+            )
+        return select_top_k(rows, scores, top_k)
+
+    def _score_candidates(
+        self,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        terms: np.ndarray,
+        weights: np.ndarray,
+        remaining: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Finish scoring existing candidates without admitting new documents."""
+
+        scores = scores.copy()
+        for pos, (term, weight) in enumerate(zip(terms, weights)):
+            threshold = _kth_best(scores, top_k)
+            viable = scores + remaining[pos] + _BOUND_SLACK >= threshold
+            rows, scores = rows[viable], scores[viable]
+
+            term_rows, term_weights = self.postings(term)
+            if not len(term_rows):
+                continue
+            found = np.searchsorted(term_rows, rows)
+            found = np.minimum(found, len(term_rows) - 1)
+            hit = term_rows[found] == rows
+            scores[hit] += weight * term_weights[found[hit]]
+        return rows, scores
+
+
+def _kth_best(scores: np.ndarray, top_k: int) -> float:
+    """Return the k-th highest score, or 0 when fewer than k are known."""
+
+    if len(scores) < top_k:
+        return 0.0
+    return float(np.partition(scores, len(scores) - top_k)[len(scores) - top_k])
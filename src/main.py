@@ -1,18 +1,66 @@
-"""Command-line entrypoint for the local documentation QA bot."""
+"""Command-line entrypoint for the local documentation QA bot.
+
+With a positional question the bot prints one human-readable answer. The
+other modes build the index once and answer many questions, writing one JSON
+line per answer (the ``Answer.to_dict()`` fields plus ``latency_ms``):
+
+- ``--questions-file`` reads a JSON list or a JSON Lines file of questions;
+- ``--stdin`` (the default when stdin is piped) answers each line as it
+  arrives, so long-running pipelines get answers without waiting for EOF;
+- ``--repl`` (the default on a terminal) prompts for questions interactively.
+"""
 
 from __future__ import annotations
 
 import argparse
+import json
+import sys
+import time
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+
+from . import tracing
 
-from .qa_bot import QABot
+if TYPE_CHECKING:  # pragma: no cover - imported lazily at runtime
+    from .qa_bot import QABot
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     """Parse CLI arguments for running the QA bot."""
 
     parser = argparse.ArgumentParser(description="Simple documentation QA bot")
-    parser.add_argument("question", help="Question to ask the bot")
+    parser.add_argument(
+        "question",
+        nargs="?",
+        default=None,
+        help="Question to ask the bot; omit it to read questions instead",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--questions-file",
+        type=Path,
+        default=None,
+        help="JSON list or JSON Lines file of questions (strings or objects "
+        "with a 'question' field)",
+    )
+    mode.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Answer newline-delimited questions from stdin as they arrive",
+    )
+    mode.add_argument("--repl", action="store_true", help="Ask questions interactively")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write JSON Lines answers here instead of stdout",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Questions answered together in --questions-file mode",
+    )
     parser.add_argument(
         "--documents",
         type=Path,
@@ -25,15 +73,112 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Number of documents to retrieve",
     )
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.question is not None and (args.questions_file or args.stdin or args.repl):
+        parser.error("a positional question cannot be combined with another mode")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
 
 
-def main() -> None:
-    """Run the QA bot using command-line arguments and print the answer."""
+def _question_record(raw: Any, line: int) -> dict[str, Any]:
+    """Normalize one input entry to a dict with a ``question`` string."""
 
-    args = parse_args()
-    bot = QABot(documents_path=args.documents, top_k=args.top_k)
-    answer = bot.answer(args.question)
+    if isinstance(raw, str):
+        return {"question": raw}
+    if isinstance(raw, dict) and isinstance(raw.get("question"), str):
+        return raw
+    raise ValueError(f"entry {line}: expected a string or an object with 'question'")
+
+
+def read_questions(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield question records from a JSON list or a JSON Lines file.
+
+    Files ending in ``.jsonl`` or ``.ndjson`` are read line by line, so large
+    files are never held in memory; anything else must be one JSON array.
+    """
+
+    if path.suffix in {".jsonl", ".ndjson"}:
+        with path.open(encoding="utf-8") as fp:
+            for line, text in enumerate(fp, 1):
+                if text.strip():
+                    yield _question_record(json.loads(text), line)
+        return
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a JSON list of questions")
+    for line, raw in enumerate(entries, 1):
+        yield _question_record(raw, line)
+
+
+def _batches(
+    records: Iterable[dict[str, Any]], size: int
+) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _emit(out: IO[str], record: dict[str, Any], answer: Any, seconds: float) -> None:
+    extra = {key: value for key, value in record.items() if key != "question"}
+    payload = {**extra, **answer.to_dict(), "latency_ms": seconds * 1000}
+    out.write(json.dumps(payload) + "\n")
+    out.flush()
+
+
+def answer_file(bot: QABot, path: Path, out: IO[str], batch_size: int) -> int:
+    """Answer every question in ``path`` in batches; return how many.
+
+    Extra fields on question objects (such as ``id``) are copied to the
+    output line. ``latency_ms`` is the batch time divided by its size.
+    """
+
+    count = 0
+    for batch in _batches(read_questions(path), batch_size):
+        started = time.perf_counter()
+        answers = bot.answer_batch([record["question"] for record in batch])
+        per_item = (time.perf_counter() - started) / len(batch)
+        for record, answer in zip(batch, answers):
+            _emit(out, record, answer, per_item)
+        count += len(batch)
+    return count
+
+
+def answer_lines(
+    bot: QABot, lines: Iterable[str], out: IO[str], prompt: str | None = None
+) -> int:
+    """Answer one question per non-empty line as it arrives; return how many.
+
+    With ``prompt``, it is written to stderr before each line is read, which
+    turns the loop into a REPL on a terminal.
+    """
+
+    count = 0
+    lines = iter(lines)
+    while True:
+        if prompt is not None:
+            sys.stderr.write(prompt)
+            sys.stderr.flush()
+        line = next(lines, None)
+        if line is None:
+            break
+        question = line.strip()
+        if not question:
+            continue
+        started = time.perf_counter()
+        answer = bot.answer(question)
+        _emit(out, {"question": question}, answer, time.perf_counter() - started)
+        count += 1
+    return count
+
+
+def _print_answer(bot: QABot, question: str) -> None:
+    answer = bot.answer(question)
     print(answer.response)
     if answer.context:
         print("\nMost relevant documents:")
@@ -41,5 +186,43 @@ def main() -> None:
             print(f"- {item.document.title} (score={item.score:.3f})")
 
 
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the QA bot using command-line arguments."""
+
+    args = parse_args(argv)
+    histogram = tracing.configure_from_settings()
+    # Imported after argument parsing so ``--help`` skips scikit-learn.
+    from .qa_bot import QABot
+
+    bot = QABot(documents_path=args.documents, top_k=args.top_k)
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.question is not None:
+            _print_answer(bot, args.question)
+        elif args.questions_file is not None:
+            answer_file(bot, args.questions_file, out, args.batch_size)
+        elif args.stdin or (not args.repl and not sys.stdin.isatty()):
+            answer_lines(bot, sys.stdin, out)
+        else:
+            answer_lines(bot, sys.stdin, out, prompt="? ")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        bot.close()
+
+    if histogram is not None:
+        # Keep stdout pure JSON Lines in the streaming modes.
+        stream = sys.stdout if args.question is not None else sys.stderr
+        print("\nTimings:", file=stream)
+        for name, stats in histogram.summary().items():
+            print(
+                f"- {name}: {stats['count']}x, {stats['total_s'] * 1000:.2f} ms",
+                file=stream,
+            )
+    tracing.reset()
+
+
 if __name__ == "__main__":
     main()
@@ -19,12 +19,18 @@ Example:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Iterable, cast
 
+from .answer_cache import AnswerCache, normalize_question
+from .chunking import chunk_documents
 from .config import settings
 from .document_loader import DocumentLoader, Document
 from .embeddings import EmbeddingIndex, RetrievedContext
+from .sharded_index import ShardedEmbeddingIndex
+from .snippets import SnippetIndex
+from .tracing import traced
 
 
 @dataclass
@@ -35,12 +41,36 @@ class Answer:
     response: str
     context: list[RetrievedContext]
 
+    def to_dict(self) -> dict[str, object]:
+        """Return a JSON-serializable view of the answer."""
+
+        return {
+            "question": self.question,
+            "response": self.response,
+            "context": [
+                {
+                    "doc_id": item.document.doc_id,
+                    "title": item.document.title,
+                    "score": item.score,
+                }
+                for item in self.context
+            ],
+        }
+
 
 class QABot:
     """Minimal retrieval-augmented QA bot for local documentation."""
 
     def __init__(
-        self, documents_path: Path | None = None, top_k: int | None = None
+        self,
+        documents_path: Path | None = None,
+        top_k: int | None = None,
+        cache_path: Path | None = None,
+        backend: str | None = None,
+        chunk_passages: bool | None = None,
+        shards: int | None = None,
+        answer_cache_size: int | None = None,
+        answer_cache_ttl: float | None = None,
     ) -> None:
         docs_path = documents_path or settings.documents_path
         if not docs_path.exists():
@@ -51,22 +81,116 @@ class QABot:
         if not documents:
             raise ValueError(f"No Markdown documents found in {docs_path}")
 
+        if settings.chunk_passages if chunk_passages is None else chunk_passages:
+            # Index heading-delimited passages so long pages only contribute
+            # their matching section to retrieval and snippet extraction.
+            documents = list(
+                chunk_documents(
+                    documents, settings.chunk_max_bytes, settings.chunk_overlap_bytes
+                )
+            )
+
         # This is a crucial step where the content of the documents is converted
         # into numerical representations (embeddings) that capture their semantic
         # meaning. This index allows for efficient searching based on the meaning
-        # of the question, not just keywords.
-        self.index = EmbeddingIndex(documents)
+        # of the question, not just keywords. A single-process index is cached
+        # on disk and reused until the documents change; a sharded index spreads
+        # building and querying over worker processes instead.
+        backend = backend or settings.retrieval_backend
+        shards = shards or settings.index_shards
+        self.index: EmbeddingIndex | ShardedEmbeddingIndex
+        if shards > 1:
+            self.index = ShardedEmbeddingIndex(documents, shards, backend=backend)
+        else:
+            self.index = EmbeddingIndex.load_or_build(
+                documents,
+                cache_path or settings.embeddings_cache_path,
+                backend=backend,
+            )
         self.top_k = top_k or settings.top_k
+        # Snippet lines are tokenized here, with the index, and re-synced
+        # whenever the index version changes.
+        self._snippets = SnippetIndex(self.index.live_documents())
+        self._snippets_version = self.index.version
+
+        # Repeated questions are served from memory. Keys include the index
+        # version, so any rebuild or document update invalidates old entries.
+        cache_size = (
+            settings.answer_cache_size
+            if answer_cache_size is None
+            else answer_cache_size
+        )
+        self.answer_cache: AnswerCache[Answer] | None = (
+            AnswerCache(cache_size, answer_cache_ttl or settings.answer_cache_ttl)
+            if cache_size > 0
+            else None
+        )
+
+    def close(self) -> None:
+        """Release index resources such as shard worker processes."""
+
+        if isinstance(self.index, ShardedEmbeddingIndex):
+            self.index.close()
 
     def retrieve(self, question: str) -> list[RetrievedContext]:
         """Retrieve the top matching (top_k) document contexts for a question."""
 
         return self.index.query(question, self.top_k)
 
+    @traced("qa.answer")
     def answer(self, question: str) -> Answer:
         """Generate an answer using the best matching documentation snippet."""
 
-        contexts = self.retrieve(question)
+        key = self._cache_key(question)
+        cached = self._cached_answer(key, question)
+        if cached is not None:
+            return cached
+
+        answer = self._compose_answer(question, self.retrieve(question))
+        if self.answer_cache is not None:
+            self.answer_cache.put(key, answer)
+        return answer
+
+    @traced("qa.answer_batch")
+    def answer_batch(self, questions: Iterable[str]) -> list[Answer]:
+        """Answer many questions at once, retrieving their contexts in one batch.
+
+        Cached questions are answered from memory and duplicate questions in
+        the batch are retrieved only once.
+        """
+
+        questions = list(questions)
+        answers: list[Answer | None] = [None] * len(questions)
+        misses: dict[tuple[object, ...], list[int]] = {}
+        for pos, question in enumerate(questions):
+            key = self._cache_key(question)
+            answers[pos] = self._cached_answer(key, question)
+            if answers[pos] is None:
+                misses.setdefault(key, []).append(pos)
+
+        contexts = self.index.query_batch(
+            [questions[positions[0]] for positions in misses.values()], self.top_k
+        )
+        for (key, positions), found in zip(misses.items(), contexts):
+            answer = self._compose_answer(questions[positions[0]], found)
+            if self.answer_cache is not None:
+                self.answer_cache.put(key, answer)
+            for pos in positions:
+                answers[pos] = _with_question(answer, questions[pos])
+        return cast(list[Answer], answers)
+
+    def _cache_key(self, question: str) -> tuple[object, ...]:
+        return (normalize_question(question), self.top_k, self.index.version)
+
+    def _cached_answer(self, key: tuple[object, ...], question: str) -> Answer | None:
+        if self.answer_cache is None:
+            return None
+        cached = self.answer_cache.get(key)
+        return None if cached is None else _with_question(cached, question)
+
+    def _compose_answer(
+        self, question: str, contexts: list[RetrievedContext]
+    ) -> Answer:
         if not contexts:
             return Answer(
                 question=question,
@@ -83,28 +207,19 @@ class QABot:
         )
         return Answer(question=question, response=response, context=contexts)
 
-    @staticmethod
-    def _extract_snippet(document: Document, question: str) -> str:
+    @traced("qa.snippet")
+    def _extract_snippet(self, document: Document, question: str) -> str:
         """Select the single line that best matches the user's question."""
 
-        lines = [line.strip() for line in document.content.splitlines() if line.strip()]
-        if not lines:
-            return ""
-
-        # Prefer non-heading lines; fall back to any content if necessary.
-        candidates = [line for line in lines if not line.startswith("#")]
-        if not candidates:
-            candidates = lines
+        # Lines are tokenized once per document; each question then only looks
+        # up its terms in the document's term → line postings.
+        if self._snippets_version != self.index.version:
+            self._snippets.sync(self.index.live_documents())
+            self._snippets_version = self.index.version
+        return self._snippets.best_line(document, question)
 
-        question_terms = set(question.lower().split())
-        best_line = candidates[0]
-        best_score = -1
 
-        for line in candidates:
-            line_terms = set(line.lower().split())
-            overlap = len(question_terms & line_terms)
-            if overlap > best_score:
-                best_score = overlap
-                best_line = line
+def _with_question(answer: Answer, question: str) -> Answer:
+    """Return ``answer`` as a fresh object addressed to ``question``."""
 
-        return best_line
+    return replace(answer, question=question, context=list(answer.context))
@@ -0,0 +1,370 @@
+"""Long-lived asyncio HTTP server for the documentation QA bot.
+
+The server keeps one warm :class:`~src.qa_bot.QABot` for its whole lifetime.
+Concurrent requests are queued and grouped into micro-batches, bounded by
+``max_batch_size`` questions and ``max_wait_ms`` of waiting after the first
+queued question, and each batch runs through ``QABot.answer_batch`` on a
+dedicated worker thread so the event loop keeps accepting connections.
+
+Endpoints:
+
+- ``POST /answer`` with a JSON body ``{"question": "..."}``
+- ``GET /stats`` for queue depth, batch sizes and latency percentiles
+- ``GET /health`` for a liveness probe
+
+Run it with ``python -m src.server --port 8000`` or ``--unix-socket PATH``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from .qa_bot import Answer, QABot
+
+_MAX_BODY_BYTES = 1 << 20
+
+
+@dataclass
+class _PendingQuestion:
+    question: str
+    future: asyncio.Future[tuple[Answer, int]]
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """Collects concurrent questions into batches for one answer function."""
+
+    def __init__(
+        self,
+        answer_batch: Callable[[list[str]], list[Answer]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        latency_window: int = 2048,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._answer_batch = answer_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[_PendingQuestion] = asyncio.Queue()
+        # One thread keeps batches serialized against the shared bot.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qa")
+        self._task: asyncio.Task[None] | None = None
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and release the worker thread."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, question: str) -> tuple[Answer, int, float]:
+        """Queue ``question`` and return its answer, batch size and latency (ms)."""
+
+        pending = _PendingQuestion(question, asyncio.get_running_loop().create_future())
+        await self._queue.put(pending)
+        answer, batch_size = await pending.future
+        latency_ms = (time.perf_counter() - pending.enqueued) * 1000
+        self._latencies.append(latency_ms)
+        return answer, batch_size, latency_ms
+
+    def stats(self) -> dict[str, object]:
+        """Return counters, queue depth and recent latency percentiles."""
+
+        latencies = np.fromiter(self._latencies, dtype=np.float64)
+        percentiles = (
+            dict(
+                zip(
+                    ("p50_ms", "p95_ms", "p99_ms"),
+                    (float(v) for v in np.percentile(latencies, [50, 95, 99])),
+                )
+            )
+            if len(latencies)
+            else {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+        )
+        return {
+            "queue_depth": self.queue_depth,
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": self.requests / self.batches if self.batches else None,
+            "latency": {"window": len(latencies), **percentiles},
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                answers = await loop.run_in_executor(
+                    self._executor,
+                    self._answer_batch,
+                    [item.question for item in batch],
+                )
+            except Exception as exc:  # surface failures to every waiting client
+                self.errors += len(batch)
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                continue
+            for item, answer in zip(batch, answers):
+                if not item.future.done():
+                    item.future.set_result((answer, len(batch)))
+
+
+class QAServer:
+    """Minimal HTTP/1.1 front end for a :class:`MicroBatcher`."""
+
+    def __init__(
+        self, bot: QABot, max_batch_size: int = 32, max_wait_ms: float = 5.0
+    ) -> None:
+        self.bot = bot
+        self.batcher = MicroBatcher(bot.answer_batch, max_batch_size, max_wait_ms)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        unix_socket: Path | None = None,
+    ) -> asyncio.AbstractServer:
+        """Start listening on a TCP port or, if given, a Unix socket."""
+
+        self.batcher.start()
+        if unix_socket is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=str(unix_socket)
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port
+            )
+        return self._server
+
+    async def close(self) -> None:
+        """Stop accepting connections and shut down the batcher."""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> bool:
+        """Serve one request; return whether the connection should stay open."""
+
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return False
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(
+                writer, HTTPStatus.BAD_REQUEST, {"error": "bad request"}
+            )
+            return False
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._respond(
+                writer, HTTPStatus.BAD_REQUEST, {"error": "bad content-length"}
+            )
+            return False
+        if length > _MAX_BODY_BYTES:
+            await self._respond(
+                writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}
+            )
+            return False
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = (
+            headers.get("connection", "").lower() != "close"
+            and version.upper() == "HTTP/1.1"
+        )
+
+        status, payload = await self._route(method.upper(), target, body)
+        await self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def _route(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[HTTPStatus, dict[str, object]]:
+        path = target.split("?", 1)[0]
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path == "/stats" and method == "GET":
+            cache = self.bot.answer_cache
+            return HTTPStatus.OK, {
+                **self.batcher.stats(),
+                "answer_cache": cache.stats() if cache is not None else None,
+            }
+        if path != "/answer":
+            return HTTPStatus.NOT_FOUND, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+
+        try:
+            question = json.loads(body or b"{}")["question"]
+        except (ValueError, KeyError, TypeError):
+            return HTTPStatus.BAD_REQUEST, {"error": 'expected {"question": "..."}'}
+        if not isinstance(question, str):
+            return HTTPStatus.BAD_REQUEST, {"error": "question must be a string"}
+
+        try:
+            answer, batch_size, latency_ms = await self.batcher.submit(question)
+        except Exception as exc:  # report, but keep serving other clients
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        return HTTPStatus.OK, {
+            **answer.to_dict(),
+            "batch_size": batch_size,
+            "latency_ms": latency_ms,
+        }
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: dict[str, object],
+        keep_alive: bool = False,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse CLI arguments for running the QA server."""
+
+    parser = argparse.ArgumentParser(description="Documentation QA bot server")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="TCP port to bind")
+    parser.add_argument(
+        "--unix-socket",
+        type=Path,
+        default=None,
+        help="Serve on this Unix socket path instead of TCP",
+    )
+    parser.add_argument(
+        "--documents",
+        type=Path,
+        default=None,
+        help="Override the path to the Markdown documentation directory",
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=None, help="Number of documents to retrieve"
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=32,
+        help="Largest number of questions answered together",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=5.0,
+        help="How long a batch waits for more questions after the first",
+    )
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Build the bot once and serve requests until cancelled."""
+
+    bot = QABot(documents_path=args.documents, top_k=args.top_k)
+    server = QAServer(bot, args.max_batch_size, args.max_wait_ms)
+    listener = await server.start(args.host, args.port, args.unix_socket)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"Serving QA bot on {where}")
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+        bot.close()
+
+
+def main() -> None:
+    """Run the QA server using command-line arguments."""
+
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Multi-process TF-IDF index that splits the corpus into shards.
+
+Each shard lives in its own worker process and holds a contiguous slice of
+the documents. Building runs in two parallel phases: every shard counts the
+terms of its slice, the parent merges the per-shard vocabularies and document
+frequencies into shared global statistics, and every shard then weights its
+rows with the global IDF. Queries are vectorized once in the parent, scattered
+to all shards, and the per-shard top-k lists are gathered and merged into one
+globally correct ranking.
+"""
+
+from __future__ import annotations
+
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .document_loader import Document
+from .embeddings import (
+    RetrievedContext,
+    check_backend,
+    make_vectorizer,
+    next_version,
+    rank_rows,
+    smoothed_idf,
+    vectorize_queries,
+    weight_rows,
+)
+from .inverted_index import InvertedIndex
+from .top_k import select_top_k
+from .tracing import traced
+
+# State of the shard owned by the current worker process.
+_SHARD: dict[str, Any] = {}
+
+
+def _shard_count(texts: list[str]) -> tuple[list[str], np.ndarray]:
+    """Count terms for this shard and return its local vocabulary and DFs."""
+
+    vectorizer = make_vectorizer()
+    try:
+        counts = vectorizer.fit_transform(texts).tocsr()
+    except ValueError:
+        # Only stop words in this slice; other shards may still have terms.
+        _SHARD["counts"] = csr_matrix((len(texts), 0), dtype=np.int64)
+        return [], np.zeros(0, dtype=np.int64)
+
+    vocabulary = vectorizer.vocabulary_
+    _SHARD["counts"] = counts
+    terms = sorted(vocabulary, key=vocabulary.__getitem__)
+    return terms, np.bincount(counts.indices, minlength=len(terms))
+
+
+def _shard_finalize(
+    columns: np.ndarray, idf: np.ndarray, num_terms: int, backend: str
+) -> None:
+    """Map local columns onto the global vocabulary and weight the rows."""
+
+    counts = _SHARD.pop("counts")
+    counts = csr_matrix(
+        (counts.data, columns[counts.indices], counts.indptr),
+        shape=(counts.shape[0], num_terms),
+    )
+    counts.sort_indices()
+    matrix = weight_rows(counts, idf)
+    _SHARD["matrix"] = matrix
+    _SHARD["inverted"] = InvertedIndex(matrix) if backend == "maxscore" else None
+
+
+def _shard_query(
+    query_vecs: csr_matrix, top_k: int
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return this shard's local top-k rows and scores per query."""
+
+    return rank_rows(query_vecs, _SHARD["matrix"], top_k, _SHARD["inverted"])
+
+
+class ShardedEmbeddingIndex:
+    """TF-IDF index spread over ``num_shards`` worker processes.
+
+    Rankings match :class:`~src.embeddings.EmbeddingIndex` over the same
+    documents. The sharded index is built once and does not support
+    incremental updates; call :meth:`close` (or use it as a context manager)
+    to stop the worker processes.
+    """
+
+    query_block_size = 512
+
+    @traced("index.build")
+    def __init__(
+        self,
+        documents: Iterable[Document],
+        num_shards: int | None = None,
+        backend: str = "exhaustive",
+    ) -> None:
+        self.documents = list(documents)
+        if not self.documents:
+            raise ValueError("No documents supplied for indexing")
+        self.backend = check_backend(backend)
+
+        num_shards = min(num_shards or os.cpu_count() or 1, len(self.documents))
+        bounds = np.linspace(0, len(self.documents), num_shards + 1).astype(int)
+        self._offsets = bounds[:-1]
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1) for _ in range(num_shards)
+        ]
+        self._finalizer = weakref.finalize(self, _shutdown_executors, self._executors)
+
+        try:
+            self._build(bounds)
+        except BaseException:
+            self.close()
+            raise
+        self.version = next_version()
+
+    def _build(self, bounds: np.ndarray) -> None:
+        counted = [
+            executor.submit(
+                _shard_count,
+                [doc.content for doc in self.documents[lo:hi]],
+            )
+            for executor, lo, hi in zip(self._executors, bounds[:-1], bounds[1:])
+        ]
+
+        vocabulary: dict[str, int] = {}
+        shard_columns: list[np.ndarray] = []
+        shard_df: list[np.ndarray] = []
+        for future in counted:
+            terms, df = future.result()
+            shard_columns.append(
+                np.fromiter(
+                    (vocabulary.setdefault(term, len(vocabulary)) for term in terms),
+                    dtype=np.int32,
+                    count=len(terms),
+                )
+            )
+            shard_df.append(df)
+        if not vocabulary:
+            raise ValueError(
+                "empty vocabulary; perhaps the documents only contain stop words"
+            )
+
+        df = np.zeros(len(vocabulary), dtype=np.int64)
+        for columns, local_df in zip(shard_columns, shard_df):
+            df[columns] += local_df
+        self.vocabulary = vocabulary
+        self._idf = smoothed_idf(df, len(self.documents))
+        self._analyzer = make_vectorizer().build_analyzer()
+
+        finalized = [
+            executor.submit(
+                _shard_finalize, columns, self._idf, len(vocabulary), self.backend
+            )
+            for executor, columns in zip(self._executors, shard_columns)
+        ]
+        for future in finalized:
+            future.result()
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._executors)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def live_documents(self) -> list[Document]:
+        """Return the indexed documents; sharded indexes are immutable."""
+
+        return self.documents
+
+    def __enter__(self) -> "ShardedEmbeddingIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the shard worker processes."""
+
+        self._finalizer()
+
+    @traced("index.query")
+    def query(self, text: str, top_k: int = 3) -> list[RetrievedContext]:
+        """Return the top ``top_k`` contexts matching the provided text."""
+
+        return self.query_batch([text], top_k)[0]
+
+    @traced("index.query_batch")
+    def query_batch(
+        self, texts: Iterable[str], top_k: int = 3
+    ) -> list[list[RetrievedContext]]:
+        """Scatter a block of queries to every shard and merge their top-k."""
+
+        texts = list(texts)
+        results: list[list[RetrievedContext]] = [[] for _ in texts]
+        pending = [pos for pos, text in enumerate(texts) if text.strip()]
+        if not pending or top_k <= 0:
+            return results
+
+        for start in range(0, len(pending), self.query_block_size):
+            block = pending[start : start + self.query_block_size]
+            query_vecs = vectorize_queries(
+                (texts[pos] for pos in block),
+                self._analyzer,
+                self.vocabulary,
+                self._idf,
+            )
+            futures = [
+                executor.submit(_shard_query, query_vecs, top_k)
+                for executor in self._executors
+            ]
+            per_shard = [future.result() for future in futures]
+            for row, pos in enumerate(block):
+                # Each shard's top-k contains every global winner from that
+                # shard, so merging the shard lists yields the exact top-k.
+                rows, scores = select_top_k(
+                    np.concatenate(
+                        [
+                            shard[row][0] + offset
+                            for shard, offset in zip(per_shard, self._offsets)
+                        ]
+                    ),
+                    np.concatenate([shard[row][1] for shard in per_shard]),
+                    top_k,
+                )
+                results[pos] = [
+                    RetrievedContext(document=self.documents[idx], score=float(score))
+                    for idx, score in zip(rows, scores)
+                ]
+        return results
+
+
+def _shutdown_executors(executors: list[ProcessPoolExecutor]) -> None:
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,101 @@
+"""Precomputed line indexes for picking answer snippets out of documents."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from .document_loader import Document
+
+
+class LineIndex:
+    """Candidate snippet lines of one document with term → line postings.
+
+    Lines are stripped, blank lines dropped, and headings excluded unless a
+    document consists only of headings. Each term maps to the ids of the
+    candidate lines that contain it, so scoring a question is a posting lookup
+    followed by a small ``bincount``/``argmax``.
+    """
+
+    def __init__(self, content: str) -> None:
+        lines = [line.strip() for line in content.splitlines() if line.strip()]
+        # Prefer non-heading lines; fall back to any content if necessary.
+        self.lines = [line for line in lines if not line.startswith("#")] or lines
+
+        postings: dict[str, list[int]] = {}
+        for line_id, line in enumerate(self.lines):
+            for term in set(line.lower().split()):
+                postings.setdefault(term, []).append(line_id)
+        self._postings = {
+            term: np.asarray(line_ids, dtype=np.int32)
+            for term, line_ids in postings.items()
+        }
+
+    def best_line(self, question: str) -> str:
+        """Return the line sharing the most terms with ``question``.
+
+        Ties go to the earliest line, and the first line is returned when no
+        term overlaps at all.
+        """
+
+        if not self.lines:
+            return ""
+        hits = [
+            self._postings[term]
+            for term in set(question.lower().split())
+            if term in self._postings
+        ]
+        if not hits:
+            return self.lines[0]
+        overlap = np.bincount(np.concatenate(hits), minlength=len(self.lines))
+        return self.lines[int(np.argmax(overlap))]
+
+
+class SnippetIndex:
+    """Per-document cache of :class:`LineIndex` objects.
+
+    ``documents`` are indexed up front, and :meth:`sync` re-aligns the cache
+    with a rebuilt retrieval index. Entries are also checked against the
+    document content on every lookup, so edited documents are re-indexed and
+    never served stale line indexes.
+    """
+
+    def __init__(self, documents: Iterable[Document] = ()) -> None:
+        self._indexes: dict[str, tuple[str, LineIndex]] = {}
+        self.sync(documents)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def sync(self, documents: Iterable[Document]) -> None:
+        """Keep exactly the entries for ``documents``, indexing new content.
+
+        Unchanged documents keep their line index; entries for documents no
+        longer present are dropped.
+        """
+
+        previous, self._indexes = self._indexes, {}
+        for document in documents:
+            cached = previous.get(document.doc_id)
+            if cached is not None and cached[0] == document.content:
+                self._indexes[document.doc_id] = cached
+            else:
+                self.line_index(document)
+
+    def line_index(self, document: Document) -> LineIndex:
+        """Return the line index for ``document``, rebuilding it if edited."""
+
+        cached = self._indexes.get(document.doc_id)
+        if cached is not None and (
+            cached[0] is document.content or cached[0] == document.content
+        ):
+            return cached[1]
+        index = LineIndex(document.content)
+        self._indexes[document.doc_id] = (document.content, index)
+        return index
+
+    def best_line(self, document: Document, question: str) -> str:
+        """Select the line of ``document`` that best matches ``question``."""
+
+        return self.line_index(document).best_line(question)
@@ -0,0 +1,22 @@
+"""Top-k selection shared by the exhaustive, sharded and MaxScore paths."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def select_top_k(
+    rows: np.ndarray, scores: np.ndarray, top_k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pick the ``top_k`` positive scores, best first, ties broken by row id."""
+
+    positive = scores > 0
+    rows, scores = rows[positive], scores[positive]
+    if top_k < len(scores):
+        # Partition instead of sorting everything, but keep every score tied
+        # with the k-th best so ties resolve deterministically below.
+        kth = np.argpartition(scores, -top_k)[-top_k]
+        keep = scores >= scores[kth]
+        rows, scores = rows[keep], scores[keep]
+    order = np.lexsort((rows, -scores))[:top_k]
+    return rows[order], scores[order]
@@ -0,0 +1,431 @@
+"""Lightweight tracing spans with pluggable sinks.
+
+Code marks interesting regions with :func:`span` or the :func:`traced`
+decorator. While no sink is installed both return immediately, so the
+instrumentation costs one global lookup per call. Installing a sink enables
+tracing process-wide:
+
+- :class:`HistogramSink` aggregates durations per span name in memory;
+- :class:`JsonlSink` appends one JSON line per finished span to a file;
+- :class:`ProfileSink` captures a cProfile and tracemalloc report for the
+  first occurrence of one named span.
+
+:func:`collect` additionally gathers the spans finished on the current
+thread into a private histogram, which evaluation runners use to attach
+timings to their results.
+
+Example:
+    >>> histogram = configure(histogram=True)
+    >>> with span("demo"):
+    ...     pass
+    >>> histogram.summary()["demo"]["count"]
+    1
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, Protocol, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover - profiling modules load on demand
+    import cProfile
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Installed sinks; replaced as a whole so readers never need a lock.
+_sinks: tuple["Sink", ...] = ()
+_sinks_lock = threading.Lock()
+_local = threading.local()
+
+
+class Span:
+    """One timed region. Created only while tracing is enabled."""
+
+    __slots__ = ("name", "attrs", "parent", "depth", "start", "wall_start", "end")
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.parent: str | None = None
+        self.depth = 0
+        self.start = 0.0
+        self.wall_start = 0.0
+        self.end = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        if stack:
+            self.parent = stack[-1].name
+            self.depth = len(stack)
+        stack.append(self)
+        for sink in _sinks:
+            sink.on_start(self)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.end = time.perf_counter()
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        for sink in _sinks:
+            sink.on_end(self)
+        for collector in getattr(_local, "collectors", ()):
+            collector.on_end(self)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Sink(Protocol):
+    """Receiver of span events."""
+
+    def on_start(self, span: Span) -> None: ...
+
+    def on_end(self, span: Span) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def enabled() -> bool:
+    """Return whether any sink is installed."""
+
+    return bool(_sinks)
+
+
+def span(name: str, **attrs: Any) -> Span | _NoopSpan:
+    """Return a context manager timing the enclosed block as ``name``."""
+
+    if not _sinks:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a function so each call is recorded as span ``name``."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _sinks:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def add_sink(sink: Sink) -> Sink:
+    """Install ``sink``, enabling tracing, and return it."""
+
+    global _sinks
+    with _sinks_lock:
+        _sinks = (*_sinks, sink)
+    return sink
+
+
+def remove_sink(sink: Sink) -> None:
+    """Uninstall and close ``sink``."""
+
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(item for item in _sinks if item is not sink)
+    sink.close()
+
+
+def reset() -> None:
+    """Uninstall and close every sink, disabling tracing."""
+
+    global _sinks
+    with _sinks_lock:
+        sinks, _sinks = _sinks, ()
+    for sink in sinks:
+        sink.close()
+
+
+class HistogramSink:
+    """In-memory duration statistics per span name.
+
+    Durations fall into log-spaced buckets (four per doubling, starting at
+    one microsecond), so memory is constant and percentiles are accurate to
+    within about 19%. Count, total, min and max are exact.
+    """
+
+    buckets_per_octave = 4
+    num_buckets = 160
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, list[float]] = {}
+        self._counts: dict[str, list[int]] = {}
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        self.record(span.name, span.duration)
+
+    def record(self, name: str, seconds: float) -> None:
+        micros = seconds * 1e6
+        bucket = (
+            min(int(math.log2(micros) * self.buckets_per_octave), self.num_buckets - 1)
+            if micros > 1
+            else 0
+        )
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = [0, 0.0, math.inf, 0.0]
+                self._counts[name] = [0] * self.num_buckets
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+            self._counts[name][bucket] += 1
+
+    def _percentile(self, counts: list[int], total: int, q: float) -> float:
+        target = q * total
+        seen = 0
+        for bucket, count in enumerate(counts):
+            seen += count
+            if seen >= target:
+                return 2 ** ((bucket + 1) / self.buckets_per_octave) / 1000
+        return math.nan
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Return count, total and latency statistics (ms) per span name."""
+
+        with self._lock:
+            items = [
+                (name, list(stats), list(self._counts[name]))
+                for name, stats in self._stats.items()
+            ]
+        summary = {}
+        for name, (count, total, low, high), counts in items:
+            count = int(count)
+            summary[name] = {
+                "count": count,
+                "total_s": total,
+                "mean_ms": total * 1000 / count,
+                "min_ms": low * 1000,
+                "max_ms": high * 1000,
+                # Bucket bounds are clamped to the exact extremes.
+                **{
+                    f"p{q}_ms": min(
+                        max(self._percentile(counts, count, q / 100), low * 1000),
+                        high * 1000,
+                    )
+                    for q in (50, 95, 99)
+                },
+            }
+        return summary
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink:
+    """Appends one JSON line per finished span to ``path``."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._fp: IO[str] | None = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        line = json.dumps(
+            {
+                "name": span.name,
+                "ts": span.wall_start,
+                "duration_ms": span.duration * 1000,
+                "parent": span.parent,
+                "depth": span.depth,
+                "thread": threading.current_thread().name,
+                **span.attrs,
+            },
+            default=str,
+        )
+        with self._lock:
+            if self._fp is not None:
+                self._fp.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+
+class ProfileSink:
+    """Profiles the first occurrence of span ``name`` with cProfile and tracemalloc.
+
+    The profile is written to ``<output_dir>/<name>.prof`` (readable with
+    :mod:`pstats` or snakeviz), and with ``memory`` the peak traced memory and
+    the top allocation sites go to ``<output_dir>/<name>.memory.txt``.
+    :attr:`report` describes the capture once it has finished.
+    """
+
+    def __init__(self, name: str, output_dir: Path, memory: bool = True) -> None:
+        self.name = name
+        self.output_dir = output_dir
+        self.memory = memory
+        self.report: dict[str, Any] | None = None
+        self._span: Span | None = None
+        self._profiler: cProfile.Profile | None = None
+        self._started_tracemalloc = False
+
+    def on_start(self, span: Span) -> None:
+        if span.name != self.name or self._span is not None or self.report:
+            return
+        self._span = span
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.memory:
+            tracemalloc.reset_peak()
+        import cProfile
+
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def on_end(self, span: Span) -> None:
+        if span is not self._span or self._profiler is None:
+            return
+        self._profiler.disable()
+        import pstats
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profile_path = self.output_dir / f"{self.name}.prof"
+        pstats.Stats(self._profiler).dump_stats(profile_path)
+        self.report = {"span": self.name, "profile_path": str(profile_path)}
+
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            top = tracemalloc.take_snapshot().statistics("lineno")[:20]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            memory_path = self.output_dir / f"{self.name}.memory.txt"
+            memory_path.write_text(
+                f"peak {peak} bytes\n" + "\n".join(str(stat) for stat in top) + "\n",
+                encoding="utf-8",
+            )
+            self.report.update(peak_bytes=peak, memory_path=str(memory_path))
+        self._profiler = None
+
+    def close(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracemalloc = False
+
+
+class Collector:
+    """Per-thread span histogram opened by :func:`collect`.
+
+    ``saved`` lets the owner note that a result was persisted while
+    collecting, so it can be written again with the final timings.
+    """
+
+    def __init__(self) -> None:
+        self.histogram = HistogramSink()
+        self.saved = False
+
+    def on_end(self, span: Span) -> None:
+        self.histogram.on_end(span)
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        return self.histogram.summary()
+
+
+@contextmanager
+def collect() -> Iterator[Collector]:
+    """Gather spans finished on this thread while the block runs.
+
+    Spans are only produced while tracing is enabled, so the collector stays
+    empty otherwise. Spans on other threads are not included.
+    """
+
+    collector = Collector()
+    collectors = getattr(_local, "collectors", None)
+    if collectors is None:
+        collectors = _local.collectors = []
+    collectors.append(collector)
+    try:
+        yield collector
+    finally:
+        collectors.remove(collector)
+
+
+def current_collector() -> Collector | None:
+    """Return the innermost collector open on this thread, if any."""
+
+    collectors = getattr(_local, "collectors", None)
+    return collectors[-1] if collectors else None
+
+
+def configure(
+    histogram: bool = True,
+    jsonl_path: Path | None = None,
+    profile_span: str | None = None,
+    profile_dir: Path = Path("results/profiles"),
+) -> HistogramSink | None:
+    """Install the requested sinks and return the histogram sink, if any."""
+
+    sink = add_sink(HistogramSink()) if histogram else None
+    if jsonl_path is not None:
+        add_sink(JsonlSink(jsonl_path))
+    if profile_span:
+        add_sink(ProfileSink(profile_span, profile_dir))
+    return sink  # type: ignore[return-value]
+
+
+def configure_from_settings() -> HistogramSink | None:
+    """Enable the sinks selected by the ``TRACE*`` settings, if any."""
+
+    from .config import settings
+
+    if not (settings.trace or settings.trace_jsonl_path or settings.trace_profile_span):
+        return None
+    return configure(
+        histogram=True,
+        jsonl_path=settings.trace_jsonl_path,
+        profile_span=settings.trace_profile_span,
+        profile_dir=settings.trace_profile_dir,
+    )
@@ -0,0 +1,42 @@
+"""Tests for the in-process answer cache."""
+
+from pathlib import Path
+
+from src.answer_cache import AnswerCache
+from src.document_loader import Document
+from src.qa_bot import QABot
+
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+
+
+def test_lru_eviction_and_ttl_expiry():
+    """Entries are evicted least-recently-used first and expire after the TTL."""
+    now = [0.0]
+    cache = AnswerCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert (stats["evictions"], stats["expirations"]) == (1, 1)
+
+
+def test_bot_reuses_answers_until_index_changes(tmp_path):
+    """Normalized repeats hit the cache; index updates invalidate it."""
+    bot = QABot(documents_path=SAMPLE_DOCS, cache_path=tmp_path / "embeddings.idx")
+    first = bot.answer("How do I install the Python requests library?")
+    again = bot.answer("  how do I INSTALL the python requests library? ")
+    assert again.response == first.response
+    assert again.question.startswith("  how")
+    assert bot.answer_cache.stats()["hits"] == 1
+
+    bot.answer_batch(["How do I install the Python requests library?"] * 3)
+    assert bot.answer_cache.stats()["hits"] == 4
+
+    bot.index.add_documents([Document("extra", "Extra", "install requests via pip")])
+    bot.answer("How do I install the Python requests library?")
+    assert bot.answer_cache.stats()["misses"] == 2
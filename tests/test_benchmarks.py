@@ -0,0 +1,67 @@
+"""Tests for the benchmark corpus generator, runner and comparison."""
+
+from benchmarks.compare import compare_baselines
+from benchmarks.corpus import generate_corpus, iter_qa_items
+from benchmarks.run import run_suite
+from src.document_loader import DocumentLoader
+
+
+def test_corpus_is_reproducible_and_labelled(tmp_path):
+    """The synthetic corpus is seeded and its queries are labelled."""
+    first = generate_corpus(tmp_path / "a", 30, seed=7)
+    second = generate_corpus(tmp_path / "b", 30, seed=7)
+
+    documents = DocumentLoader(first.root).load()
+    assert [doc.doc_id for doc in documents] == first.doc_ids
+    assert [doc.content for doc in documents] == [
+        doc.content for doc in DocumentLoader(second.root).load()
+    ]
+
+    rows = list(iter_qa_items(first, 50, seed=7))
+    assert rows == list(iter_qa_items(second, 50, seed=7))
+    contents = {doc.doc_id: doc.content for doc in documents}
+    for row in rows:
+        assert (
+            row["reference"].split(", run ")[1].rstrip(".") in contents[row["doc_id"]]
+        )
+
+
+def test_suite_records_every_case():
+    """The suite records a row for every case and size."""
+    baseline = run_suite([20], [10], runners=["deepeval"], num_queries=5)
+
+    cases = {(row["case"], row["size"]) for row in baseline["results"]}
+    assert cases == {
+        ("load", 20),
+        ("index_build", 20),
+        ("query", 20),
+        ("query_batch", 20),
+        ("answer", 20),
+        ("evaluate:deepeval", 10),
+    }
+    query = next(row for row in baseline["results"] if row["case"] == "query")
+    assert query["p50_ms"] <= query["p99_ms"]
+    assert baseline["environment"]["seed"] == 0
+
+
+def test_compare_flags_regressions_above_noise():
+    """Only changes beyond the noise thresholds are flagged."""
+    old = {
+        "results": [
+            {"case": "index_build", "size": 100, "seconds": 1.0, "peak_mb": 10.0},
+            {"case": "load", "size": 100, "seconds": 0.001},
+        ]
+    }
+    new = {
+        "results": [
+            {"case": "index_build", "size": 100, "seconds": 1.05, "peak_mb": 20.0},
+            {"case": "load", "size": 100, "seconds": 0.003},
+        ]
+    }
+
+    flagged = {
+        (item.case, item.metric)
+        for item in compare_baselines(old, new)
+        if item.regression
+    }
+    assert flagged == {("index_build", "peak_mb")}
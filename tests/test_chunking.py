@@ -0,0 +1,55 @@
+"""Tests for heading-aware passage chunking."""
+
+from pathlib import Path
+
+from src.chunking import chunk_document
+from src.document_loader import Document
+from src.qa_bot import QABot
+
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+
+
+def test_passages_follow_headings_and_byte_offsets():
+    """Passages keep their heading path and map back to the parent bytes."""
+    content = (
+        "# Guide\nIntro line.\n\n## Install\nRun `pip install café`.\n"
+        "```python\n# not a heading\n```\n### Extras\nOptional bits.\n"
+    )
+    document = Document("guide", "Guide", content)
+    passages = chunk_document(document)
+
+    assert [p.heading_path for p in passages] == [
+        ("Guide",),
+        ("Guide", "Install"),
+        ("Guide", "Install", "Extras"),
+    ]
+    raw = content.encode("utf-8")
+    for passage in passages:
+        assert passage.parent_id == "guide"
+        assert raw[passage.start : passage.end].decode("utf-8") == passage.content
+    assert "# not a heading" in passages[1].content
+
+
+def test_oversized_sections_are_windowed_with_overlap():
+    """Long sections are split under the size cap with overlapping lines."""
+    lines = [f"line number {i:03d}\n" for i in range(40)]
+    document = Document("long", "Long", "# Long\n" + "".join(lines))
+    passages = chunk_document(document, max_bytes=120, overlap_bytes=40)
+
+    assert len(passages) > 1
+    assert all(p.end - p.start <= 120 for p in passages)
+    for previous, current in zip(passages, passages[1:]):
+        assert current.start < previous.end
+        assert current.start > previous.start
+
+
+def test_bot_answers_from_passages(tmp_path):
+    """The bot still finds the installation command when indexing passages."""
+    bot = QABot(
+        documents_path=SAMPLE_DOCS,
+        chunk_passages=True,
+        cache_path=tmp_path / "embeddings.idx",
+    )
+    answer = bot.answer("How do I install the Python requests library?")
+    assert "pip install requests" in answer.response.lower()
+    assert answer.context[0].document.parent_id == "python_requests"
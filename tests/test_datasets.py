@@ -0,0 +1,96 @@
+"""Tests for the streaming dataset readers."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from evaluations import datasets
+from evaluations.datasets import (
+    ReferenceIndex,
+    build_offset_index,
+    iter_json_array,
+    iter_jsonl,
+    load_offset_index,
+    shard_bounds,
+)
+from evaluations.utils import load_dataset_from_files
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+@pytest.fixture
+def tiny_reads(monkeypatch):
+    """Force chunk boundaries inside strings, numbers and multibyte text."""
+    monkeypatch.setattr(datasets, "_READ_SIZE", 5)
+
+
+def test_json_array_streams_across_chunk_boundaries(tmp_path, tiny_reads):
+    """JSON arrays stream correctly when reads split tokens."""
+    rows = [
+        {"id": f"q{i}", "question": "café ☕ " * i, "n": 12345 * i} for i in range(20)
+    ]
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps(rows, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    assert list(iter_json_array(path)) == rows
+
+
+def test_reference_index_reads_values_by_offset(tmp_path, tiny_reads):
+    """References are read lazily by byte offset from JSON and JSONL."""
+    truth = {f"q{i}": f"réponse {i} ✓" for i in range(30)}
+    json_path = tmp_path / "truth.json"
+    json_path.write_text(json.dumps(truth, ensure_ascii=False), encoding="utf-8")
+    jsonl_path = tmp_path / "truth.jsonl"
+    jsonl_path.write_text(
+        "".join(
+            json.dumps({"id": key, "reference_answer": value}, ensure_ascii=False)
+            + "\n"
+            for key, value in truth.items()
+        ),
+        encoding="utf-8",
+    )
+
+    for path in (json_path, jsonl_path):
+        index = ReferenceIndex(path)
+        assert len(index) == 30
+        assert index.get("q17") == truth["q17"]
+        assert index.get("missing") == ""
+        index.close()
+
+
+def test_offset_index_slices_jsonl_for_shards(tmp_path):
+    """Shard bounds split a JSONL file into disjoint, complete slices."""
+    path = tmp_path / "rows.jsonl"
+    path.write_text(
+        "".join(json.dumps({"id": i}) + "\n" for i in range(10)), encoding="utf-8"
+    )
+
+    slices = [
+        [row["id"] for row in iter_jsonl(path, *shard_bounds(path, shard, 3))]
+        for shard in range(3)
+    ]
+    assert sum(slices, []) == list(range(10))
+    assert load_offset_index(path) is not None
+
+    with path.open("a", encoding="utf-8") as fp:
+        fp.write(json.dumps({"id": 10}) + "\n")
+    assert load_offset_index(path) is None
+    assert len(build_offset_index(path)) == 11
+
+
+def test_load_dataset_joins_references_and_reads_yaml():
+    """Rows are joined with references by id; YAML cases load too."""
+    rows = list(
+        load_dataset_from_files(
+            DATA / "test_questions.json",
+            DATA / "ground_truth.json",
+            predictions={"q1": "pip install requests"},
+        )
+    )
+    assert rows[0].prediction == "pip install requests"
+    assert rows[0].reference.startswith("Install the requests library")
+    assert rows[0].doc_id == "python_requests"
+
+    cases = list(load_dataset_from_files(DATA / "test_cases.yaml"))
+    assert [case.reference for case in cases][0] == "Use pip install requests."
@@ -0,0 +1,54 @@
+"""Tests for recursive, parallel and streaming document loading."""
+
+from src.document_loader import DocumentLoader
+
+
+def _make_tree(root):
+    (root / "guides" / "advanced").mkdir(parents=True)
+    (root / ".hidden").mkdir()
+    (root / "intro.md").write_text("# Intro\nWelcome.", encoding="utf-8")
+    (root / "guides" / "install_steps.md").write_text("pip install", encoding="utf-8")
+    (root / "guides" / "advanced" / "tuning.md").write_bytes(b"line\r\nnext")
+    (root / ".hidden" / "secret.md").write_text("skip me", encoding="utf-8")
+    (root / "notes.txt").write_text("not markdown", encoding="utf-8")
+
+
+def test_recursive_discovery_and_parallel_load(tmp_path):
+    """Nested files are found, hidden ones skipped, and ids are relative paths."""
+    _make_tree(tmp_path)
+    documents = DocumentLoader(tmp_path, max_workers=4).load()
+    assert [doc.doc_id for doc in documents] == [
+        "guides/advanced/tuning",
+        "guides/install_steps",
+        "intro",
+    ]
+    assert documents[1].title == "Install Steps"
+    assert [doc.doc_id for doc in DocumentLoader(tmp_path, recursive=False).load()] == [
+        "intro"
+    ]
+
+
+def test_load_iter_streams_lazily(tmp_path, monkeypatch):
+    """Only the documents consumed so far have been read."""
+    _make_tree(tmp_path)
+    loader = DocumentLoader(tmp_path)
+    reads = []
+    original = DocumentLoader._read
+    monkeypatch.setattr(
+        DocumentLoader,
+        "_read",
+        lambda self, path: reads.append(path) or original(self, path),
+    )
+    stream = loader.load_iter()
+    first = next(stream)
+    assert first.doc_id == "guides/advanced/tuning"
+    assert len(reads) == 1
+
+
+def test_mmap_reads_match_buffered_reads(tmp_path):
+    """Files read through mmap decode the same as regular text reads."""
+    _make_tree(tmp_path)
+    buffered = DocumentLoader(tmp_path).load()
+    mapped = DocumentLoader(tmp_path, mmap_threshold=1).load()
+    assert [doc.content for doc in mapped] == [doc.content for doc in buffered]
+    assert mapped[0].content == "line\nnext"
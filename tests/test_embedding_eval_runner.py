@@ -0,0 +1,80 @@
+"""Tests for batched, cached embedding evaluation."""
+
+import numpy as np
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.embedding_eval_runner import EmbeddingEvalRunner
+
+
+class _StubModel:
+    """Bag-of-letters encoder that records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **_kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encoded.extend(batch)
+        vectors = np.zeros((len(batch), 26), dtype=np.float32)
+        for row, text in enumerate(batch):
+            for char in text.lower():
+                if char.isalpha():
+                    vectors[row, ord(char) - ord("a")] += 1
+        return vectors[0] if single else vectors
+
+
+def test_unique_texts_encoded_once_and_cached_across_runs(tmp_path):
+    """Duplicates share one encoding and a second run reuses the disk store."""
+    dataset = [
+        EvaluationInput("q1", "use pip install", "use pip install"),
+        EvaluationInput("q2", "def keyword", "use pip install"),
+        EvaluationInput("q3", "", "def keyword"),
+    ]
+    cache_path = tmp_path / "embeddings.sqlite3"
+    model = _StubModel()
+    runner = EmbeddingEvalRunner(
+        output_dir=tmp_path, model=model, cache_path=cache_path, model_name="letters"
+    )
+    result = runner.evaluate(dataset)
+
+    assert sorted(model.encoded) == ["", "def keyword", "use pip install"]
+    per_item = result.details["per_item"]
+    assert np.isclose(per_item[0], 1.0)
+    assert per_item[2] == 0.0
+    assert np.isclose(result.score, sum(per_item) / 3)
+
+    fresh_model = _StubModel()
+    rerun = EmbeddingEvalRunner(
+        output_dir=tmp_path,
+        model=fresh_model,
+        cache_path=cache_path,
+        model_name="letters",
+    ).evaluate(dataset)
+    assert fresh_model.encoded == []
+    assert rerun.details["cache"]["hits"] == 3
+    assert np.allclose(rerun.details["per_item"], per_item)
+
+
+def test_store_is_keyed_by_model_and_can_be_disabled(tmp_path):
+    """Vectors of one encoder are never served for another."""
+    dataset = [EvaluationInput("q1", "use pip install", "use pip install")]
+    cache_path = tmp_path / "embeddings.sqlite3"
+    EmbeddingEvalRunner(
+        output_dir=tmp_path, model=_StubModel(), cache_path=cache_path, model_name="a"
+    ).evaluate(dataset)
+
+    other = _StubModel()
+    result = EmbeddingEvalRunner(
+        output_dir=tmp_path, model=other, cache_path=cache_path, model_name="b"
+    ).evaluate(dataset)
+    assert other.encoded == ["use pip install"]
+    assert result.details["embedding_model"] == "b"
+
+    unnamed = EmbeddingEvalRunner(
+        output_dir=tmp_path, model=_StubModel(), cache_path=cache_path
+    )
+    disabled = EmbeddingEvalRunner(
+        output_dir=tmp_path, model=_StubModel(), cache_path=None, model_name="a"
+    )
+    assert unnamed._store is None and disabled._store is None
@@ -0,0 +1,174 @@
+"""Tests for the TF-IDF `EmbeddingIndex` and its on-disk cache."""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.document_loader import Document, DocumentLoader
+from src.embeddings import EmbeddingIndex
+from src import index_cache
+from src.index_cache import IndexCacheError
+
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+
+
+def _is_memory_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_cached_index_round_trip_uses_memmap(tmp_path):
+    """A saved index loads back memory-mapped with identical rankings."""
+    documents = DocumentLoader(SAMPLE_DOCS).load()
+    cache_path = tmp_path / "embeddings.idx"
+    built = EmbeddingIndex.load_or_build(documents, cache_path)
+    assert cache_path.exists()
+
+    loaded = EmbeddingIndex.load(cache_path, documents)
+    for array in (loaded.matrix.data, loaded.matrix.indices, loaded.matrix.indptr):
+        assert _is_memory_mapped(array)
+
+    question = "How do I install the requests library?"
+    expected = [(c.document.doc_id, c.score) for c in built.query(question)]
+    actual = [(c.document.doc_id, c.score) for c in loaded.query(question)]
+    assert [doc for doc, _ in actual] == [doc for doc, _ in expected]
+    assert np.allclose([s for _, s in actual], [s for _, s in expected])
+
+
+def test_cache_file_gets_default_permissions(tmp_path):
+    """The cache is created like a plain file, not with mkstemp's 0600."""
+    cache_path = tmp_path / "embeddings.idx"
+    EmbeddingIndex.load_or_build(DocumentLoader(SAMPLE_DOCS).load(), cache_path)
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert cache_path.stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_cache_is_rebuilt_when_documents_change(tmp_path):
+    """Editing a document invalidates the cache fingerprint."""
+    cache_path = tmp_path / "embeddings.idx"
+    documents = [Document("a", "A", "alpha beta"), Document("b", "B", "gamma")]
+    EmbeddingIndex.load_or_build(documents, cache_path)
+
+    edited = [Document("a", "A", "alpha delta"), Document("b", "B", "gamma")]
+    with pytest.raises(IndexCacheError):
+        EmbeddingIndex.load(cache_path, edited)
+
+    rebuilt = EmbeddingIndex.load_or_build(edited, cache_path)
+    assert rebuilt.query("delta")[0].document.doc_id == "a"
+    assert EmbeddingIndex.load(cache_path, edited).query("delta")
+
+
+@pytest.mark.parametrize(
+    "mangle",
+    [
+        lambda header: header.pop("sections"),
+        lambda header: header.pop("num_terms"),
+        lambda header: header.pop("fingerprint"),
+        lambda header: header.update(num_terms="many"),
+        lambda header: header["sections"].pop("idf"),
+        lambda header: header["sections"]["data"].update(shape=None),
+    ],
+)
+def test_mangled_header_triggers_a_rebuild(tmp_path, mangle):
+    """Headers with missing or mistyped fields are treated as a corrupt cache."""
+    documents = DocumentLoader(SAMPLE_DOCS).load()
+    cache_path = tmp_path / "embeddings.idx"
+    EmbeddingIndex.load_or_build(documents, cache_path)
+
+    raw = cache_path.read_bytes()
+    magic, version, header_len = index_cache._PREAMBLE.unpack_from(raw)
+    start = index_cache._PREAMBLE.size
+    header = json.loads(raw[start : start + header_len])
+    mangle(header)
+    blob = json.dumps(header).encode("utf-8")
+    cache_path.write_bytes(index_cache._PREAMBLE.pack(magic, version, len(blob)) + blob)
+
+    with pytest.raises(IndexCacheError):
+        EmbeddingIndex.load(cache_path, documents)
+    rebuilt = EmbeddingIndex.load_or_build(documents, cache_path)
+    assert rebuilt.query("install requests")
+    assert EmbeddingIndex.load(cache_path, documents)
+
+
+def _ranking(index, question):
+    return [(c.document.doc_id, round(c.score, 9)) for c in index.query(question, 5)]
+
+
+def test_incremental_updates_match_full_refit():
+    """Adding, updating and removing documents matches rebuilding from scratch."""
+    documents = [
+        Document("a", "A", "install the requests package with pip"),
+        Document("b", "B", "define functions with the def keyword"),
+        Document("c", "C", "the api allows 120 requests per minute"),
+    ]
+    index = EmbeddingIndex(documents)
+    index.add_documents([Document("d", "D", "pip caches downloaded wheels")])
+    index.update_document(Document("b", "B", "lambda builds anonymous functions"))
+    index.remove_document("c")
+
+    expected = EmbeddingIndex(
+        [
+            Document("a", "A", "install the requests package with pip"),
+            Document("d", "D", "pip caches downloaded wheels"),
+            Document("b", "B", "lambda builds anonymous functions"),
+        ]
+    )
+    assert len(index) == 3
+    for question in ("pip requests", "anonymous functions", "minute api"):
+        assert _ranking(index, question) == _ranking(expected, question)
+
+    with pytest.raises(KeyError):
+        index.remove_document("c")
+    with pytest.raises(ValueError):
+        index.add_documents([Document("a", "A", "duplicate")])
+
+
+def test_query_batch_matches_single_queries():
+    """Batched retrieval returns the same contexts as one query at a time."""
+    index = EmbeddingIndex(DocumentLoader(SAMPLE_DOCS).load())
+    questions = [
+        "How do I install the requests library?",
+        "",
+        "What is the rate limit for the demo API?",
+        "define a python function",
+    ]
+    batched = index.query_batch(questions, top_k=2)
+    assert batched[1] == []
+    for question, contexts in zip(questions, batched):
+        assert _ranking_of(contexts) == _ranking_of(index.query(question, 2))
+
+
+def _ranking_of(contexts):
+    return [(c.document.doc_id, round(c.score, 9)) for c in contexts]
+
+
+def test_maxscore_backend_matches_exhaustive_ranking():
+    """MaxScore pruning returns exactly the exhaustive top-k."""
+    rng = np.random.default_rng(7)
+    vocabulary = [f"term{i}" for i in range(60)]
+    documents = [
+        Document(f"d{i}", f"D{i}", " ".join(rng.choice(vocabulary, size=25)))
+        for i in range(300)
+    ]
+    exhaustive = EmbeddingIndex(documents)
+    maxscore = EmbeddingIndex(documents, backend="maxscore")
+    questions = [" ".join(rng.choice(vocabulary, size=4)) for _ in range(40)]
+    for top_k in (1, 3, 10):
+        expected = exhaustive.query_batch(questions, top_k)
+        actual = maxscore.query_batch(questions, top_k)
+        for want, got in zip(expected, actual):
+            assert [c.document.doc_id for c in got] == [c.document.doc_id for c in want]
+            assert np.allclose([c.score for c in got], [c.score for c in want])
+
+    maxscore.remove_document("d0")
+    assert all(c.document.doc_id != "d0" for c in maxscore.query(questions[0], 300))
+    with pytest.raises(ValueError):
+        EmbeddingIndex(documents, backend="bogus")
@@ -0,0 +1,107 @@
+"""Tests for per-item JSONL results with checkpoint/resume."""
+
+import json
+
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.item_log import ItemLog, iter_items
+from evaluations.ragas_runner import RagasRunner
+
+
+def _rows(count):
+    words = ["use", "pip", "install", "requests", "def", "keyword"]
+    return [
+        EvaluationInput(f"q{row}", " ".join(words[: 1 + row % 6]), "use pip install")
+        for row in range(count)
+    ]
+
+
+class _CrashingRunner(RagasRunner):
+    """Fails on the chunk containing ``crash_at`` and counts scored rows."""
+
+    def __init__(self, crash_at=None, **kwargs):
+        super().__init__(**kwargs)
+        self.crash_at = crash_at
+        self.scored = 0
+
+    def score_chunk(self, records):
+        if self.crash_at is not None and self.scored + len(records) > self.crash_at:
+            raise RuntimeError("simulated crash")
+        self.scored += len(records)
+        return super().score_chunk(records)
+
+
+def test_items_are_written_and_aggregated_from_file(tmp_path):
+    """Per-item results go to disk and the score is aggregated from there."""
+    runner = RagasRunner(output_dir=tmp_path)
+
+    result = runner.evaluate_to_file(_rows(250), chunk_size=100)
+
+    items = list(iter_items(tmp_path / "ragas_items.jsonl"))
+    assert [item["row"] for item in items] == list(range(250))
+    assert result.details["num_samples"] == 250
+    assert result.score == pytest.approx(runner.evaluate(_rows(250)).score)
+
+
+def test_resume_skips_checkpointed_rows(tmp_path):
+    """Resuming skips committed rows and drops bytes past the checkpoint."""
+    items_path = tmp_path / "items.jsonl"
+    crashing = _CrashingRunner(crash_at=250, output_dir=tmp_path)
+    with pytest.raises(RuntimeError):
+        crashing.evaluate_to_file(_rows(300), items_path=items_path, chunk_size=100)
+    # Bytes written after the last checkpoint must be discarded on resume.
+    with items_path.open("a", encoding="utf-8") as fp:
+        fp.write('{"row": 999, "torn')
+
+    resumed = _CrashingRunner(output_dir=tmp_path)
+    result = resumed.evaluate_to_file(
+        _rows(300), items_path=items_path, resume=True, chunk_size=100
+    )
+
+    assert resumed.scored == 100
+    assert result.details["resumed_rows"] == 200
+    rows = [item["row"] for item in iter_items(items_path)]
+    assert rows == list(range(300))
+    expected = RagasRunner(output_dir=tmp_path).evaluate(_rows(300)).score
+    assert result.score == pytest.approx(expected)
+    checkpoint = json.loads((tmp_path / "items.jsonl.checkpoint").read_text())
+    assert checkpoint["complete"] and checkpoint["rows"] == 300
+
+
+def test_resume_rejects_a_different_dataset(tmp_path):
+    """Resuming against a changed dataset raises ValueError."""
+    runner = RagasRunner(output_dir=tmp_path)
+    runner.evaluate_to_file(_rows(50), chunk_size=20)
+
+    changed = [EvaluationInput("other", "a", "b")] + _rows(50)[1:]
+    with pytest.raises(ValueError):
+        runner.evaluate_to_file(changed, chunk_size=20, resume=True)
+
+
+def test_fresh_run_discards_old_checkpoint(tmp_path):
+    """A crash before the first commit cannot leave a stale checkpoint."""
+    items_path = tmp_path / "items.jsonl"
+    RagasRunner(output_dir=tmp_path).evaluate_to_file(
+        _rows(50), items_path=items_path, chunk_size=20
+    )
+
+    ItemLog(items_path).close()
+
+    assert not (tmp_path / "items.jsonl.checkpoint").exists()
+    log = ItemLog(items_path, resume=True)
+    log.close()
+    assert log.resumed_rows == 0
+
+
+def test_resume_rejects_checkpoint_beyond_file_size(tmp_path):
+    """A checkpoint past the end of a truncated file is rejected."""
+    items_path = tmp_path / "items.jsonl"
+    RagasRunner(output_dir=tmp_path).evaluate_to_file(
+        _rows(50), items_path=items_path, chunk_size=20
+    )
+    items_path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="rerun without resume"):
+        ItemLog(items_path, resume=True)
+    assert items_path.read_bytes() == b""
@@ -0,0 +1,320 @@
+"""Tests for concurrent LangChain judging against a stub chat model."""
+
+import threading
+import time
+
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.concurrency import TokenBucket, call_with_retries, is_transient
+from evaluations.item_log import iter_items
+from evaluations.langchain_eval_runner import (
+    LangChainEvalRunner,
+    parse_packed_verdicts,
+)
+
+
+class _StubChain:
+    """QAEvalChain stand-in that grades by exact match and can misbehave."""
+
+    failures: dict[str, int] = {}
+    calls: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    @classmethod
+    def from_llm(cls, llm):
+        return cls(llm)
+
+    def evaluate_strings(self, *, prediction, reference, input):
+        with self.lock:
+            self.calls[input] = self.calls.get(input, 0) + 1
+            remaining = self.failures.get(input, 0)
+            if remaining:
+                self.failures[input] = remaining - 1
+        # Later items finish first so ordering relies on the runner.
+        time.sleep(0.01 * (5 - int(input[1:]) % 5))
+        if remaining:
+            raise ConnectionError(f"judge unavailable for {input}")
+        return {"score": int(prediction == reference), "question": input}
+
+
+@pytest.fixture
+def stub_chain():
+    _StubChain.failures = {}
+    _StubChain.calls = {}
+    return _StubChain
+
+
+def _runner(tmp_path, stub_chain, **kwargs):
+    kwargs.setdefault("cache_path", tmp_path / "judge_cache.sqlite3")
+    runner = LangChainEvalRunner(
+        output_dir=tmp_path,
+        llm_builder=lambda: "stub-llm",
+        qa_eval_chain_cls=stub_chain,
+        **kwargs,
+    )
+    runner.retry_base_delay = 0
+    return runner
+
+
+def _dataset(n):
+    return [
+        EvaluationInput(f"q{i}", "yes" if i % 2 == 0 else "no", "yes") for i in range(n)
+    ]
+
+
+def test_results_keep_input_order(tmp_path, stub_chain):
+    """Concurrent grading returns verdicts in input order."""
+    result = _runner(tmp_path, stub_chain, max_concurrency=4).evaluate(_dataset(10))
+
+    raw = result.details["raw"]
+    assert [item["question"] for item in raw] == [f"q{i}" for i in range(10)]
+    assert result.score == 0.5
+    assert result.details["provider"] == "custom"
+    assert result.details["num_failed"] == 0
+
+
+def test_flaky_item_is_retried(tmp_path, stub_chain):
+    """A transient judge error is retried until the item succeeds."""
+    stub_chain.failures = {"q1": 2}
+    result = _runner(tmp_path, stub_chain, max_retries=3).evaluate(_dataset(4))
+
+    assert stub_chain.calls["q1"] == 3
+    assert result.details["num_failed"] == 0
+    assert result.details["raw"][1]["question"] == "q1"
+
+
+def test_failed_item_does_not_sink_run(tmp_path, stub_chain):
+    """An item that exhausts its retries is recorded as failed."""
+    stub_chain.failures = {"q0": 100}
+    result = _runner(tmp_path, stub_chain, max_retries=1).evaluate(_dataset(3))
+
+    assert stub_chain.calls["q0"] == 2
+    assert result.details["num_failed"] == 1
+    assert result.details["raw"][0]["error"].startswith("ConnectionError")
+    # Only q1 ("no") and q2 ("yes") were graded.
+    assert result.score == 0.5
+
+
+def test_cached_verdicts_skip_the_judge(tmp_path, stub_chain):
+    """Repeated items are graded from the verdict cache."""
+    dataset = _dataset(4) + [EvaluationInput("q0", "yes", "yes")]
+    first = _runner(tmp_path, stub_chain).evaluate(dataset)
+
+    assert first.details["judge_calls"] == 4
+    assert first.details["cache"]["hits"] == 0
+
+    stub_chain.calls = {}
+    changed = dataset[:3] + [EvaluationInput("q3", "yes", "yes")]
+    second = _runner(tmp_path, stub_chain).evaluate(changed)
+
+    assert stub_chain.calls == {"q3": 1}
+    assert second.details["cache"]["hits"] == 3
+    assert second.details["cache"]["hit_rate"] == 0.75
+    assert second.score == 0.75
+
+    other_model = _runner(tmp_path, stub_chain, model_name="other").evaluate(changed)
+    assert other_model.details["cache"]["hits"] == 0
+
+
+class _PackingLLM:
+    """Chat model stub that grades packed prompts and can drop item lines."""
+
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        lines = []
+        for block in prompt.split("Item ")[1:]:
+            number = block.split("\n", 1)[0]
+            fields = dict(
+                line.split(": ", 1) for line in block.splitlines()[1:] if ": " in line
+            )
+            if fields["QUESTION"] in self.skip:
+                continue
+            same = fields["STUDENT ANSWER"] == fields["TRUE ANSWER"]
+            lines.append(f"{number}: {'CORRECT' if same else 'INCORRECT'}")
+        return "\n".join(lines)
+
+
+def test_packed_grading_falls_back_for_unparsed_items(tmp_path, stub_chain):
+    """Items missing from a packed reply are graded one by one."""
+    llm = _PackingLLM(skip={"q4"})
+    runner = LangChainEvalRunner(
+        output_dir=tmp_path,
+        llm_builder=lambda: llm,
+        qa_eval_chain_cls=stub_chain,
+        cache_path=tmp_path / "judge_cache.sqlite3",
+        pack_size=4,
+    )
+    result = runner.evaluate(_dataset(10))
+
+    assert len(llm.prompts) == 3
+    assert stub_chain.calls == {"q4": 1}
+    assert result.details["judge_calls"] == 4
+    assert result.details["packed_verdicts"] == 9
+    assert result.score == 0.5
+    assert [item["score"] for item in result.details["raw"]] == [1, 0] * 5
+
+    # The fallback verdict is cached under the single-item template only.
+    fallback = _dataset(10)[4]
+    cached = runner._cache.get_many(
+        [
+            runner._judge_key(fallback, runner.prompt_template_version),
+            runner._judge_key(fallback, runner.packed_template_version),
+        ]
+    )
+    assert list(cached) == [runner._judge_key(fallback, runner.prompt_template_version)]
+
+    rerun = runner.evaluate(_dataset(10))
+    assert len(llm.prompts) == 3
+    assert rerun.details["cache"]["hits"] == 10
+
+
+def test_parse_packed_verdicts():
+    """Numbered verdicts parse leniently; duplicates and strays are ignored."""
+    reply = "1: CORRECT\n2. **incorrect**\nItem 3 - CORRECT\n3: INCORRECT\n9: CORRECT"
+
+    verdicts = parse_packed_verdicts(reply, 4)
+
+    assert [v and v["score"] for v in verdicts] == [1, 0, None, None]
+
+
+def test_token_bucket_waits_for_refill():
+    """The rate limiter sleeps until enough tokens have refilled."""
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+
+    assert slept == [0.5, 0.5]
+    assert now[0] == 1.0
+
+
+def test_item_file_keeps_verdicts_out_of_memory(tmp_path, stub_chain):
+    """Verdicts stream to the item file, failures included."""
+    stub_chain.failures = {"q2": 100}
+    runner = _runner(tmp_path, stub_chain, max_retries=0)
+
+    result = runner.evaluate_to_file(_dataset(6), chunk_size=4)
+
+    items = list(iter_items(tmp_path / "langchain_items.jsonl"))
+    assert [item["details"].get("question") for item in items] == [
+        "q0",
+        "q1",
+        None,
+        "q3",
+        "q4",
+        "q5",
+    ]
+    assert items[2]["metrics"]["score"] is None
+    assert "raw" not in result.details
+    assert result.details["metrics"]["score"]["missing"] == 1
+    assert result.score == pytest.approx(2 / 5)
+
+
+def test_cache_path_none_disables_the_cache(tmp_path, stub_chain):
+    """``cache_path=None`` turns the verdict cache off."""
+    runner = _runner(tmp_path, stub_chain, cache_path=None)
+
+    result = runner.evaluate(_dataset(2))
+    runner.evaluate(_dataset(2))
+
+    assert runner._cache is None
+    assert result.details["cache"]["hits"] == 0
+    assert stub_chain.calls == {"q0": 2, "q1": 2}
+
+
+def test_half_installed_langchain_reports_an_error(tmp_path, monkeypatch):
+    """A missing QAEvalChain yields an error result instead of raising."""
+    monkeypatch.setattr(
+        "evaluations.langchain_eval_runner._module_available", lambda _name: True
+    )
+    monkeypatch.setattr(
+        "evaluations.langchain_eval_runner._load_optional_class",
+        lambda _module, _name: None,
+    )
+    runner = LangChainEvalRunner(
+        output_dir=tmp_path, llm_builder=lambda: "stub-llm", cache_path=None
+    )
+
+    result = runner.evaluate(_dataset(2))
+
+    assert result.score is None
+    assert "QA evaluator is unavailable" in result.details["error"]
+
+
+def test_llm_build_failure_reports_an_error(tmp_path, stub_chain):
+    """Errors raised while building the judge model do not escape evaluate."""
+
+    def broken_llm():
+        raise ValueError("bad model settings")
+
+    runner = LangChainEvalRunner(
+        output_dir=tmp_path,
+        llm_builder=broken_llm,
+        qa_eval_chain_cls=stub_chain,
+        cache_path=None,
+    )
+
+    result = runner.evaluate(_dataset(2))
+
+    assert result.score is None
+    assert result.details["error"] == "bad model settings"
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_only_transient_errors_are_retried():
+    """Timeouts and 429/5xx are retried; other errors fail on the first try."""
+    assert is_transient(TimeoutError()) and is_transient(ConnectionError())
+    assert is_transient(_HTTPError(429)) and is_transient(_HTTPError(503))
+    assert not is_transient(_HTTPError(401)) and not is_transient(ValueError())
+
+    calls = []
+
+    def fail(error):
+        def call():
+            calls.append(error)
+            raise error
+
+        return call
+
+    with pytest.raises(_HTTPError):
+        call_with_retries(fail(_HTTPError(400)), max_retries=3, sleep=lambda _: None)
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(_HTTPError):
+        call_with_retries(fail(_HTTPError(500)), max_retries=3, sleep=lambda _: None)
+    assert len(calls) == 4
+
+
+def test_permanent_judge_error_is_not_retried(tmp_path, stub_chain):
+    """A misconfigured judge fails each item once instead of backing off."""
+
+    class _BadRequestChain(stub_chain):
+        def evaluate_strings(self, *, prediction, reference, input):
+            with self.lock:
+                self.calls[input] = self.calls.get(input, 0) + 1
+            raise ValueError("invalid api key")
+
+    result = _runner(tmp_path, _BadRequestChain, max_retries=3).evaluate(_dataset(2))
+
+    assert stub_chain.calls == {"q0": 1, "q1": 1}
+    assert result.details["num_failed"] == 2
@@ -0,0 +1,115 @@
+"""Tests for the vectorized lexical metrics and the runners built on them."""
+
+import random
+
+import numpy as np
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.deepeval_runner import DeepEvalRunner
+from evaluations.lexical_metrics import (
+    METRICS,
+    compute_lexical_scores,
+    score_inputs,
+    tokenize,
+)
+from evaluations.ragas_runner import RagasRunner
+
+
+def _lcs(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(
+                previous[j] + 1 if x == y else max(previous[j + 1], current[j])
+            )
+        previous = current
+    return previous[-1]
+
+
+def _reference_scores(prediction, reference):
+    pred, ref = tokenize(prediction), tokenize(reference)
+    pred_set, ref_set = set(pred), set(ref)
+    overlap = len(pred_set & ref_set)
+    union = len(pred_set | ref_set)
+    precision = overlap / len(pred_set) if pred_set else 0.0
+    recall = overlap / len(ref_set) if ref_set else 0.0
+    lcs = _lcs(pred, ref)
+    lcs_p = lcs / len(pred) if pred else 0.0
+    lcs_r = lcs / len(ref) if ref else 0.0
+    return {
+        "jaccard": overlap / union if union else 0.0,
+        "precision": precision,
+        "recall": recall,
+        "f1": (
+            2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        ),
+        "rouge_l": 2 * lcs_p * lcs_r / (lcs_p + lcs_r) if lcs_p + lcs_r else 0.0,
+    }
+
+
+def _random_texts(rng, count):
+    words = "install pip the The use requests keyword def return".split()
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+def test_scores_match_per_item_reference():
+    """Vectorized scores match a per-item reference implementation."""
+    rng = random.Random(7)
+    predictions = _random_texts(rng, 300)
+    references = _random_texts(rng, 300)
+
+    # A small block size exercises several LCS blocks of mixed lengths.
+    scores = compute_lexical_scores(predictions, references, block_size=16)
+
+    for row, (prediction, reference) in enumerate(zip(predictions, references)):
+        for name, expected in _reference_scores(prediction, reference).items():
+            assert getattr(scores, name)[row] == pytest.approx(expected)
+
+
+def test_mean_and_length_checks():
+    """Means skip empty input and mismatched lengths are rejected."""
+    scores = compute_lexical_scores(["a b", ""], ["a c", ""])
+
+    assert len(scores) == 2
+    assert scores.mean()["jaccard"] == pytest.approx(1 / 6)
+    assert compute_lexical_scores([], []).mean()["rouge_l"] is None
+    with pytest.raises(ValueError):
+        compute_lexical_scores(["a"], [])
+
+
+@pytest.mark.parametrize("runner_cls", [RagasRunner, DeepEvalRunner])
+def test_runners_score_mean_jaccard(tmp_path, runner_cls):
+    """Lexical runners report the mean Jaccard overlap."""
+    dataset = [
+        EvaluationInput("q1", "Use pip install requests", "use pip install"),
+        EvaluationInput("q2", "", ""),
+        EvaluationInput("q3", "def keyword", "the def keyword"),
+    ]
+    result = runner_cls(output_dir=tmp_path).evaluate(dataset)
+
+    assert result.score == pytest.approx(np.mean([3 / 4, 0.0, 2 / 3]))
+    assert result.details["metrics"]["jaccard"] == pytest.approx(result.score)
+    assert result.details["num_samples"] == 3
+
+
+def test_runner_chunks_share_the_lexical_helper(tmp_path):
+    """Runner chunks are scored by the shared lexical helper."""
+    records = [
+        EvaluationInput("q1", "use pip install", "use pip install requests"),
+        EvaluationInput("q2", "", "def keyword"),
+    ]
+    expected = score_inputs(records).columns()
+
+    for runner in (
+        DeepEvalRunner(output_dir=tmp_path),
+        RagasRunner(output_dir=tmp_path),
+    ):
+        columns = runner.score_chunk(records)
+        assert list(columns) == list(METRICS)
+        for name in METRICS:
+            assert np.allclose(columns[name], expected[name])
@@ -0,0 +1,79 @@
+"""Tests for the batch, stdin and REPL modes of the CLI."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src import main as cli
+from src.config import settings
+
+DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+INSTALL = "How do I install the Python requests library?"
+LIMIT = "What is the rate limit for the demo API?"
+
+
+@pytest.fixture(autouse=True)
+def _index_cache_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "embeddings_cache_path", tmp_path / "index.idx")
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_questions_file_writes_one_json_line_per_question(tmp_path, suffix):
+    """JSON and JSON Lines inputs yield answers with scores and latency."""
+    entries = [{"id": "a", "question": INSTALL}, LIMIT, INSTALL]
+    path = tmp_path / f"questions{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(entries))
+    else:
+        path.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n\n")
+    output = tmp_path / "answers.jsonl"
+
+    cli.main(
+        [
+            "--questions-file",
+            str(path),
+            "--documents",
+            str(DOCS),
+            "--batch-size",
+            "2",
+            "--output",
+            str(output),
+        ]
+    )
+
+    rows = _lines(output)
+    assert [row["question"] for row in rows] == [INSTALL, LIMIT, INSTALL]
+    assert rows[0]["id"] == "a"
+    assert "pip install requests" in rows[0]["response"].lower()
+    assert rows[0]["context"] and "score" in rows[0]["context"][0]
+    assert all(row["latency_ms"] >= 0 for row in rows)
+
+
+def test_stdin_answers_each_line(tmp_path, monkeypatch):
+    """Piped stdin is answered line by line, skipping blank lines."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"{INSTALL}\n\n{LIMIT}\n"))
+    output = tmp_path / "answers.jsonl"
+
+    cli.main(["--documents", str(DOCS), "--output", str(output)])
+
+    assert [row["question"] for row in _lines(output)] == [INSTALL, LIMIT]
+
+
+def test_invalid_question_file_entry_is_rejected(tmp_path):
+    """Entries without a question string raise a clear error."""
+    path = tmp_path / "questions.json"
+    path.write_text(json.dumps([{"id": 1}]))
+    with pytest.raises(ValueError, match="entry 1"):
+        list(cli.read_questions(path))
+
+
+def test_positional_question_cannot_combine_with_modes():
+    """A positional question is its own mode."""
+    with pytest.raises(SystemExit):
+        cli.parse_args(["question", "--stdin"])
@@ -0,0 +1,133 @@
+"""Tests for running several evaluation runners concurrently."""
+
+import os
+import time
+from functools import partial
+
+import pytest
+
+from evaluations.base_evaluator import BaseEvaluator, EvaluationInput, EvaluationResult
+from evaluations.deepeval_runner import DeepEvalRunner
+from evaluations.orchestrator import EvaluationDataset, run_evaluators
+from evaluations.ragas_runner import RagasRunner
+from evaluations.retrieval_eval_runner import RetrievalEvalRunner
+from src.document_loader import Document
+from src.embeddings import EmbeddingIndex
+
+
+class _SleepyRunner(BaseEvaluator):
+    """Runner that waits like a remote judge and reports where it ran."""
+
+    def __init__(self, name="sleepy", delay=0.3, output_dir=None):
+        super().__init__(name, output_dir=output_dir)
+        self.delay = delay
+
+    def evaluate(self, dataset):
+        records = list(dataset)
+        time.sleep(self.delay)
+        return EvaluationResult(self.name, 1.0, {"n": len(records), "pid": os.getpid()})
+
+
+class _CpuSleepyRunner(_SleepyRunner):
+    cpu_bound = True
+
+
+class _BrokenRunner(BaseEvaluator):
+    def __init__(self, output_dir=None):
+        super().__init__("broken", output_dir=output_dir)
+
+    def evaluate(self, dataset):
+        raise RuntimeError("boom")
+
+
+def _dataset():
+    return [
+        EvaluationInput("q1", "use pip install", "use pip install"),
+        EvaluationInput("q2", "def keyword", "the def keyword"),
+    ]
+
+
+def test_runners_run_concurrently_with_wall_times(tmp_path):
+    """Runners overlap and each reports its own wall time."""
+    runners = [
+        partial(_SleepyRunner, "judge_a", output_dir=tmp_path),
+        partial(_SleepyRunner, "judge_b", output_dir=tmp_path),
+        partial(_CpuSleepyRunner, "local", output_dir=tmp_path),
+    ]
+
+    report = run_evaluators(_dataset(), runners)
+
+    assert list(report.results) == ["judge_a", "judge_b", "local"]
+    assert report.modes == {
+        "judge_a": "thread",
+        "judge_b": "thread",
+        "local": "process",
+    }
+    assert report.results["local"].details["pid"] != os.getpid()
+    assert report.results["judge_a"].details["pid"] == os.getpid()
+    assert all(result.details["n"] == 2 for result in report.results.values())
+    assert all(elapsed >= 0.3 for elapsed in report.wall_times.values())
+    assert report.total_s < sum(report.wall_times.values())
+
+
+def test_lexical_runners_match_direct_runs_and_errors_are_isolated(tmp_path):
+    """Orchestrated scores match direct runs; a broken runner fails alone."""
+    runners = [
+        partial(RagasRunner, output_dir=tmp_path),
+        partial(DeepEvalRunner, output_dir=tmp_path),
+        partial(_BrokenRunner, output_dir=tmp_path),
+    ]
+
+    report = run_evaluators(_dataset(), runners)
+
+    direct = RagasRunner(output_dir=tmp_path).evaluate(_dataset())
+    assert report.results["ragas"].score == pytest.approx(direct.score)
+    assert report.results["deepeval"].score == pytest.approx(direct.score)
+    assert report.results["broken"].score is None
+    assert report.errors == {"broken": "RuntimeError: boom"}
+    assert report.summary()["runners"]["broken"]["error"] == "RuntimeError: boom"
+
+
+def test_dataset_is_columnar_and_iterable():
+    """The shared dataset exposes columns and still iterates as inputs."""
+    dataset = EvaluationDataset.from_inputs(_dataset())
+
+    assert len(dataset) == 2
+    assert dataset.references == ("use pip install", "the def keyword")
+    assert list(dataset) == _dataset()
+    assert dataset[1] == _dataset()[1]
+    assert EvaluationDataset.from_inputs(dataset) is dataset
+
+
+def test_retrieval_runner_sees_doc_ids_when_orchestrated(tmp_path):
+    """Labelled rows keep their ``doc_id`` through the shared dataset."""
+    index = EmbeddingIndex(
+        [
+            Document("install", "Install", "Use pip install requests to install."),
+            Document("limits", "Limits", "The demo API allows 100 requests a minute."),
+        ]
+    )
+    dataset = [
+        EvaluationInput("How do I pip install requests?", "", "", "install"),
+        EvaluationInput("What is the demo API rate limit?", "", "", "limits"),
+    ]
+    factory = partial(RetrievalEvalRunner, output_dir=tmp_path, index=index)
+
+    direct = factory().evaluate(dataset)
+    report = run_evaluators(dataset, [factory])
+
+    assert direct.score == pytest.approx(1.0)
+    assert report.modes == {"retrieval": "process"}
+    assert report.results["retrieval"].score == pytest.approx(direct.score)
+    assert EvaluationDataset.from_inputs(dataset)[0].doc_id == "install"
+
+
+def test_duplicate_runner_names_are_rejected(tmp_path):
+    """Two runners reporting the same name cannot overwrite each other."""
+    runners = [
+        partial(_SleepyRunner, "judge", delay=0, output_dir=tmp_path),
+        partial(_SleepyRunner, "judge", delay=0, output_dir=tmp_path),
+    ]
+
+    with pytest.raises(ValueError, match="'judge'"):
+        run_evaluators(_dataset(), runners)
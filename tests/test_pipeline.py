@@ -0,0 +1,80 @@
+"""Tests for the predict-then-evaluate pipeline."""
+
+import json
+from functools import partial
+from types import SimpleNamespace
+
+from evaluations.base_evaluator import BaseEvaluator, EvaluationInput
+from evaluations.pipeline import run_pipeline
+from evaluations.ragas_runner import RagasRunner
+
+
+class _EchoBot:
+    """Bot answering every question with a fixed prefix, counting batches."""
+
+    def __init__(self):
+        self.batches = []
+
+    def answer_batch(self, questions):
+        self.batches.append(len(questions))
+        return [SimpleNamespace(response=f"answer {q}") for q in questions]
+
+
+class _BrokenRunner(BaseEvaluator):
+    def __init__(self, output_dir=None):
+        super().__init__("broken", output_dir=output_dir)
+
+    def evaluate(self, dataset):
+        raise RuntimeError("boom")
+
+
+def _dataset(n):
+    return (EvaluationInput(f"q{i}", "", f"answer q{i}", f"doc{i}") for i in range(n))
+
+
+def test_pipeline_scores_generated_answers(tmp_path):
+    """Generated answers are saved and scored as they stream in."""
+    bot = _EchoBot()
+    predictions = tmp_path / "predictions.jsonl"
+
+    report = run_pipeline(
+        _dataset(25),
+        runners=[partial(RagasRunner, output_dir=tmp_path)],
+        bot=bot,
+        batch_size=10,
+        queue_size=1,
+        chunk_size=7,
+        predictions_path=predictions,
+    )
+
+    assert bot.batches == [10, 10, 5]
+    assert report.num_samples == 25
+    assert report.results["ragas"].score == 1.0
+    assert report.results["ragas"].details["num_chunks"] == 4
+    assert set(report.stages) == {"load", "generate", "score:ragas"}
+    assert report.stages["generate"].items == 25
+    rows = [json.loads(line) for line in predictions.read_text().splitlines()]
+    assert rows[3] == {
+        "question": "q3",
+        "prediction": "answer q3",
+        "reference": "answer q3",
+        "doc_id": "doc3",
+    }
+
+
+def test_broken_runner_does_not_stall_the_pipeline(tmp_path):
+    """A failing runner is reported without blocking the others."""
+    report = run_pipeline(
+        _dataset(50),
+        runners=[
+            partial(_BrokenRunner, output_dir=tmp_path),
+            partial(RagasRunner, output_dir=tmp_path),
+        ],
+        bot=_EchoBot(),
+        batch_size=1,
+        queue_size=1,
+    )
+
+    assert report.errors == {"broken": "RuntimeError: boom"}
+    assert report.results["ragas"].score == 1.0
+    assert report.summary()["runners"]["broken"]["error"] == "RuntimeError: boom"
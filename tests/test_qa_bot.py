@@ -2,13 +2,48 @@
 
 from pathlib import Path
 
+from src.document_loader import DocumentLoader
+from src.embeddings import EmbeddingIndex
 from src.qa_bot import QABot
 
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+QUESTIONS = [
+    "How do I install the Python requests library?",
+    "What is the rate limit for the demo API?",
+]
 
-def test_bot_answers_from_requests_doc():
+
+def test_bot_answers_from_requests_doc(tmp_path):
     """Check that the bot references the installation command from docs."""
-    project_root = Path(__file__).resolve().parents[1]
-    bot = QABot(documents_path=project_root / "data" / "documents" / "sample_docs")
-    answer = bot.answer("How do I install the Python requests library?")
+    bot = QABot(documents_path=SAMPLE_DOCS, cache_path=tmp_path / "embeddings.idx")
+    answer = bot.answer(QUESTIONS[0])
     assert "pip install requests" in answer.response.lower()
     assert answer.context
+
+
+def test_answer_batch_matches_answer(tmp_path):
+    """Batched answers match answering each question on its own."""
+    bot = QABot(
+        documents_path=SAMPLE_DOCS,
+        cache_path=tmp_path / "embeddings.idx",
+        answer_cache_size=0,
+    )
+    batched = bot.answer_batch(QUESTIONS)
+    assert bot.answer_cache is None
+    assert [a.response for a in batched] == [bot.answer(q).response for q in QUESTIONS]
+    assert [a.context for a in batched] == [bot.answer(q).context for q in QUESTIONS]
+
+
+def test_cache_hit_matches_and_rebuilt_index_misses(tmp_path):
+    """A hit returns the cached answer; a new index version forces a miss."""
+    bot = QABot(documents_path=SAMPLE_DOCS, cache_path=tmp_path / "embeddings.idx")
+    first = bot.answer(QUESTIONS[0])
+    hit = bot.answer(QUESTIONS[0])
+    assert hit.response == first.response and hit.context == first.context
+    assert bot.answer_cache.stats()["hits"] == 1
+
+    bot.index = EmbeddingIndex(DocumentLoader(SAMPLE_DOCS).load())
+    rebuilt = bot.answer(QUESTIONS[0])
+    assert bot.answer_cache.stats()["hits"] == 1
+    assert bot.answer_cache.stats()["misses"] == 2
+    assert rebuilt.response == first.response
@@ -0,0 +1,113 @@
+"""Tests for retrieval-quality metrics over labelled questions."""
+
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.retrieval_eval_runner import RetrievalEvalRunner
+from src.chunking import Passage
+from src.document_loader import Document
+
+
+class _FixedIndex:
+    """Index returning a fixed ranking per question."""
+
+    def __init__(self, rankings):
+        self.rankings = rankings
+        self.batches = []
+
+    def query_batch(self, texts, top_k=3):
+        texts = list(texts)
+        self.batches.append(texts)
+        return [
+            [
+                SimpleNamespace(document=doc, score=1.0)
+                for doc in self.rankings[t][:top_k]
+            ]
+            for t in texts
+        ]
+
+    def query(self, text, top_k=3):
+        return self.query_batch([text], top_k)[0]
+
+
+def _doc(doc_id):
+    return Document(doc_id=doc_id, title=doc_id, content="")
+
+
+def _passage(parent_id, n):
+    return Passage(
+        doc_id=f"{parent_id}#{n}",
+        title=parent_id,
+        content="",
+        parent_id=parent_id,
+    )
+
+
+def test_metrics_from_ranks_in_one_batch(tmp_path):
+    """Labelled rows are ranked in one batch and scored from their ranks."""
+    index = _FixedIndex(
+        {
+            "first": [_doc("a"), _doc("b"), _doc("c")],
+            "third": [_passage("b", 0), _passage("b", 1), _passage("a", 0)],
+            "missed": [_doc("b"), _doc("c")],
+            "unlabelled": [_doc("a")],
+        }
+    )
+    runner = RetrievalEvalRunner(output_dir=tmp_path, index=index, ks=(1, 3))
+    dataset = [
+        EvaluationInput("first", "", "", "a"),
+        EvaluationInput("third", "", "", "a"),
+        EvaluationInput("missed", "", "", "a"),
+        EvaluationInput("unlabelled", "", ""),
+    ]
+
+    result = runner.evaluate(dataset)
+
+    assert index.batches[0] == ["first", "third", "missed"]
+    assert result.score == pytest.approx((1 + 1 / 3 + 0) / 3)
+    assert result.details["num_labelled"] == 3
+    assert result.details["recall@1"] == pytest.approx(1 / 3)
+    assert result.details["recall@3"] == pytest.approx(2 / 3)
+    assert result.details["ndcg@3"] == pytest.approx((1 + 1 / math.log2(4)) / 3)
+    assert result.details["latency"]["samples"] == 3
+
+
+def test_streamed_scores_skip_unlabelled_rows(tmp_path):
+    """Chunk scoring ignores rows without a labelled document."""
+    index = _FixedIndex({"q": [_doc("x"), _doc("a")], "u": []})
+    runner = RetrievalEvalRunner(output_dir=tmp_path, index=index, ks=(1, 2))
+
+    metrics = runner.score_chunk(
+        [EvaluationInput("q", "", "", "a"), EvaluationInput("u", "", "")]
+    )
+
+    assert metrics["reciprocal_rank"][0] == 0.5
+    assert metrics["recall@1"][0] == 0.0
+    assert metrics["recall@2"][0] == 1.0
+    assert math.isnan(metrics["ndcg@2"][1])
+
+
+def test_sample_documents_are_retrieved_first(tmp_path):
+    """Sample questions retrieve their labelled document first."""
+    project_root = Path(__file__).resolve().parents[1]
+    runner = RetrievalEvalRunner(
+        output_dir=tmp_path,
+        bot_options={
+            "documents_path": project_root / "data" / "documents" / "sample_docs",
+            "cache_path": tmp_path / "embeddings.idx",
+        },
+    )
+    dataset = [
+        EvaluationInput(
+            "How do I install the Python requests library?", "", "", "python_requests"
+        ),
+        EvaluationInput(
+            "What is the rate limit for the demo API?", "", "", "api_reference"
+        ),
+    ]
+
+    assert runner.evaluate(dataset).details["recall@3"] == 1.0
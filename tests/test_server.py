@@ -0,0 +1,55 @@
+"""Tests for the asyncio QA server and its micro-batching."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from src.qa_bot import QABot
+from src.server import QAServer
+
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_server_batches_concurrent_requests(tmp_path):
+    """Concurrent questions are answered correctly and grouped into batches."""
+    bot = QABot(documents_path=SAMPLE_DOCS, cache_path=tmp_path / "embeddings.idx")
+
+    async def scenario():
+        server = QAServer(bot, max_batch_size=16, max_wait_ms=50)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            question = {"question": "How do I install the Python requests library?"}
+            replies = await asyncio.gather(
+                *(_request(port, "POST", "/answer", question) for _ in range(8))
+            )
+            missing = await _request(port, "POST", "/answer", {"nope": 1})
+            stats = await _request(port, "GET", "/stats")
+        finally:
+            await server.close()
+        return replies, missing, stats
+
+    replies, missing, (_, stats) = asyncio.run(scenario())
+    for status, payload in replies:
+        assert status == 200
+        assert "pip install requests" in payload["response"].lower()
+        assert payload["latency_ms"] >= 0
+    assert missing[0] == 400
+    assert stats["requests"] == 8
+    assert stats["batches"] < 8
+    assert stats["queue_depth"] == 0
+    assert stats["latency"]["p50_ms"] is not None
@@ -0,0 +1,27 @@
+"""Tests for the multi-process sharded index."""
+
+import numpy as np
+
+from src.document_loader import Document
+from src.embeddings import EmbeddingIndex
+from src.sharded_index import ShardedEmbeddingIndex
+
+
+def test_sharded_rankings_match_single_index():
+    """Scatter/gather over shards reproduces the single-process top-k."""
+    rng = np.random.default_rng(3)
+    vocabulary = [f"word{i}" for i in range(40)]
+    documents = [
+        Document(f"d{i}", f"D{i}", " ".join(rng.choice(vocabulary, size=15)))
+        for i in range(60)
+    ]
+    questions = [" ".join(rng.choice(vocabulary, size=3)) for _ in range(10)]
+    expected = EmbeddingIndex(documents).query_batch(questions, 5)
+
+    for backend in ("exhaustive", "maxscore"):
+        with ShardedEmbeddingIndex(documents, num_shards=3, backend=backend) as index:
+            assert index.num_shards == 3
+            actual = index.query_batch(questions, 5)
+        for want, got in zip(expected, actual):
+            assert [c.document.doc_id for c in got] == [c.document.doc_id for c in want]
+            assert np.allclose([c.score for c in got], [c.score for c in want])
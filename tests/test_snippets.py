@@ -0,0 +1,67 @@
+"""Tests for the precomputed snippet line index."""
+
+from pathlib import Path
+
+from src.document_loader import Document, DocumentLoader
+from src.qa_bot import QABot
+from src.snippets import LineIndex, SnippetIndex
+
+SAMPLE_DOCS = Path(__file__).resolve().parents[1] / "data" / "documents" / "sample_docs"
+
+
+def _scan_best_line(content: str, question: str) -> str:
+    """Reference implementation: score every candidate line per question."""
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    if not lines:
+        return ""
+    candidates = [line for line in lines if not line.startswith("#")] or lines
+    question_terms = set(question.lower().split())
+    best_line, best_score = candidates[0], -1
+    for line in candidates:
+        overlap = len(question_terms & set(line.lower().split()))
+        if overlap > best_score:
+            best_score, best_line = overlap, line
+    return best_line
+
+
+def test_line_index_matches_scanning():
+    """The posting lookup picks the same line as a full scan."""
+    questions = [
+        "How do I install the Python requests library?",
+        "What is the rate limit for the demo API?",
+        "define a function with def",
+        "zebra",
+        "",
+    ]
+    for document in DocumentLoader(SAMPLE_DOCS).load():
+        index = LineIndex(document.content)
+        for question in questions:
+            assert index.best_line(question) == _scan_best_line(
+                document.content, question
+            )
+    assert LineIndex("# Only\n# Headings").best_line("headings") == "# Headings"
+    assert LineIndex("\n  \n").best_line("anything") == ""
+
+
+def test_snippet_index_rebuilds_edited_documents():
+    """Cached line indexes are refreshed when a document's content changes."""
+    snippets = SnippetIndex()
+    assert snippets.best_line(Document("a", "A", "alpha\nbeta"), "beta") == "beta"
+    assert snippets.best_line(Document("a", "A", "gamma\ndelta"), "beta") == "gamma"
+
+
+def test_bot_prepares_line_indexes_with_the_index(tmp_path):
+    """Line indexes exist before the first answer and are reused afterwards."""
+    bot = QABot(documents_path=SAMPLE_DOCS, cache_path=tmp_path / "embeddings.idx")
+    prepared = dict(bot._snippets._indexes)
+    assert set(prepared) == {doc.doc_id for doc in bot.index.live_documents()}
+
+    bot.answer("How do I install the Python requests library?")
+    bot.answer("What is the rate limit for the demo API?")
+    assert all(bot._snippets._indexes[key] is prepared[key] for key in prepared)
+
+    bot.index.add_documents([Document("extra", "Extra", "install extras with pip")])
+    bot.index.remove_document("python_requests")
+    bot.answer("How do I install extras?")
+    assert "extra" in bot._snippets._indexes
+    assert "python_requests" not in bot._snippets._indexes
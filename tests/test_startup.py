@@ -0,0 +1,59 @@
+"""Tests for import-time cost and lazily constructed models."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from evaluations import model_registry
+from evaluations.embedding_eval_runner import EmbeddingEvalRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+# Generous enough for slow CI machines; eager imports took several seconds.
+IMPORT_BUDGET_S = 1.0
+HEAVY_MODULES = ("sklearn", "scipy", "langchain", "sentence_transformers", "ragas")
+
+
+def test_cli_and_package_imports_skip_heavy_dependencies():
+    """Importing the CLI and the evaluations package stays cheap."""
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import evaluations, src.main\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+    assert report["heavy"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_S
+
+
+def test_embedding_model_loads_on_first_use_and_is_shared(tmp_path, monkeypatch):
+    """Runners defer model loading and share one instance per model name."""
+    model_registry.clear()
+    loads = []
+
+    def load(self):
+        loads.append(self)
+        return object()
+
+    monkeypatch.setattr(EmbeddingEvalRunner, "_load_model", load)
+    monkeypatch.setattr(
+        "evaluations.embedding_eval_runner._module_available", lambda _name: True
+    )
+    try:
+        first = EmbeddingEvalRunner(output_dir=tmp_path, cache_path=None)
+        second = EmbeddingEvalRunner(output_dir=tmp_path, cache_path=None)
+        assert loads == []
+        assert first._model is second._model
+        assert len(loads) == 1
+    finally:
+        model_registry.clear()
@@ -0,0 +1,81 @@
+"""Tests for chunked, constant-memory evaluation."""
+
+import numpy as np
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput, StreamingNotSupportedError
+from evaluations.embedding_eval_runner import EmbeddingEvalRunner
+from evaluations.online_stats import OnlineStats
+from evaluations.openai_eval_runner import OpenAIEvalRunner
+from evaluations.ragas_runner import RagasRunner
+
+
+def _rows(count):
+    words = ["use", "pip", "install", "requests", "def", "keyword"]
+    for row in range(count):
+        yield EvaluationInput(
+            f"q{row}",
+            " ".join(words[: 1 + row % 6]),
+            " ".join(words[row % 3 :]),
+        )
+
+
+def test_stream_matches_batch_score_and_flushes_per_chunk(tmp_path):
+    """Streaming matches the batch score and reports each chunk."""
+    runner = RagasRunner(output_dir=tmp_path)
+    seen = []
+
+    result = runner.evaluate_stream(
+        _rows(2500),
+        chunk_size=1000,
+        on_chunk=lambda partial: seen.append(partial.details["num_samples"]),
+    )
+
+    assert seen == [1000, 2000, 2500]
+    assert result.score == pytest.approx(runner.evaluate(_rows(2500)).score)
+    assert result.details["num_chunks"] == 3
+    jaccard = result.details["metrics"]["jaccard"]
+    assert jaccard["count"] == 2500
+    assert sum(jaccard["histogram"]["counts"]) == 2500
+    assert set(result.details["metrics"]) >= {"precision", "recall", "rouge_l"}
+
+
+def test_online_stats_match_numpy_and_skip_nan():
+    """Online statistics match NumPy and ignore NaN values."""
+    rng = np.random.default_rng(0)
+    values = rng.random(1000)
+    stats = OnlineStats()
+    for chunk in np.array_split(values, 7):
+        stats.update(chunk)
+    stats.update(np.array([np.nan, np.nan]))
+
+    summary = stats.to_dict()
+    assert summary["count"] == 1000
+    assert summary["missing"] == 2
+    assert summary["mean"] == pytest.approx(values.mean())
+    assert summary["std"] == pytest.approx(values.std())
+    assert summary["min"] == values.min() and summary["max"] == values.max()
+
+
+def test_embedding_runner_streams(tmp_path):
+    """The embedding runner scores a stream of chunks."""
+
+    class _Model:
+        def encode(self, texts, **_kwargs):
+            return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+    runner = EmbeddingEvalRunner(
+        output_dir=tmp_path, model=_Model(), cache_path=tmp_path / "emb.sqlite3"
+    )
+    result = runner.evaluate_stream(_rows(30), chunk_size=7)
+
+    assert result.details["num_chunks"] == 5
+    assert result.details["metrics"]["cosine_similarity"]["count"] == 30
+
+
+def test_runner_without_streaming_says_so(tmp_path):
+    """Runners without chunk scoring raise StreamingNotSupportedError."""
+    runner = OpenAIEvalRunner(output_dir=tmp_path)
+
+    with pytest.raises(StreamingNotSupportedError):
+        runner.evaluate_stream(_rows(3))
@@ -0,0 +1,89 @@
+"""Tests for tracing spans, sinks and timings attached to results."""
+
+import json
+
+import pytest
+
+from evaluations.base_evaluator import EvaluationInput
+from evaluations.ragas_runner import RagasRunner
+from evaluations.retrieval_eval_runner import RetrievalEvalRunner
+from src import tracing
+from src.embeddings import EmbeddingIndex
+from src.document_loader import Document
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracing():
+    yield
+    tracing.reset()
+
+
+def _index():
+    return EmbeddingIndex(
+        [
+            Document("install", "Install", "Use pip install requests to install."),
+            Document("limits", "Limits", "The demo API allows 100 requests a minute."),
+        ]
+    )
+
+
+def test_disabled_tracing_is_a_noop():
+    """With no sink installed, spans are a shared no-op."""
+    assert not tracing.enabled()
+    assert tracing.span("anything") is tracing.span("other")
+    with tracing.collect() as collector:
+        _index().query("install requests")
+    assert collector.summary() == {}
+
+
+def test_histogram_and_jsonl_sinks_record_nested_spans(tmp_path):
+    """Histogram and JSONL sinks record nested spans with their parents."""
+    histogram = tracing.configure(jsonl_path=tmp_path / "trace.jsonl")
+    index = _index()
+    for _ in range(3):
+        index.query("install requests")
+    tracing.reset()
+
+    summary = histogram.summary()
+    assert summary["index.build"]["count"] == 1
+    assert summary["index.query"]["count"] == 3
+    stats = summary["index.query"]
+    assert stats["min_ms"] <= stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+    lines = [json.loads(line) for line in (tmp_path / "trace.jsonl").open()]
+    nested = [line for line in lines if line["name"] == "index.query_batch"]
+    assert len(nested) == 3
+    assert nested[0]["parent"] == "index.query" and nested[0]["depth"] == 1
+
+
+def test_profile_sink_captures_first_occurrence(tmp_path):
+    """The profile sink writes a profile and memory report for the first match."""
+    sink = tracing.add_sink(tracing.ProfileSink("index.build", tmp_path))
+    _index()
+    _index()
+
+    assert sink.report["profile_path"] == str(tmp_path / "index.build.prof")
+    assert sink.report["peak_bytes"] > 0
+    assert (tmp_path / "index.build.memory.txt").exists()
+
+
+def test_runner_results_carry_timings(tmp_path):
+    """Results gain per-span timings while tracing is enabled."""
+    tracing.configure()
+    runner = RetrievalEvalRunner(output_dir=tmp_path, index=_index(), ks=(1,))
+    dataset = [EvaluationInput("How do I install requests?", "", "", "install")]
+
+    result = runner.evaluate(dataset)
+
+    timings = result.details["timings"]
+    assert timings["evaluate.retrieval"]["count"] == 1
+    # One batch for the metrics plus one single query for the latency sample.
+    assert timings["index.query_batch"]["count"] == 2
+    assert timings["index.query"]["count"] == 1
+    saved = json.loads((tmp_path / "retrieval_result.json").read_text())
+    assert "evaluate.retrieval" in saved["details"]["timings"]
+
+    streamed = RagasRunner(output_dir=tmp_path).evaluate_stream(
+        [EvaluationInput("q", "a b", "a b")]
+    )
+    assert streamed.details["timings"]["evaluate.ragas"]["count"] == 1